@@ -7,17 +7,58 @@ Handles addon installation, removal, configuration, and backup for PlexTickets/P
 import json
 import os
 import pwd
+import re
 import shutil
-import tarfile
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-import yaml
-
-from utils import ColorPrinter, SystemdManager, install_staged_directory, safe_extract_archive, validate_path_component
+from utils import (
+    ColorPrinter,
+    SystemdManager,
+    install_staged_directory,
+    safe_extract_archive,
+    set_tree_permissions,
+    validate_path_component,
+    write_tar_gz,
+)
 
 _SYSTEM_TEMP_ROOTS = frozenset(path.resolve() for path in (Path(tempfile.gettempdir()), Path("/tmp"), Path("/var/tmp")))
+# RAR is deliberately unsupported: every archive goes through the shared
+# in-process extractor in utils, which validates members before writing.
+_ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+_ARCHIVE_SEARCH_WORKERS = 8
+_BACKUP_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+_BYTES_PER_MB = 1024 * 1024
+_ADDON_CONFIG_NAMES = ("config.yml", "config.yaml")
+
+
+def _scan_archives(root: Path) -> list[Path]:
+    """Walk a resolved directory tree once, without following directory symlinks, collecting archives.
+
+    Because *root* is already resolved and directory symlinks are never
+    entered, every regular entry path is canonical; only symlinked archives
+    need a realpath lookup.
+    """
+    found: list[Path] = []
+    pending = [os.fspath(root)]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.name.endswith(_ARCHIVE_SUFFIXES):
+                            path = os.path.realpath(entry.path) if entry.is_symlink() else entry.path
+                            found.append(Path(path))
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return found
 
 
 class AddonManager:
@@ -45,22 +86,30 @@ class AddonManager:
         if not addons_path.exists():
             return []
 
+        # DirEntry caches the d_type from readdir, so no per-child stat() is needed
+        with os.scandir(addons_path) as it:
+            names = sorted(entry.name for entry in it if entry.is_dir(follow_symlinks=False))
+
         addons = []
-        for item in sorted(addons_path.iterdir()):
-            if item.is_dir() and not item.is_symlink():
-                config_path = self._find_addon_config(item)
-                addons.append(
-                    {"name": item.name, "path": item, "has_config": config_path is not None, "config_path": config_path}
-                )
+        for name in names:
+            item = addons_path / name
+            config_path = self._find_addon_config(item)
+            addons.append(
+                {"name": name, "path": item, "has_config": config_path is not None, "config_path": config_path}
+            )
 
         return addons
 
     def _find_addon_config(self, addon_path: Path) -> Path | None:
         """Find config.yml or config.yaml in addon folder"""
-        for config_name in ["config.yml", "config.yaml"]:
-            config_file = addon_path / config_name
-            if config_file.exists():
-                return config_file
+        try:
+            with os.scandir(addon_path) as it:
+                found = {entry.name for entry in it if entry.name in _ADDON_CONFIG_NAMES and entry.is_file()}
+        except OSError:
+            return None
+        for config_name in _ADDON_CONFIG_NAMES:
+            if config_name in found:
+                return addon_path / config_name
         return None
 
     def install_addon(self, archive_path: Path, product_path: Path) -> tuple[bool, str, str | None]:
@@ -103,9 +152,10 @@ class AddonManager:
 
     def _prepare_staged_addon(self, extracted_root: Path, archive_path: Path) -> tuple[str, Path]:
         """Normalize extracted contents inside the private staging directory."""
-        items = list(extracted_root.iterdir())
-        if len(items) == 1 and items[0].is_dir():
-            return items[0].name, items[0]
+        with os.scandir(extracted_root) as it:
+            entries = list(it)
+        if len(entries) == 1 and entries[0].is_dir(follow_symlinks=False):
+            return entries[0].name, extracted_root / entries[0].name
 
         addon_name = archive_path.name
         while True:
@@ -118,13 +168,10 @@ class AddonManager:
                 addon_name = addon_name[: -len(suffix)]
         validate_path_component(addon_name, label="addon name")
 
-        target_folder = extracted_root.parent / "normalized"
-        target_folder.mkdir()
-        for item in items:
-            item.rename(target_folder / item.name)
-
+        # The private extraction root already holds exactly the loose items, so it
+        # becomes the addon folder itself instead of moving every item into a new one
         self.printer.warning(f"Archive was not properly packaged - reorganized into '{addon_name}/' folder")
-        return addon_name, target_folder
+        return addon_name, extracted_root
 
     @staticmethod
     def _service_owner(product_path: Path | None) -> str:
@@ -147,22 +194,9 @@ class AddonManager:
         return "root"
 
     def _set_permissions(self, addon_path: Path, *, product_path: Path | None = None):
-        """Set proper permissions on addon files"""
-        import subprocess
-
-        owner = self._service_owner(product_path)
-        subprocess.run(["chown", "-R", f"{owner}:{owner}", str(addon_path)], check=True, timeout=60)
-        subprocess.run(
-            ["find", str(addon_path), "-type", "d", "-exec", "chmod", "750", "{}", ";"],
-            check=True,
-            timeout=60,
-        )
-        for path in addon_path.rglob("*"):
-            if not path.is_file() or path.is_symlink():
-                continue
-            sensitive = path.name.lower() in {"config.yml", "config.yaml", "config.json", ".env"}
-            executable = bool(path.stat().st_mode & 0o111) or path.suffix.lower() in {".sh", ".py"}
-            os.chmod(path, 0o600 if sensitive else 0o750 if executable else 0o640)
+        """Set proper ownership and permissions on addon files for the product's service owner"""
+        owner = pwd.getpwnam(self._service_owner(product_path))
+        set_tree_permissions(addon_path, owner.pw_uid, owner.pw_gid)
 
     def addon_exists(self, addon_name: str, product_path: Path) -> bool:
         """Check if an addon with the given name already exists"""
@@ -189,7 +223,7 @@ class AddonManager:
         backup_dir.mkdir(parents=True, exist_ok=True)
 
         # Generate backup filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = datetime.now().strftime(_BACKUP_TIMESTAMP_FORMAT)
         product_name = product_path.name
         backup_file = backup_dir / f"{product_name}_{addon_name}_addon_{timestamp}.tar.gz"
 
@@ -198,10 +232,9 @@ class AddonManager:
 
             fd = os.open(backup_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
             with os.fdopen(fd, "wb") as backup_stream:
-                with tarfile.open(fileobj=backup_stream, mode="w:gz") as tar:
-                    tar.add(addon_path, arcname=addon_name)
-
-            size_mb = backup_file.stat().st_size / (1024 * 1024)
+                write_tar_gz(backup_stream, addon_path, addon_name)
+                backup_stream.flush()
+                size_mb = os.fstat(fd).st_size / _BYTES_PER_MB
             return True, f"Backup created: {backup_file.name} ({size_mb:.2f} MB)", backup_file
 
         except Exception as e:
@@ -245,9 +278,13 @@ class AddonManager:
 
         Returns: (is_valid, error_message or None)
         """
+        import yaml
+
+        # Prefer the libyaml-backed loader; it is the same safe schema, parsed in C
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
         try:
-            with open(config_path, encoding="utf-8") as f:
-                yaml.safe_load(f)
+            with open(config_path, "rb") as f:
+                yaml.load(f, Loader=loader)
             return True, None
         except yaml.YAMLError as e:
             # Extract line number if available
@@ -284,10 +321,8 @@ class AddonManager:
         else:
             roots = search_dirs or []
 
-        archives = []
-        seen_paths = set()
+        scan_roots: list[Path] = []
         seen_roots = set()
-        patterns = ["*.zip", "*.tar", "*.tar.gz", "*.tgz", "*.tar.bz2", "*.tbz2", "*.tar.xz", "*.txz"]
 
         for search_dir in roots:
             try:
@@ -302,18 +337,28 @@ class AddonManager:
             if root_key in seen_roots or not resolved_root.exists():
                 continue
             seen_roots.add(root_key)
+            scan_roots.append(resolved_root)
 
-            for pattern in patterns:
-                for archive in resolved_root.rglob(pattern):
-                    resolved = archive.resolve()
-                    if automatic_search and any(
-                        resolved == temp_root or temp_root in resolved.parents for temp_root in _SYSTEM_TEMP_ROOTS
-                    ):
-                        continue
-                    if str(resolved) in seen_paths:
-                        continue
-                    seen_paths.add(str(resolved))
-                    archives.append(resolved)
+        if not scan_roots:
+            return []
+
+        # Directory walks are I/O bound, so scan every root concurrently
+        with ThreadPoolExecutor(max_workers=min(_ARCHIVE_SEARCH_WORKERS, len(scan_roots))) as pool:
+            results = list(pool.map(_scan_archives, scan_roots))
+
+        archives = []
+        seen_paths = set()
+        for candidates in results:
+            for archive in candidates:
+                key = str(archive)
+                if key in seen_paths:
+                    continue
+                seen_paths.add(key)
+                if automatic_search and any(
+                    archive == temp_root or temp_root in archive.parents for temp_root in _SYSTEM_TEMP_ROOTS
+                ):
+                    continue
+                archives.append(archive)
 
         return sorted(archives, key=lambda x: x.name.lower())
 
@@ -333,32 +378,34 @@ class AddonManager:
             return []
 
         backups = []
-        product_name = product_path.name
+        # product_addonname_addon_timestamp.tar.gz
+        name_pattern = re.compile(rf"{re.escape(product_path.name)}_(?P<addon>.*)_addon_(?P<ts>.*)\.tar\.gz", re.DOTALL)
+
+        # One stat() per backup, reused for both the sort key and the size
+        candidates = []
+        with os.scandir(backup_dir) as it:
+            for entry in it:
+                match = name_pattern.fullmatch(entry.name)
+                if match is None:
+                    continue
+                try:
+                    candidates.append((Path(entry.path), entry.stat(), match))
+                except OSError:
+                    continue
+        candidates.sort(key=lambda item: item[1].st_mtime, reverse=True)
 
-        for backup_file in sorted(
-            backup_dir.glob(f"{product_name}_*_addon_*.tar.gz"), key=lambda x: x.stat().st_mtime, reverse=True
-        ):
+        for backup_file, backup_stat, match in candidates:
             try:
-                # Parse filename: product_addonname_addon_timestamp.tar.gz
-                basename = backup_file.name.removesuffix(".tar.gz")
-                marker = "_addon_"
-                prefix, separator, timestamp_str = basename.rpartition(marker)
-                if separator:  # pragma: no branch - glob guarantees marker
-                    # Extract addon name (remove product prefix)
-                    addon_name = prefix.removeprefix(f"{product_name}_")
-
-                    # Parse timestamp
-                    try:
-                        timestamp = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-                    except ValueError:
-                        timestamp = datetime.fromtimestamp(backup_file.stat().st_mtime)
-
-                    size_mb = backup_file.stat().st_size / (1024 * 1024)
-
-                    backups.append(
-                        {"path": backup_file, "addon_name": addon_name, "timestamp": timestamp, "size_mb": size_mb}
-                    )
+                try:
+                    timestamp = datetime.strptime(match["ts"], _BACKUP_TIMESTAMP_FORMAT)
+                except ValueError:
+                    timestamp = datetime.fromtimestamp(backup_stat.st_mtime)
             except Exception:
                 continue
 
+            size_mb = backup_stat.st_size / _BYTES_PER_MB
+            backups.append(
+                {"path": backup_file, "addon_name": match["addon"], "timestamp": timestamp, "size_mb": size_mb}
+            )
+
         return backups
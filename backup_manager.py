@@ -7,14 +7,37 @@ Extracted from PlexInstaller to keep domain logic isolated and testable.
 import json
 import os
 import pwd
+import re
 import shutil
-import subprocess
-import tarfile
 import tempfile
+import threading
 from datetime import datetime
 from pathlib import Path
 
-from utils import ColorPrinter, SystemdManager, clear_terminal, safe_extract_tar, validate_path_component
+from utils import (
+    DEFAULT_MAX_ARCHIVE_BYTES,
+    DEFAULT_MAX_ARCHIVE_FILES,
+    ColorPrinter,
+    SystemdManager,
+    clear_terminal,
+    gunzip_to,
+    is_gzip_file,
+    is_zstd_file,
+    list_product_dirs,
+    safe_extract_tar,
+    set_tree_permissions,
+    unzstd_to,
+    validate_path_component,
+    write_tar_gz,
+    write_tar_zst,
+)
+
+# <product>_backup_<YYYYmmdd_HHMMSS>.tar.{zst,gz}, as written by backup_product()
+_BACKUP_NAME_RE = re.compile(r"(.+)_backup_(\d{8}_\d{6})\.tar\.(?:zst|gz)")
+# Regenerable build/package-manager caches; restores rebuild them on demand
+_BACKUP_SKIP_DIRS = frozenset({".cache", ".npm"})
+# The extractor's content limit plus room for per-member tar headers/padding
+_MAX_PLAIN_BACKUP_BYTES = DEFAULT_MAX_ARCHIVE_BYTES + DEFAULT_MAX_ARCHIVE_FILES * 1024
 
 
 class BackupManager:
@@ -30,6 +53,10 @@ class BackupManager:
         self.systemd = systemd
         self.install_dir = install_dir
         self.backup_dir = install_dir / "backups"
+        self._cleanup_threads: list[threading.Thread] = []
+        self._cleanup_errors: list[str] = []
+        # (backup_dir mtime_ns, backup paths) from the last scan; see _enumerate_backups()
+        self._backup_cache: tuple[int, list[Path]] | None = None
 
     # ------------------------------------------------------------------
     # Menu entry-point
@@ -73,7 +100,7 @@ class BackupManager:
 
     def create_backup(self):
         """Prompt for product selection and create a backup."""
-        products = [d for d in self.install_dir.iterdir() if d.is_dir() and d.name != "backups"]
+        products = list_product_dirs(self.install_dir)
 
         if not products:
             self.printer.warning("No installed products found to back up")
@@ -83,30 +110,24 @@ class BackupManager:
         for i, product_dir in enumerate(products, 1):
             print(f"{i}) {product_dir.name}")
 
-        choice = input(f"\nEnter choice (1-{len(products)}): ").strip()
-
-        try:
-            idx = int(choice) - 1
-            if 0 <= idx < len(products):
-                self.backup_product(products[idx].name)
-            else:
-                self.printer.error("Invalid choice")
-        except ValueError:
-            self.printer.error("Invalid choice")
+        selected = self._pick(products, f"\nEnter choice (1-{len(products)}): ")
+        if selected is not None:
+            self.backup_product(selected.name)
 
     def backup_product(self, product: str):
-        """Backup a specific product (stop → tar.gz → restart)."""
+        """Backup a specific product (stop → tar.zst, or tar.gz without zstd → restart)."""
         validate_path_component(product, label="product name")
         install_path = self.install_dir / product
         self.backup_dir.mkdir(exist_ok=True)
 
+        use_zstd = shutil.which("zstd") is not None
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_file = self.backup_dir / f"{product}_backup_{timestamp}.tar.gz"
+        backup_file = self.backup_dir / f"{product}_backup_{timestamp}{'.tar.zst' if use_zstd else '.tar.gz'}"
 
         self.printer.step(f"Creating backup of {product}...")
 
         service_name = f"plex-{product}"
-        was_running = self.systemd.get_status(service_name).strip().lower() == "active"
+        was_running = self.systemd.is_active(service_name)
 
         if was_running:
             self.printer.step("Stopping service...")
@@ -114,9 +135,9 @@ class BackupManager:
 
         try:
             fd = os.open(backup_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
-            with os.fdopen(fd, "wb") as backup_stream:
-                with tarfile.open(fileobj=backup_stream, mode="w:gz") as tar:
-                    tar.add(install_path, arcname=product)
+            with os.fdopen(fd, "wb") as backup_stream, self.printer.progress("Writing archive..."):
+                write_tar = write_tar_zst if use_zstd else write_tar_gz
+                write_tar(backup_stream, install_path, product, skip_dirs=_BACKUP_SKIP_DIRS)
 
             size_mb = backup_file.stat().st_size / (1024 * 1024)
             self.printer.success(f"Backup created: {backup_file.name}")
@@ -126,6 +147,7 @@ class BackupManager:
             backup_file.unlink(missing_ok=True)
             self.printer.error(f"Backup failed: {e}")
         finally:
+            self._backup_cache = None
             if was_running:
                 self.printer.step("Restarting service...")
                 self.systemd.start(service_name)
@@ -136,75 +158,99 @@ class BackupManager:
 
     def list_backups(self) -> list[Path]:
         """List available backups and return the sorted list."""
-        if not self.backup_dir.exists():
+        backups = self._scan_backups()
+        if backups:
+            self._print_backups(backups)
+        return [backup_file for backup_file, _stat in backups]
+
+    def _scan_backups(self) -> list[tuple[Path, os.stat_result]]:
+        """Return backups newest first, each with the one ``stat`` it needed.
+
+        Warns (and returns an empty list) when there is nothing to show.
+        """
+        try:
+            backups = self._enumerate_backups()
+        except FileNotFoundError:
             self.printer.warning("No backups directory found")
             return []
-
-        backups = sorted(
-            self.backup_dir.glob("*.tar.gz"),
-            key=lambda x: x.stat().st_mtime,
-            reverse=True,
-        )
+        except OSError as exc:
+            self.printer.error(f"Could not read backups directory: {exc}")
+            return []
 
         if not backups:
             self.printer.warning("No backups found")
             return []
 
+        return list(backups)
+
+    def _enumerate_backups(self) -> list[tuple[Path, os.stat_result]]:
+        """Scan the backups directory, reusing the last name listing while its mtime is unchanged.
+
+        Adding or removing an entry bumps the directory mtime, and this
+        manager drops the cache itself after creating or deleting a backup.
+        Sizes and dates are always stat'ed afresh, since a backup rewritten
+        under the same name leaves the directory mtime alone.
+        """
+        dir_mtime = os.stat(self.backup_dir).st_mtime_ns
+        if self._backup_cache is not None and self._backup_cache[0] == dir_mtime:
+            paths = self._backup_cache[1]
+        else:
+            with os.scandir(self.backup_dir) as it:
+                # Stray files are skipped by name, before they cost a stat
+                paths = [Path(entry.path) for entry in it if self._parse_backup_name(entry.name) is not None]
+            self._backup_cache = (dir_mtime, paths)
+
+        backups = []
+        for path in paths:
+            try:
+                backups.append((path, os.stat(path)))
+            except FileNotFoundError:
+                continue
+        backups.sort(key=lambda backup: backup[1].st_mtime, reverse=True)
+        return backups
+
+    def _print_backups(self, backups: list[tuple[Path, os.stat_result]]) -> None:
         print("\nAvailable Backups:")
         print(f"{'ID':<4} {'Product':<15} {'Date':<20} {'Size':<10}")
         print("-" * 60)
 
-        for i, backup_file in enumerate(backups, 1):
-            size_mb = backup_file.stat().st_size / (1024 * 1024)
-            mtime = datetime.fromtimestamp(backup_file.stat().st_mtime)
-            date_str = mtime.strftime("%Y-%m-%d %H:%M:%S")
+        for i, (backup_file, backup_stat) in enumerate(backups, 1):
+            size_mb = backup_stat.st_size / (1024 * 1024)
+            date_str = datetime.fromtimestamp(backup_stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
             product = self._product_from_backup_name(backup_file)
             print(f"{i:<4} {product:<15} {date_str:<20} {size_mb:>8.2f} MB")
 
-        return backups
-
     # ------------------------------------------------------------------
     # Restore
     # ------------------------------------------------------------------
 
     def restore_backup(self):
         """Interactive restore: list → select → confirm → restore."""
-        if not self.backup_dir.exists():
-            self.printer.warning("No backups directory found")
+        scanned = self._scan_backups()
+        if not scanned:
             return
 
-        backups = sorted(
-            self.backup_dir.glob("*.tar.gz"),
-            key=lambda x: x.stat().st_mtime,
-            reverse=True,
-        )
+        self._print_backups(scanned)
+        backups = [backup_file for backup_file, _stat in scanned]
 
-        if not backups:
-            self.printer.warning("No backups found")
+        selected_backup = self._pick(
+            backups,
+            f"\nSelect backup ID to restore (1-{len(backups)}): ",
+            out_of_range="Invalid backup ID",
+            not_a_number="Invalid input",
+        )
+        if selected_backup is None:
             return
+        product = self._product_from_backup_name(selected_backup)
 
-        self.list_backups()
-
-        choice = input(f"\nSelect backup ID to restore (1-{len(backups)}): ").strip()
-
-        try:
-            idx = int(choice) - 1
-            if 0 <= idx < len(backups):
-                selected_backup = backups[idx]
-                product = self._product_from_backup_name(selected_backup)
+        self.printer.warning(f"This will restore {product} from backup.")
+        self.printer.warning("Current installation will be replaced!")
 
-                self.printer.warning(f"This will restore {product} from backup.")
-                self.printer.warning("Current installation will be replaced!")
-
-                confirm = input("Continue? (y/n): ").strip().lower()
-                if confirm == "y":
-                    self.restore_from_backup(selected_backup, product)
-                else:
-                    self.printer.step("Restore cancelled")
-            else:
-                self.printer.error("Invalid backup ID")
-        except ValueError:
-            self.printer.error("Invalid input")
+        confirm = input("Continue? (y/n): ").strip().lower()
+        if confirm == "y":
+            self.restore_from_backup(selected_backup, product)
+        else:
+            self.printer.step("Restore cancelled")
 
     def restore_from_backup(self, backup_file: Path, product: str):
         """Safely stage and transactionally restore a specific product backup."""
@@ -212,7 +258,7 @@ class BackupManager:
         backup_file = Path(backup_file)
         install_path = self.install_dir / product
         service_name = f"plex-{product}"
-        was_running = self.systemd.get_status(service_name).strip().lower() == "active"
+        was_running = self.systemd.is_active(service_name)
         rollback_path: Path | None = None
         old_install_moved = False
         new_install_published = False
@@ -223,7 +269,14 @@ class BackupManager:
             self.printer.step(f"Restoring from {backup_file.name}...")
             with tempfile.TemporaryDirectory(prefix=f".{product}.restore-", dir=self.install_dir) as temp_dir:
                 extraction_root = Path(temp_dir) / "archive"
-                safe_extract_tar(backup_file, extraction_root, expected_top_level=product)
+                with self.printer.progress("Extracting backup..."):
+                    plain_tar = self._decompressed_backup(backup_file, Path(temp_dir))
+                    try:
+                        safe_extract_tar(plain_tar, extraction_root, expected_top_level=product)
+                    finally:
+                        # Free the inflated copy before the tree is published
+                        if plain_tar != backup_file:
+                            plain_tar.unlink(missing_ok=True)
                 staged_product = extraction_root / product
 
                 self.printer.step("Setting permissions...")
@@ -233,7 +286,7 @@ class BackupManager:
                     self.printer.step("Stopping service...")
                     service_stop_attempted = True
                     self.systemd.stop(service_name)
-                    if self.systemd.get_status(service_name).strip().lower() == "active":
+                    if self.systemd.is_active(service_name):
                         raise RuntimeError(f"Service {service_name} did not stop; restore aborted")
 
                 if install_path.exists() or install_path.is_symlink():
@@ -249,10 +302,7 @@ class BackupManager:
                 new_install_published = True
 
             if rollback_path is not None:
-                try:
-                    shutil.rmtree(rollback_path)
-                except OSError as exc:
-                    self.printer.warning(f"Could not remove rollback copy {rollback_path}: {exc}")
+                self._remove_rollback_in_background(rollback_path)
             self.printer.success(f"Restore of {product} complete")
 
         except Exception as e:
@@ -282,42 +332,89 @@ class BackupManager:
                 self.printer.step("Starting service...")
                 self.systemd.start(service_name)
 
+    def _remove_rollback_in_background(self, rollback_path: Path) -> None:
+        """Delete the superseded installation without holding up the restore.
+
+        Failures are kept for :meth:`wait_for_cleanup` to report, so the
+        thread never prints into the middle of an interactive prompt.
+        """
+
+        def remove() -> None:
+            try:
+                shutil.rmtree(rollback_path)
+            except OSError as exc:
+                self._cleanup_errors.append(f"Could not remove rollback copy {rollback_path}: {exc}")
+
+        self._cleanup_threads = [thread for thread in self._cleanup_threads if thread.is_alive()]
+        thread = threading.Thread(target=remove, name=f"rollback-cleanup-{rollback_path.name}")
+        thread.start()
+        self._cleanup_threads.append(thread)
+
+    def wait_for_cleanup(self) -> None:
+        """Finish background rollback removals and report any that failed."""
+        if any(thread.is_alive() for thread in self._cleanup_threads):
+            self.printer.step("Finishing removal of previous installations...")
+        for thread in self._cleanup_threads:
+            thread.join()
+        self._cleanup_threads.clear()
+        for message in self._cleanup_errors:
+            self.printer.warning(message)
+        self._cleanup_errors.clear()
+
     @staticmethod
-    def _product_from_backup_name(backup_file: Path) -> str:
-        basename = backup_file.name.removesuffix(".tar.gz")
-        product, separator, _timestamp = basename.rpartition("_backup_")
-        if not separator:
+    def _decompressed_backup(backup_file: Path, work_dir: Path) -> Path:
+        """Inflate a zstd or gzip backup once into *work_dir* and return the plain tar.
+
+        The safe extractor validates every member before writing any of them,
+        so it needs a seekable archive; a ``r|`` stream cannot be rewound, and
+        rewinding a compressed one means inflating it twice.  The caller
+        removes the plain copy as soon as extraction returns, so the extra
+        disk use is bounded by the extraction itself.
+        """
+        if is_zstd_file(backup_file):
+            decompress = unzstd_to
+        elif is_gzip_file(backup_file):
+            decompress = gunzip_to
+        else:
+            return backup_file
+        plain_tar = work_dir / "backup.tar"
+        fd = os.open(plain_tar, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as stream:
+            decompress(backup_file, stream, max_bytes=_MAX_PLAIN_BACKUP_BYTES)
+        return plain_tar
+
+    @staticmethod
+    def _parse_backup_name(name: str) -> tuple[str, str] | None:
+        """Return ``(product, timestamp)`` for a backup file name, else None."""
+        match = _BACKUP_NAME_RE.fullmatch(name)
+        if match is None:
+            return None
+        try:
+            validate_path_component(match.group(1), label="product name")
+        except ValueError:
+            return None
+        return match.group(1), match.group(2)
+
+    @classmethod
+    def _product_from_backup_name(cls, backup_file: Path) -> str:
+        parsed = cls._parse_backup_name(backup_file.name)
+        if parsed is None:
             raise ValueError(f"Invalid backup filename: {backup_file.name}")
-        return validate_path_component(product, label="product name")
+        return parsed[0]
 
     @staticmethod
     def _set_permissions(install_path: Path) -> None:
-        owner = "root"
+        uid = gid = 0  # root
         manifest = install_path / ".plexinstaller-resources.json"
         try:
             data = json.loads(manifest.read_text(encoding="utf-8"))
             user = data.get("service_user")
             if data.get("service_isolated") is True and SystemdManager.is_service_user_name(install_path.name, user):
-                pwd.getpwnam(user)
-                owner = user
+                owner = pwd.getpwnam(user)
+                uid, gid = owner.pw_uid, owner.pw_gid
         except (OSError, ValueError, TypeError, KeyError, json.JSONDecodeError):
             pass
-        subprocess.run(["chown", "-R", f"{owner}:{owner}", str(install_path)], check=True)
-        subprocess.run(
-            ["find", str(install_path), "-type", "d", "-exec", "chmod", "750", "{}", ";"],
-            check=True,
-        )
-        for path in install_path.rglob("*"):
-            if not path.is_file() or path.is_symlink():
-                continue
-            sensitive = path.name.lower() in {
-                "config.yml",
-                "config.yaml",
-                "config.json",
-                ".env",
-            } or path.name.lower().endswith((".key", ".pem"))
-            executable = bool(path.stat().st_mode & 0o111) or path.suffix.lower() in {".sh", ".py"}
-            os.chmod(path, 0o600 if sensitive else 0o750 if executable else 0o640)
+        set_tree_permissions(install_path, uid, gid)
 
     # ------------------------------------------------------------------
     # Delete
@@ -325,38 +422,52 @@ class BackupManager:
 
     def delete_backup(self):
         """Interactive backup deletion."""
-        if not self.backup_dir.exists():
-            self.printer.warning("No backups directory found")
+        scanned = self._scan_backups()
+        if not scanned:
             return
 
-        backups = sorted(
-            self.backup_dir.glob("*.tar.gz"),
-            key=lambda x: x.stat().st_mtime,
-            reverse=True,
-        )
+        self._print_backups(scanned)
+        backups = [backup_file for backup_file, _stat in scanned]
 
-        if not backups:
-            self.printer.warning("No backups found")
+        selected_backup = self._pick(
+            backups,
+            f"\nSelect backup ID to DELETE (1-{len(backups)}): ",
+            out_of_range="Invalid backup ID",
+            not_a_number="Invalid input",
+        )
+        if selected_backup is None:
             return
 
-        self.list_backups()
+        self.printer.warning(f"You are about to permanently delete: {selected_backup.name}")
+        confirm = input("Are you absolutely sure? (y/n): ").strip().lower()
 
-        choice = input(f"\nSelect backup ID to DELETE (1-{len(backups)}): ").strip()
+        if confirm == "y":
+            selected_backup.unlink()
+            self._backup_cache = None
+            self.printer.success("Backup deleted successfully")
+        else:
+            self.printer.step("Deletion cancelled")
 
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _pick(
+        self,
+        items: list[Path],
+        prompt: str,
+        *,
+        out_of_range: str = "Invalid choice",
+        not_a_number: str = "Invalid choice",
+    ) -> Path | None:
+        """Ask for a 1-based index into *items*; report bad input and return None."""
+        choice = input(prompt).strip()
         try:
             idx = int(choice) - 1
-            if 0 <= idx < len(backups):
-                selected_backup = backups[idx]
-
-                self.printer.warning(f"You are about to permanently delete: {selected_backup.name}")
-                confirm = input("Are you absolutely sure? (y/n): ").strip().lower()
-
-                if confirm == "y":
-                    selected_backup.unlink()
-                    self.printer.success("Backup deleted successfully")
-                else:
-                    self.printer.step("Deletion cancelled")
-            else:
-                self.printer.error("Invalid backup ID")
         except ValueError:
-            self.printer.error("Invalid input")
+            self.printer.error(not_a_number)
+            return None
+        if not 0 <= idx < len(items):
+            self.printer.error(out_of_range)
+            return None
+        return items[idx]
@@ -16,8 +16,11 @@ try:
 except ImportError:  # pragma: no cover - dependency is declared by the package
     yaml = None  # type: ignore[assignment]
 
+# Application config file names in order of preference
+APP_CONFIG_NAMES = ("config.yml", "config.yaml", "config.json")
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class ProductConfig:
     """Configuration for a specific product"""
 
@@ -43,6 +46,8 @@ class Config:
     TELEMETRY_LOG_DIR = Path(os.environ.get("PLEX_TELEMETRY_LOG_DIR", "/opt/plexinstaller/telemetry/logs"))
     PASTE_ENDPOINT = os.environ.get("PLEX_INSTALLER_PASTE_URL", "https://paste.plexdev.xyz/documents")
     TELEMETRY_PREF_FILE = Path(os.environ.get("PLEX_TELEMETRY_PREF_FILE", "/etc/plex/telemetry_pref"))
+    # Shared by every root-run npm install so later instances reuse the tarballs
+    NPM_CACHE_DIR = Path(os.environ.get("PLEX_NPM_CACHE_DIR", "/var/cache/plexinstaller/npm"))
 
     # Node.js
     NODE_MIN_VERSION = 20
@@ -125,9 +130,12 @@ class Config:
         "plextracker": "drakotracker",
     }
 
+    # Longest names first so "plexstatus-2" never matches a shorter prefix
+    _KNOWN_PRODUCT_NAMES: tuple[str, ...] = tuple(sorted({*PRODUCTS, *PRODUCT_ALIASES}, key=len, reverse=True))
+
     # System packages by package manager
-    SYSTEM_PACKAGES = {
-        "apt": [
+    SYSTEM_PACKAGES: dict[str, tuple[str, ...]] = {
+        "apt": (
             "curl",
             "wget",
             "git",
@@ -144,8 +152,8 @@ class Config:
             "gnupg",
             "coreutils",
             "python3-pip",
-        ],
-        "dnf": [
+        ),
+        "dnf": (
             "curl",
             "wget",
             "git",
@@ -161,8 +169,8 @@ class Config:
             "dnf-plugins-core",
             "coreutils",
             "python3-pip",
-        ],
-        "yum": [
+        ),
+        "yum": (
             "curl",
             "wget",
             "git",
@@ -178,8 +186,8 @@ class Config:
             "yum-utils",
             "coreutils",
             "python3-pip",
-        ],
-        "pacman": [
+        ),
+        "pacman": (
             "curl",
             "wget",
             "git",
@@ -195,8 +203,8 @@ class Config:
             "tar",
             "coreutils",
             "python-pip",
-        ],
-        "zypper": [
+        ),
+        "zypper": (
             "curl",
             "wget",
             "git",
@@ -211,7 +219,7 @@ class Config:
             "tar",
             "coreutils",
             "python3-pip",
-        ],
+        ),
     }
 
     # MongoDB installation
@@ -225,6 +233,7 @@ class Config:
         self.nginx_enabled = self.NGINX_ENABLED
         self.plex_setup_file = self.PLEX_SETUP_FILE
         self.telemetry_pref_file = self.TELEMETRY_PREF_FILE
+        self.npm_cache_dir = self.NPM_CACHE_DIR
 
     def get_product(self, name: str) -> ProductConfig | None:
         """Get canonical product configuration for a current or legacy name."""
@@ -236,9 +245,10 @@ class Config:
     def instance_product_base(cls, name: str) -> str:
         """Return the recognized product prefix from an instance name."""
         normalized = name.strip().lower()
-        known_names = set(cls.PRODUCTS) | set(cls.PRODUCT_ALIASES)
-        for candidate in sorted(known_names, key=len, reverse=True):
-            if normalized == candidate or normalized.startswith(f"{candidate}-"):
+        if normalized in cls.PRODUCTS or normalized in cls.PRODUCT_ALIASES:
+            return normalized
+        for candidate in cls._KNOWN_PRODUCT_NAMES:
+            if normalized.startswith(f"{candidate}-"):
                 return candidate
         return normalized.split("-", 1)[0]
 
@@ -268,10 +278,14 @@ class Config:
     @staticmethod
     def find_app_config(install_path: Path) -> Path | None:
         """Return the preferred YAML/JSON application config, if present."""
-        for name in ("config.yml", "config.yaml", "config.json"):
-            candidate = install_path / name
-            if candidate.is_file():
-                return candidate
+        try:
+            with os.scandir(install_path) as it:
+                present = {entry.name for entry in it if entry.name in APP_CONFIG_NAMES and entry.is_file()}
+        except OSError:
+            return None
+        for name in APP_CONFIG_NAMES:
+            if name in present:
+                return install_path / name
         return None
 
     @staticmethod
@@ -7,6 +7,7 @@ Extracted from PlexInstaller to keep diagnostic logic isolated and testable.
 import http.client
 import logging
 import os
+import shutil
 import socket
 import ssl
 import subprocess
@@ -14,10 +15,33 @@ import time
 from dataclasses import dataclass
 from pathlib import Path
 
-from utils import ColorPrinter, SystemdManager, clear_terminal
+from utils import ColorPrinter, SystemdManager, clear_terminal, list_product_dirs
 
 logger = logging.getLogger("plexinstaller.health")
 
+_MEMINFO_PATH = "/proc/meminfo"
+
+
+def _read_meminfo() -> tuple[float, float]:
+    """Return total and available memory in MB from one read of ``/proc/meminfo``.
+
+    Both fields sit in the first few lines, well inside a single 4 KiB read.
+    """
+    fd = os.open(_MEMINFO_PATH, os.O_RDONLY)
+    try:
+        data = os.read(fd, 4096)
+    finally:
+        os.close(fd)
+    mem_total = mem_available = None
+    for line in data.splitlines():
+        if line.startswith(b"MemTotal:"):
+            mem_total = int(line.split()[1]) / 1024
+        elif line.startswith(b"MemAvailable:"):
+            mem_available = int(line.split()[1]) / 1024
+        if mem_total is not None and mem_available is not None:
+            return mem_total, mem_available
+    raise ValueError("MemTotal/MemAvailable missing from /proc/meminfo")
+
 
 @dataclass
 class SelfTestResult:
@@ -153,9 +177,11 @@ class HealthChecker:
         )
 
         # Config file existence
-        config_files = list(context.install_path.glob("config.y*ml")) + list(context.install_path.glob("config.json"))
-        if config_files:
-            cfg_detail = config_files[0].name
+        from config import Config
+
+        config_file = Config.find_app_config(context.install_path)
+        if config_file is not None:
+            cfg_detail = config_file.name
             cfg_hint = ""
             cfg_status = "pass"
         else:
@@ -318,12 +344,15 @@ class HealthChecker:
         clear_terminal()
         self.printer.header("System Health Check")
 
+        installed = self.install_dir.exists()
+
         # Disk space
-        disk_path = self.install_dir if self.install_dir.exists() else Path("/")
+        disk_path = self.install_dir if installed else Path("/")
         stat = os.statvfs(disk_path)
         free_gb = (stat.f_bavail * stat.f_frsize) / (1024**3)
         total_gb = (stat.f_blocks * stat.f_frsize) / (1024**3)
-        used_percent = ((total_gb - free_gb) / total_gb) * 100
+        # Block counts share a unit, so the ratio needs no byte conversion
+        used_percent = (1 - stat.f_bavail / stat.f_blocks) * 100 if stat.f_blocks else 0.0
 
         logger.info("=== Disk Space ===")
         logger.info("Location: %s", self.install_dir)
@@ -338,24 +367,25 @@ class HealthChecker:
         else:
             self.printer.success("✓ Disk space healthy")
 
-        # Services
+        # Services; products, Nginx and MongoDB are fetched with one systemctl call
         logger.info("=== Services Status ===")
-        if self.install_dir.exists():
+        product_dirs = list_product_dirs(self.install_dir) if installed else []
+        self.systemd.prime_cache([f"plex-{product_dir.name}" for product_dir in product_dirs] + ["nginx", "mongod"])
+        if installed:
             all_running = True
-            for product_dir in self.install_dir.iterdir():
-                if product_dir.is_dir() and product_dir.name != "backups":
-                    service_name = f"plex-{product_dir.name}"
-                    status = self.systemd.get_status(service_name)
-
-                    normalized = status.strip().lower()
-                    if normalized == "active":
-                        logger.info("  ✓ %s: Running", product_dir.name)
-                    elif normalized == "inactive":
-                        logger.warning("  ○ %s: Stopped", product_dir.name)
-                        all_running = False
-                    else:
-                        logger.error("  ✗ %s: Not Found", product_dir.name)
-                        all_running = False
+            for product_dir in product_dirs:
+                service_name = f"plex-{product_dir.name}"
+                status = self.systemd.get_status(service_name)
+
+                normalized = status.strip().lower()
+                if normalized == "active":
+                    logger.info("  ✓ %s: Running", product_dir.name)
+                elif normalized == "inactive":
+                    logger.warning("  ○ %s: Stopped", product_dir.name)
+                    all_running = False
+                else:
+                    logger.error("  ✗ %s: Not Found", product_dir.name)
+                    all_running = False
 
             if all_running:
                 self.printer.success("\n✓ All services are running")
@@ -364,40 +394,29 @@ class HealthChecker:
         else:
             self.printer.warning("No installations found")
 
-        # Nginx
+        # get_status reports "unknown" when systemctl itself could not be queried
+        nginx_state = self.systemd.get_status("nginx").strip()
+        mongod_state = self.systemd.get_status("mongod").strip()
+
         logger.info("=== Web Server Status ===")
-        try:
-            result = subprocess.run(
-                ["systemctl", "is-active", "nginx"],
-                capture_output=True,
-                text=True,
-            )
-            if result.stdout.strip() == "active":
-                self.printer.success("✓ Nginx is running")
-            else:
-                self.printer.error("✗ Nginx is not running")
-        except Exception:
+        if nginx_state == "unknown":
             self.printer.warning("⚠ Could not check Nginx status")
+        elif nginx_state == "active":
+            self.printer.success("✓ Nginx is running")
+        else:
+            self.printer.error("✗ Nginx is not running")
 
-        # MongoDB
         logger.info("=== Database Status ===")
-        try:
-            result = subprocess.run(
-                ["systemctl", "is-active", "mongod"],
-                capture_output=True,
-                text=True,
-            )
-            if result.stdout.strip() == "active":
-                self.printer.success("✓ MongoDB is running")
-            else:
-                self.printer.warning("○ MongoDB is not running")
-        except Exception:
+        if mongod_state == "unknown":
             self.printer.step("ℹ MongoDB not installed or not using systemd")
+        elif mongod_state == "active":
+            self.printer.success("✓ MongoDB is running")
+        else:
+            self.printer.warning("○ MongoDB is not running")
 
         # SSL certificates
         logger.info("=== SSL Certificates ===")
-        certbot_installed = subprocess.run(["which", "certbot"], capture_output=True).returncode == 0
-        if certbot_installed:
+        if shutil.which("certbot"):
             try:
                 result = subprocess.run(["certbot", "certificates"], capture_output=True, text=True)
                 if "No certificates found" in result.stdout:
@@ -413,23 +432,20 @@ class HealthChecker:
         # Memory
         logger.info("=== Memory Usage ===")
         try:
-            with open("/proc/meminfo") as f:
-                lines = f.readlines()
-                mem_total = int([line for line in lines if "MemTotal" in line][0].split()[1]) / 1024
-                mem_available = int([line for line in lines if "MemAvailable" in line][0].split()[1]) / 1024
-                mem_used = mem_total - mem_available
-                mem_percent = (mem_used / mem_total) * 100
-
-                logger.info("Total: %.0f MB", mem_total)
-                logger.info("Used: %.0f MB (%.1f%%)", mem_used, mem_percent)
-                logger.info("Available: %.0f MB", mem_available)
-
-                if mem_percent > 90:
-                    self.printer.error("⚠ WARNING: Memory usage above 90%!")
-                elif mem_percent > 80:
-                    self.printer.warning("⚠ Memory usage above 80%")
-                else:
-                    self.printer.success("✓ Memory usage healthy")
+            mem_total, mem_available = _read_meminfo()
+            mem_used = mem_total - mem_available
+            mem_percent = (mem_used / mem_total) * 100
+
+            logger.info("Total: %.0f MB", mem_total)
+            logger.info("Used: %.0f MB (%.1f%%)", mem_used, mem_percent)
+            logger.info("Available: %.0f MB", mem_available)
+
+            if mem_percent > 90:
+                self.printer.error("⚠ WARNING: Memory usage above 90%!")
+            elif mem_percent > 80:
+                self.printer.warning("⚠ Memory usage above 80%")
+            else:
+                self.printer.success("✓ Memory usage healthy")
         except Exception:
             self.printer.warning("⚠ Could not check memory usage")
 
@@ -7,9 +7,10 @@ Modular, maintainable installer for Plex products
 import argparse
 import atexit
 import fcntl
-import io
 import json
+import mmap
 import os
+import pwd
 import re
 import secrets
 import shlex
@@ -17,10 +18,12 @@ import shutil
 import subprocess
 import sys
 import tempfile
+import threading
 import urllib.request
+from concurrent.futures import Future
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
 from config import Config
 from utils import (
@@ -34,6 +37,8 @@ from utils import (
     SystemdManager,
     clear_terminal,
     install_staged_directory,
+    list_product_dirs,
+    remove_tree_in_background,
     safe_extract_tar,
     validate_path_component,
 )
@@ -85,12 +90,223 @@ except ImportError:
     SelfTestResult = None  # type: ignore[assignment,misc]
 from utils import setup_logging
 
+try:
+    import readline  # noqa: F401 - gives input() line editing and history
+except ImportError:  # pragma: no cover - not available on every platform
+    readline = None  # type: ignore[assignment]
+try:
+    import yaml  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover - PyYAML is a declared dependency
+    yaml = None  # type: ignore[assignment]
+
 # Current installer version
 INSTALLER_VERSION = "3.3.1"
 VERSION_CHECK_URL = "https://raw.githubusercontent.com/Bali0531-RC/plexinstaller/main/version.json"
 LOCK_FILE = "/var/run/plexinstaller.lock"
 RESOURCE_MANIFEST = ".plexinstaller-resources.json"
 _SYSTEM_TEMP_ROOTS = frozenset(path.resolve() for path in (Path(tempfile.gettempdir()), Path("/tmp"), Path("/var/tmp")))
+_ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+_ARCHIVE_SEARCH_SKIP_DIRS = frozenset({"node_modules", ".git", ".cache", "snap"})
+_ARCHIVE_SEARCH_MAX_DEPTH = 4
+_ARCHIVE_SEARCH_MAX_ENTRIES = 200_000
+_YAML_PORT_RE = re.compile(rb"^[ \t]*port[ \t]*:[ \t]*(\d+)(?:[ \t]*(?:#.*)?)?\r?$", re.IGNORECASE | re.MULTILINE)
+_INSTANCE_NAME_RE = re.compile(r"[A-Za-z0-9_-]+")
+_DOMAIN_RE = re.compile(r"[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*")
+_EMAIL_RE = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+_MANIFEST_DOMAIN_RE = re.compile(r"[A-Za-z0-9](?:[A-Za-z0-9.-]{0,251}[A-Za-z0-9])?")
+_VERSION_CHECK_TIMEOUT = 5
+_NPM_STDERR_TAIL_BYTES = 8 * 1024
+# npm ci refuses a lockfile that disagrees with package.json, and says so near the start of stderr
+_NPM_CI_OUT_OF_SYNC = b"package.json and package-lock.json or npm-shrinkwrap.json are in sync"
+_NPM_CI_HEAD_BYTES = 64 * 1024
+# Without a TTY certbot delays renewals by up to eight minutes to spread
+# cron load; a renewal the user asked for should start immediately.
+_CERTBOT_RENEW_FLAGS = ("--no-random-sleep-on-renew",)
+# Skip the audit, funding and update-notifier requests and reuse the npm cache when it is warm
+_NPM_INSTALL_FLAGS = (
+    "--prefer-offline",
+    "--no-audit",
+    "--no-fund",
+    "--no-progress",
+    "--no-update-notifier",
+    "--loglevel=error",
+)
+# Main-menu entries that install a product directly, with their default ports
+_MENU_PRODUCTS = {
+    "2": ("plexstaff", 3001),
+    "3": ("drakostatus", 3002),
+    "4": ("drakostore", 3003),
+    "5": ("drakoforms", 3004),
+    "6": ("drakolinks", 3005),
+    "7": ("drakopaste", 3006),
+    "8": ("drakotracker", 3007),
+}
+
+
+def _scan_product_dir(product_dir: Path) -> tuple[Path | None, str | None]:
+    """Return a product's preferred config file and the port its YAML declares."""
+    config_file = Config.find_app_config(product_dir)
+    if config_file is None or config_file.suffix == ".json":
+        return config_file, None
+    # Search a read-only mapping: the scan stops at the first match, so only
+    # the pages up to the port line are faulted in instead of copying the file.
+    try:
+        with open(config_file, "rb") as stream:
+            if os.fstat(stream.fileno()).st_size == 0:
+                return config_file, None
+            with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                match = _YAML_PORT_RE.search(mapped)
+                port = match.group(1).decode("ascii") if match else None
+    except (OSError, ValueError):
+        return config_file, None
+    return config_file, port
+
+
+def _file_tail(stream: IO[bytes], limit: int) -> bytes:
+    """Return at most the last *limit* bytes of *stream*, starting on a whole line."""
+    size = stream.seek(0, os.SEEK_END)
+    stream.seek(max(0, size - limit))
+    tail = stream.read()
+    if size > limit:
+        _, _, tail = tail.partition(b"\n")
+    return tail
+
+
+def _fetch_version_manifest() -> bytes:
+    """Download the raw, still unauthenticated, update manifest."""
+    with urllib.request.urlopen(VERSION_CHECK_URL, timeout=_VERSION_CHECK_TIMEOUT) as response:
+        body: bytes = response.read()
+    return body
+
+
+def _archive_search_home() -> Path:
+    """Return the home directory of the user who invoked the installer.
+
+    Under ``sudo`` :meth:`Path.home` is root's home, while the archive was
+    almost always downloaded into the invoking user's; searching that one
+    instead avoids walking ``/root`` for nothing.
+    """
+    sudo_user = os.environ.get("SUDO_USER")
+    if sudo_user and sudo_user != "root":
+        try:
+            return Path(pwd.getpwnam(sudo_user).pw_dir)
+        except KeyError:
+            pass
+    return Path.home()
+
+
+def _iter_archives(root: Path, product_names: tuple[str, ...]) -> list[tuple[Path, int]]:
+    """Collect ``(path, size)`` for product archives below a resolved *root*.
+
+    The walk stays on *root*'s filesystem, never enters directory symlinks,
+    skips dependency/VCS noise and stops after a bounded number of entries so
+    a large home directory cannot stall the installer.
+    """
+    found: list[tuple[Path, int]] = []
+    try:
+        root_dev = root.stat().st_dev
+    except OSError:
+        return found
+    pending = [(os.fspath(root), 0)]
+    scanned = 0
+    while pending and scanned < _ARCHIVE_SEARCH_MAX_ENTRIES:
+        directory, depth = pending.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    scanned += 1
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if (
+                                depth < _ARCHIVE_SEARCH_MAX_DEPTH
+                                and entry.name not in _ARCHIVE_SEARCH_SKIP_DIRS
+                                and entry.stat(follow_symlinks=False).st_dev == root_dev
+                            ):
+                                pending.append((entry.path, depth + 1))
+                            continue
+                        name = entry.name.lower()
+                        if name.endswith(_ARCHIVE_SUFFIXES) and any(
+                            product_name in name for product_name in product_names
+                        ):
+                            path = os.path.realpath(entry.path) if entry.is_symlink() else entry.path
+                            found.append((Path(path), entry.stat().st_size))
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return found
+
+
+_BANNER_ART = "".join(
+    f"{line}\n"
+    for line in (
+        r"  _____  _           _____                 _                                  _   ",
+        r" |  __ \| |         |  __ \               | |                                | |  ",
+        r" | |__) | | _____  _| |  | | _____   _____| | ___  _ __  _ __ ___   ___ _ __ | |_ ",
+        r" |  ___/| |/ _ \ \/ / |  | |/ _ \ \ / / _ \ |/ _ \| '_ \| '_ \` _ \ / _ \ '_ \| __|",
+        r" | |    | |  __/>  <| |__| |  __/\ V /  __/ | (_) | |_) | | | | | |  __/ | | | |_ ",
+        r" |_|    |_|\___/_/\_\_____/ \___| \_/ \___|_|\___/| .__/|_| |_| |_|\___|_| |_|\__|",
+        r"                                                  | |                             ",
+        r"                                                  |_|                             ",
+    )
+)
+# Built once so the banner reaches a slow terminal in a single write
+_BANNER = (
+    f"{ColorPrinter.BOLD}{ColorPrinter.CYAN}{_BANNER_ART}{ColorPrinter.NC}\n"
+    f"{ColorPrinter.BOLD}{ColorPrinter.PURPLE} UNOFFICIAL Installation Script for PlexDevelopment Products"
+    f"{ColorPrinter.NC}\n"
+)
+
+# Served by nginx while the app is down; encoded once since it never changes
+_ERROR_502_HTML = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Service Temporarily Unavailable</title>
+    <style>
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            min-height: 100vh;
+            margin: 0;
+        }
+        .container {
+            background: rgba(255, 255, 255, 0.1);
+            backdrop-filter: blur(10px);
+            border-radius: 20px;
+            padding: 3rem;
+            text-align: center;
+            max-width: 500px;
+        }
+        h1 { font-size: 3rem; margin-bottom: 1rem; }
+        .retry-btn {
+            background: rgba(255, 255, 255, 0.2);
+            color: white;
+            border: 1px solid rgba(255, 255, 255, 0.3);
+            padding: 12px 24px;
+            border-radius: 8px;
+            cursor: pointer;
+            text-decoration: none;
+            display: inline-block;
+            margin-top: 1rem;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>502</h1>
+        <h2>Service Temporarily Unavailable</h2>
+        <p>The PlexDevelopment service is starting up. Please wait...</p>
+        <a href="javascript:window.location.reload()" class="retry-btn">🔄 Retry</a>
+    </div>
+    <script>setTimeout(function(){ window.location.reload(); }, 30000);</script>
+</body>
+</html>""".encode()
 
 
 class UserAbortError(Exception):
@@ -136,15 +352,21 @@ class PlexInstaller:
         non_interactive: bool = False,
         check_updates: bool = True,
         isolate_services: bool | None = None,
+        answers: dict[str, Any] | None = None,
     ):
         self.version = version
         self.assume_yes = assume_yes
         self.non_interactive = non_interactive
         self.check_updates = check_updates
         self.isolate_services = isolate_services
+        self.answers = dict(answers or {})
+        # Version manifest fetched in the background while the installer starts up
+        self._manifest_future: Future[bytes] | None = None
+        # Whether output reaches a terminal; it cannot change during a run
+        self.stdout_is_tty = sys.stdout.isatty()
         self.config = Config()
         self.printer = ColorPrinter()
-        self._lock_fd: io.TextIOWrapper | None = None
+        self._lock_fd: int | None = None
 
         # Check root FIRST before any file operations
         if os.geteuid() != 0:
@@ -206,26 +428,43 @@ class PlexInstaller:
         # Register cleanup on exit
         atexit.register(self._release_lock)
 
+        if self.check_updates:
+            self._start_manifest_fetch()
+
+    def _start_manifest_fetch(self) -> None:
+        """Begin downloading the version manifest on a daemon thread so exit never waits on it."""
+        future: Future[bytes] = Future()
+
+        def run() -> None:
+            try:
+                future.set_result(_fetch_version_manifest())
+            except BaseException as exc:
+                future.set_exception(exc)
+
+        threading.Thread(target=run, name="version-check", daemon=True).start()
+        self._manifest_future = future
+
     def _acquire_lock(self) -> bool:
         """Acquire exclusive lock to prevent concurrent installer runs"""
         try:
-            self._lock_fd = open(LOCK_FILE, "w")
-            fcntl.flock(self._lock_fd.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-            self._lock_fd.write(str(os.getpid()))
-            self._lock_fd.flush()
+            # Truncate only once the lock is held so a running installer keeps its PID
+            self._lock_fd = os.open(LOCK_FILE, os.O_CREAT | os.O_RDWR, 0o644)
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            os.ftruncate(self._lock_fd, 0)
+            os.write(self._lock_fd, str(os.getpid()).encode())
             return True
         except OSError:
-            if self._lock_fd:
-                self._lock_fd.close()
+            if self._lock_fd is not None:
+                os.close(self._lock_fd)
                 self._lock_fd = None
             return False
 
     def _release_lock(self):
         """Release the lock file"""
-        if self._lock_fd:
+        if self._lock_fd is not None:
             try:
-                fcntl.flock(self._lock_fd.fileno(), fcntl.LOCK_UN)
-                self._lock_fd.close()
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+                os.close(self._lock_fd)
                 self._lock_fd = None
                 # Remove lock file
                 try:
@@ -257,28 +496,75 @@ class PlexInstaller:
             else:
                 self.printer.warning("Some installer actions may be unavailable until dependencies are repaired.")
 
-        # Main menu
-        return self._show_main_menu()
+        try:
+            # An answers file naming a product installs it without the menu
+            if "product" in self.answers:
+                return self._install_from_answers()
+
+            # Main menu
+            return self._show_main_menu()
+        finally:
+            # Restores delete the replaced tree in the background
+            if self.backup_mgr is not None:
+                self.backup_mgr.wait_for_cleanup()
+
+    def _install_from_answers(self) -> int:
+        """Install the product named in the answers file."""
+        product = self.config.canonical_product_name(self._ask("product", ""))
+        if product == "plextickets":
+            return self._install_plextickets()
+        for menu_product, default_port in _MENU_PRODUCTS.values():
+            if menu_product == product:
+                return self._install_product(product, default_port)
+        self.printer.error(f"Unknown product in answers file: {product}")
+        return 1
 
     def _display_banner(self):
         """Display PlexDevelopment banner"""
-        print(f"{ColorPrinter.BOLD}{ColorPrinter.CYAN}", end="")
-        print(r"  _____  _           _____                 _                                  _   ")
-        print(r" |  __ \| |         |  __ \               | |                                | |  ")
-        print(r" | |__) | | _____  _| |  | | _____   _____| | ___  _ __  _ __ ___   ___ _ __ | |_ ")
-        print(r" |  ___/| |/ _ \ \/ / |  | |/ _ \ \ / / _ \ |/ _ \| '_ \| '_ \` _ \ / _ \ '_ \| __|")
-        print(r" | |    | |  __/>  <| |__| |  __/\ V /  __/ | (_) | |_) | | | | | |  __/ | | | |_ ")
-        print(r" |_|    |_|\___/_/\_\_____/ \___| \_/ \___|_|\___/| .__/|_| |_| |_|\___|_| |_|\__|")
-        print(r"                                                  | |                             ")
-        print(r"                                                  |_|                             ")
-        print(ColorPrinter.NC)
-        print(
-            f"{ColorPrinter.BOLD}{ColorPrinter.PURPLE} UNOFFICIAL Installation Script for PlexDevelopment Products{ColorPrinter.NC}"
+        sys.stdout.write(
+            f"{_BANNER}{ColorPrinter.CYAN}{self.version.upper()} Version - Python-Based Installer{ColorPrinter.NC}\n\n"
         )
-        print(f"{ColorPrinter.CYAN}{self.version.upper()} Version - Python-Based Installer{ColorPrinter.NC}\n")
+        sys.stdout.flush()
+
+    def _ask(self, key: str, prompt: str, default: str = "") -> str:
+        """Return the answers-file value for key, else prompt (or default when non-interactive)."""
+        if key in self.answers:
+            value = self.answers[key]
+            if isinstance(value, bool):
+                return "y" if value else "n"
+            return str(value).strip()
+        if self.non_interactive:
+            return default
+        return input(prompt).strip() or default
+
+    def _can_reprompt(self, key: str) -> bool:
+        """Whether an invalid answer for key can be asked for again."""
+        return key not in self.answers and not self.non_interactive
+
+    def _ask_validated(self, key: str, prompt: str, pattern: re.Pattern[str], label: str) -> str:
+        """Prompt until the answer fully matches pattern; abort when it cannot be asked again."""
+        while True:
+            value = self._ask(key, prompt)
+            if not value:
+                self.printer.error(f"{label} cannot be empty")
+            elif pattern.fullmatch(value):
+                return value
+            else:
+                self.printer.error(f"Invalid {label.lower()} format. Please enter a valid {label.lower()}.")
+            if not self._can_reprompt(key):
+                raise UserAbortError(f"A valid {label.lower()} is required")
+
+    def _answered_archive(self, key: str) -> Path | None:
+        archive_path = Path(self._ask(key, "")).expanduser()
+        if archive_path.is_file():
+            return archive_path
+        self.printer.error(f"File not found: {archive_path}")
+        return None
 
-    def _confirm(self, prompt: str, *, default: bool = False) -> bool:
-        """Prompt consistently while supporting --yes and non-interactive mode."""
+    def _confirm(self, prompt: str, *, default: bool = False, key: str | None = None) -> bool:
+        """Prompt consistently while supporting --yes, non-interactive mode and answers files."""
+        if key is not None and key in self.answers:
+            return self._ask(key, prompt).lower() in {"y", "yes", "true", "1"}
         if self.assume_yes:
             return True
         if self.non_interactive or not sys.stdin.isatty():
@@ -335,9 +621,12 @@ class PlexInstaller:
         try:
             self.printer.step("Checking for installer updates...")
 
-            # Fetch version info
-            with urllib.request.urlopen(VERSION_CHECK_URL, timeout=5) as response:
-                version_json_bytes = response.read()
+            # Fetch version info, reusing the download started in __init__
+            future, self._manifest_future = self._manifest_future, None
+            if future is not None:
+                version_json_bytes = future.result(timeout=_VERSION_CHECK_TIMEOUT)
+            else:
+                version_json_bytes = _fetch_version_manifest()
             version_data = json.loads(version_json_bytes.decode())
 
             if not self._verify_gpg_signature(version_json_bytes):
@@ -447,36 +736,13 @@ class PlexInstaller:
     def _show_main_menu(self) -> int:
         """Display main menu and handle user choice"""
         exit_code = 0
+        redraw = True
         while True:
-            clear_terminal()
-            self._display_banner()
-            self.printer.header("Main Menu")
-
-            # Show quick status overview
-            self._show_services_status()
-            print()
-
-            print("Plex Development Products")
-            print("1) Install PlexTickets")
-            print("2) Install PlexStaff")
-            print("----------------------------------------")
-            print("Drako Development Products")
-            print("3) Install DrakoStatus")
-            print("4) Install DrakoStore")
-            print("5) Install DrakoForms")
-            print("6) Install DrakoLinks")
-            print("7) Install DrakoPaste")
-            print("8) Install DrakoTracker")
-            print("----------------------------------------")
-            print("9) Manage Installations")
-            print("10) Manage Backups")
-            print("11) Manage Addons (PlexTickets/PlexStaff)")
-            print("12) SSL Certificate Management")
-            print("13) System Health Check")
-            print("----------------------------------------")
-            print("0) Exit")
+            if redraw:
+                self._draw_main_menu()
 
             choice = input("\nEnter your choice: ").strip()
+            redraw = True
 
             if choice == "0":
                 self.printer.success("Goodbye!")
@@ -484,20 +750,9 @@ class PlexInstaller:
             elif choice == "1":
                 result = self._install_plextickets()
                 exit_code = max(exit_code, result)
-            elif choice == "2":
-                exit_code = max(exit_code, self._install_product("plexstaff", 3001))
-            elif choice == "3":
-                exit_code = max(exit_code, self._install_product("drakostatus", 3002))
-            elif choice == "4":
-                exit_code = max(exit_code, self._install_product("drakostore", 3003))
-            elif choice == "5":
-                exit_code = max(exit_code, self._install_product("drakoforms", 3004))
-            elif choice == "6":
-                exit_code = max(exit_code, self._install_product("drakolinks", 3005))
-            elif choice == "7":
-                exit_code = max(exit_code, self._install_product("drakopaste", 3006))
-            elif choice == "8":
-                exit_code = max(exit_code, self._install_product("drakotracker", 3007))
+            elif choice in _MENU_PRODUCTS:
+                product, default_port = _MENU_PRODUCTS[choice]
+                exit_code = max(exit_code, self._install_product(product, default_port))
             elif choice == "9":
                 self._manage_installations()
             elif choice == "10":
@@ -515,48 +770,67 @@ class PlexInstaller:
                 else:
                     self.health.system_health_check()
             else:
+                # Re-prompt in place; the menu is still on screen
                 self.printer.error("Invalid choice")
+                redraw = False
+                continue
 
-            if choice != "0":  # pragma: no branch
-                input("\nPress Enter to continue...")
+            input("\nPress Enter to continue...")
         return exit_code
 
+    def _draw_main_menu(self):
+        """Clear the screen and print the banner, service overview and menu."""
+        clear_terminal()
+        self._display_banner()
+        self.printer.header("Main Menu")
+
+        # Show quick status overview
+        self._show_services_status()
+        print()
+
+        print("Plex Development Products")
+        print("1) Install PlexTickets")
+        print("2) Install PlexStaff")
+        print("----------------------------------------")
+        print("Drako Development Products")
+        print("3) Install DrakoStatus")
+        print("4) Install DrakoStore")
+        print("5) Install DrakoForms")
+        print("6) Install DrakoLinks")
+        print("7) Install DrakoPaste")
+        print("8) Install DrakoTracker")
+        print("----------------------------------------")
+        print("9) Manage Installations")
+        print("10) Manage Backups")
+        print("11) Manage Addons (PlexTickets/PlexStaff)")
+        print("12) SSL Certificate Management")
+        print("13) System Health Check")
+        print("----------------------------------------")
+        print("0) Exit")
+
     def _show_services_status(self):
         """Show quick status overview of all services"""
-        if not self.config.install_dir.exists():
+        # The table is for people; piped or scripted runs skip the systemctl
+        # query and the ANSI-coloured rows entirely.
+        if not self.stdout_is_tty:
             return
 
-        products = [d for d in self.config.install_dir.iterdir() if d.is_dir() and d.name != "backups"]
+        # A missing install dir lists as no products, so it needs no separate stat
+        products = list_product_dirs(self.config.install_dir)
 
         if not products:
             return
 
+        self.systemd.prime_cache([f"plex-{product_dir.name}" for product_dir in products])
+
         print("\n+--------------+------------------+------+")
         print("| Product      | Service Status   | Port |")
         print("+--------------+------------------+------+")
 
         for product_dir in products:
             product = product_dir.name
-            service_name = f"plex-{product}"
-            status = self.systemd.get_status(service_name)
-
-            # Get port from config if possible
-            port = "N/A"
-            for config_file in product_dir.glob("config.y*ml"):
-                try:
-                    import re
-
-                    content = config_file.read_text()
-                    match = re.search(
-                        r"^[ \t]*port[ \t]*:[ \t]*(\d+)(?:[ \t]*(?:#.*)?)?$",
-                        content,
-                        re.IGNORECASE | re.MULTILINE,
-                    )
-                    if match:
-                        port = match.group(1)
-                        break
-                except Exception:
-                    pass
+            status = self.systemd.get_status(f"plex-{product}")
+            port = _scan_product_dir(product_dir)[1] or "N/A"
 
             status_display = status
             normalized = status.strip().lower()
@@ -578,7 +852,7 @@ class PlexInstaller:
         print("2) Install Bot Only (no web interface)")
         print("0) Back")
 
-        choice = input("\nEnter your choice: ").strip()
+        choice = self._ask("plextickets_mode", "\nEnter your choice: ")
 
         if choice == "1":
             return self._install_product("plextickets", 3000, has_dashboard=True)
@@ -696,7 +970,9 @@ class PlexInstaller:
             port = default_port
             if needs_web:
                 current_step = "web_setup"
-                has_domain = self._confirm("Do you have a domain name for this instance?", default=False)
+                has_domain = self._confirm(
+                    "Do you have a domain name for this instance?", default=False, key="has_domain"
+                )
                 if has_domain:
                     domain, port, email = self._setup_web(instance_name, default_port, extracted_path, context)
                     context.domain = domain
@@ -836,33 +1112,25 @@ class PlexInstaller:
     def _handle_multi_instance(self, product: str) -> str:
         """Handle multi-instance installations"""
         canonical_product = self.config.canonical_product_name(product)
-        existing_instances = []
-        if self.config.install_dir.exists():
-            existing_instances = [
-                path
-                for path in self.config.install_dir.iterdir()
-                if path.is_dir()
-                and path.name != "backups"
-                and self.config.canonical_product_name(path.name) == canonical_product
-            ]
+        existing_instances = [
+            path
+            for path in list_product_dirs(self.config.install_dir)
+            if self.config.canonical_product_name(path.name) == canonical_product
+        ]
 
         if existing_instances:
             names = ", ".join(sorted(path.name for path in existing_instances))
             self.printer.warning(f"Found existing installation(s): {names}")
-            if self._confirm("Install another instance (multi-instance)?", default=False):
+            if self._confirm("Install another instance (multi-instance)?", default=False, key="multi_instance"):
                 suffix = secrets.token_hex(3)
                 default_name = f"{canonical_product}-{suffix}"
 
-                instance_name = (
-                    ""
-                    if self.non_interactive
-                    else input(f"Enter unique instance name (default: {default_name}): ").strip()
+                instance_name = self._ask(
+                    "instance_name", f"Enter unique instance name (default: {default_name}): ", default_name
                 )
-                if not instance_name:
-                    instance_name = default_name
 
                 # Validate instance name
-                if not re.match(r"^[a-zA-Z0-9_-]+$", instance_name):
+                if not _INSTANCE_NAME_RE.fullmatch(instance_name):
                     raise ValueError("Invalid instance name. Use only letters, numbers, dash, underscore")
                 if (self.config.install_dir / instance_name).exists():
                     raise UserAbortError(f"Instance '{instance_name}' already exists")
@@ -878,7 +1146,7 @@ class PlexInstaller:
         """Find product archive file"""
         self.printer.step(f"Searching for {product} archive...")
 
-        home = Path.home()
+        home = _archive_search_home()
         trusted_roots = (home, home / "Downloads", Path.cwd())
         search_dirs = []
         seen_roots = set()
@@ -899,41 +1167,43 @@ class PlexInstaller:
             seen_roots.add(root_key)
             search_dirs.append(resolved_root)
 
-        archives = []
+        answer_key = "dashboard_archive" if product == "dashboard" else "archive"
+        if answer_key in self.answers:
+            return self._answered_archive(answer_key)
+
+        archives: list[tuple[Path, int]] = []
         seen_paths = set()
         product_names = self.config.equivalent_product_names(product)
-        patterns = ["*.zip", "*.tar", "*.tar.gz", "*.tgz", "*.tar.bz2", "*.tbz2", "*.tar.xz", "*.txz"]
 
         for search_dir in search_dirs:
             if not search_dir.exists():
                 continue
 
-            for pattern in patterns:
-                for archive in search_dir.rglob(pattern):
-                    if any(product_name in archive.name.lower() for product_name in product_names):
-                        resolved = archive.resolve()
-                        if is_system_temp_path(resolved):
-                            continue
-                        if str(resolved) in seen_paths:
-                            continue
-                        seen_paths.add(str(resolved))
-                        archives.append(resolved)
+            for archive, size in _iter_archives(search_dir, product_names):
+                if is_system_temp_path(archive):
+                    continue
+                if str(archive) in seen_paths:
+                    continue
+                seen_paths.add(str(archive))
+                archives.append((archive, size))
 
         if not archives:
             self.printer.warning("No archives found automatically")
-            path = input("Enter full path to archive file: ").strip()
+            path = self._ask(answer_key, "Enter full path to archive file: ")
             archive_path = Path(path)
-            if archive_path.exists():
+            if path and archive_path.exists():
                 return archive_path
             else:
                 self.printer.error(f"File not found: {path}")
                 return None
 
         # Display found archives
+        if self.non_interactive:
+            self.printer.error(f"Archive must be chosen explicitly; set '{answer_key}' in the answers file")
+            return None
         print("\nFound archives:")
-        for i, archive in enumerate(archives, 1):
-            size = archive.stat().st_size / (1024 * 1024)  # MB
-            print(f"{i}) {archive} ({size:.1f} MB)")
+        for i, (archive, size) in enumerate(archives, 1):
+            print(f"{i}) {archive} ({size / (1024 * 1024):.1f} MB)")
         print("0) Enter custom path")
 
         choice = input("\nSelect archive: ").strip()
@@ -945,7 +1215,7 @@ class PlexInstaller:
         try:
             idx = int(choice) - 1
             if 0 <= idx < len(archives):
-                return archives[idx]
+                return archives[idx][0]
         except ValueError:
             pass
 
@@ -980,79 +1250,59 @@ class PlexInstaller:
 
         self.printer.step("Installing NPM dependencies...")
 
-        try:
-            command = ["npm", "install", "--loglevel=error"]
+        # A shipped lockfile lets `npm ci` skip dependency resolution entirely;
+        # vendor archives often ship one that is stale, which only install accepts
+        verbs = ("ci", "install") if (install_path / "package-lock.json").is_file() else ("install",)
+        for verb in verbs:
+            command = ["npm", verb, *_NPM_INSTALL_FLAGS]
             if run_as_user:
+                # Isolated services keep npm's per-user cache; sharing one would let
+                # one service user seed packages for another.
                 command = ["runuser", "--user", run_as_user, "--", *command]
-            subprocess.run(command, cwd=install_path, check=True, capture_output=True, timeout=300)
-            self.printer.success("NPM dependencies installed")
-            return True
-        except subprocess.CalledProcessError as e:
-            if isinstance(e.stderr, bytes):
-                detail = e.stderr.decode(errors="replace").strip()
-            elif isinstance(e.stderr, str):
-                detail = e.stderr.strip()
             else:
-                detail = ""
-            self.printer.error(f"NPM install failed: {detail or str(e)}")
-            return False
+                command.append(f"--cache={self._npm_cache_dir()}")
+
+            # npm's progress output is never shown; stderr is spooled to disk so a
+            # failure can report its tail without holding megabytes in memory
+            with tempfile.TemporaryFile() as stderr_log:
+                try:
+                    subprocess.run(
+                        command,
+                        cwd=install_path,
+                        check=True,
+                        stdin=subprocess.DEVNULL,
+                        stdout=subprocess.DEVNULL,
+                        stderr=stderr_log,
+                        timeout=600,
+                    )
+                except subprocess.CalledProcessError as e:
+                    stderr_log.seek(0)
+                    if verb == "ci" and _NPM_CI_OUT_OF_SYNC in stderr_log.read(_NPM_CI_HEAD_BYTES):
+                        self.printer.warning("package-lock.json is out of sync with package.json; using npm install")
+                        continue
+                    detail = _file_tail(stderr_log, _NPM_STDERR_TAIL_BYTES).decode(errors="replace").strip()
+                    self.printer.error(f"NPM install failed: {detail or str(e)}")
+                    return False
+            break
+        self.printer.success("NPM dependencies installed")
+        return True
+
+    def _npm_cache_dir(self) -> Path:
+        """Return the root-owned npm cache shared by every root-run install."""
+        cache_dir = self.config.npm_cache_dir
+        cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        return cache_dir
 
     def _create_502_page(self, install_path: Path, product: str):
         """Create custom 502 error page"""
         error_page = install_path / "502.html"
 
-        html_content = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Service Temporarily Unavailable</title>
-    <style>
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            min-height: 100vh;
-            margin: 0;
-        }
-        .container {
-            background: rgba(255, 255, 255, 0.1);
-            backdrop-filter: blur(10px);
-            border-radius: 20px;
-            padding: 3rem;
-            text-align: center;
-            max-width: 500px;
-        }
-        h1 { font-size: 3rem; margin-bottom: 1rem; }
-        .retry-btn {
-            background: rgba(255, 255, 255, 0.2);
-            color: white;
-            border: 1px solid rgba(255, 255, 255, 0.3);
-            padding: 12px 24px;
-            border-radius: 8px;
-            cursor: pointer;
-            text-decoration: none;
-            display: inline-block;
-            margin-top: 1rem;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>502</h1>
-        <h2>Service Temporarily Unavailable</h2>
-        <p>The PlexDevelopment service is starting up. Please wait...</p>
-        <a href="javascript:window.location.reload()" class="retry-btn">🔄 Retry</a>
-    </div>
-    <script>setTimeout(function(){ window.location.reload(); }, 30000);</script>
-</body>
-</html>"""
-
-        error_page.write_text(html_content)
-        os.chmod(error_page, 0o644)
+        # Mode is set at creation and enforced on the descriptor, so a strict
+        # umask needs no second path lookup; never follow a shipped symlink.
+        fd = os.open(error_page, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_NOFOLLOW, 0o644)
+        with os.fdopen(fd, "wb") as stream:
+            os.fchmod(fd, 0o644)
+            stream.write(_ERROR_502_HTML)
         self.printer.success("Created 502 error page")
 
     def _setup_web(
@@ -1062,38 +1312,23 @@ class PlexInstaller:
 
         port = self._select_available_port(default_port)
 
-        # Get domain with format validation
-        domain_pattern = re.compile(
-            r"^[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$"
+        domain = self._ask_validated(
+            "domain", f"Enter domain (e.g., {instance_name}.example.com): ", _DOMAIN_RE, "Domain"
         )
-        domain = ""
-        while not domain:
-            domain = input(f"Enter domain (e.g., {instance_name}.example.com): ").strip()
-            if not domain:
-                self.printer.error("Domain cannot be empty")
-            elif not domain_pattern.match(domain):
-                self.printer.error("Invalid domain format. Please enter a valid domain.")
-                domain = ""
-
-        # Get email with format validation
-        email_pattern = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
-        email = ""
-        while not email:
-            email = input("Enter email for SSL certificates: ").strip()
-            if not email:
-                self.printer.error("Email cannot be empty")
-            elif not email_pattern.match(email):
-                self.printer.error("Invalid email format. Please enter a valid email.")
-                email = ""
+
+        # Resolve DNS in the background while the email is being entered
+        dns_lookup = self.dns_checker.lookup_async(domain)
+
+        email = self._ask_validated("email", "Enter email for SSL certificates: ", _EMAIL_RE, "Email")
 
         context.domain = domain
         context.email = email
         self.config.persist_app_port(install_path, port)
 
         # Check DNS
-        if not self.dns_checker.check(domain):
-            proceed = input("DNS check failed. Proceed anyway? (y/n): ").strip().lower()
-            if proceed != "y":
+        if not self.dns_checker.check(domain, dns_lookup):
+            proceed = self._ask("proceed_without_dns", "DNS check failed. Proceed anyway? (y/n): ", "n").lower()
+            if proceed not in {"y", "yes"}:
                 raise UserAbortError("Installation aborted due to DNS issues")
 
         # Setup nginx
@@ -1127,20 +1362,18 @@ class PlexInstaller:
     def _select_available_port(self, default_port: int) -> int:
         """Prompt for and verify a port before any config is committed."""
         while True:
-            if self.non_interactive:
-                raw = str(default_port)
-            else:
-                raw = input(f"Enter port (default: {default_port}): ").strip() or str(default_port)
-            if raw.isdigit() and 1 <= int(raw) <= 65535:
+            raw = self._ask("port", f"Enter port (default: {default_port}): ", str(default_port))
+            # isdecimal, unlike isdigit, rejects digits such as "²" that int() cannot parse
+            if raw.isdecimal() and 1 <= int(raw) <= 65535:
                 port = int(raw)
                 if self.config.is_port_available(port):
                     return port
                 self.printer.error(f"Port {port} is already in use. Choose another port.")
-                if self.non_interactive:
+                if not self._can_reprompt("port"):
                     raise UserAbortError(f"Port {port} is already in use")
             else:
                 self.printer.error("Port must be a number between 1 and 65535.")
-                if self.non_interactive:
+                if not self._can_reprompt("port"):
                     raise UserAbortError("Invalid port")
 
     def _install_dashboard(self, install_path: Path, *, run_as_user: str | None = None):
@@ -1175,7 +1408,7 @@ class PlexInstaller:
         """Setup systemd service"""
         self._last_service_isolated = False
         self._last_service_identity_released = False
-        choice = self._confirm(f"Set up '{instance_name}' to auto-start on boot?", default=False)
+        choice = self._confirm(f"Set up '{instance_name}' to auto-start on boot?", default=False, key="autostart")
 
         if choice:
             isolate = self._isolation_requested() if isolated is None else isolated
@@ -1211,7 +1444,7 @@ class PlexInstaller:
         value = os.environ.get("PLEX_ISOLATE_SERVICES")
         if value is not None:
             return value.strip().lower() in {"1", "true", "yes", "on"}
-        return self._confirm("Use an isolated non-root service identity?", default=False)
+        return self._confirm("Use an isolated non-root service identity?", default=False, key="isolate_services")
 
     def _create_systemd_service(self, instance_name: str, install_path: Path, *, isolated: bool) -> None:
         """Create root-default or opt-in isolated services with legacy fallback."""
@@ -1234,14 +1467,11 @@ class PlexInstaller:
 
     def _post_install(self, instance_name: str, install_path: Path, domain: str | None, needs_web: bool):
         """Post-installation tasks"""
-        # Find config file
-        config_files = list(install_path.glob("config.y*ml")) + list(install_path.glob("config.json"))
-
-        if config_files:
-            config_file = config_files[0]
+        config_file = self.config.find_app_config(install_path)
+        if config_file is not None:
             self.printer.step(f"Configuration file: {config_file}")
 
-            if self._confirm("Edit configuration now?", default=False):
+            if self._confirm("Edit configuration now?", default=False, key="edit_config"):
                 if not self._run_editor(config_file):
                     self.printer.warning("Configuration editor did not exit successfully")
                 self.printer.step(f"Restart service: sudo systemctl restart plex-{instance_name}")
@@ -1291,7 +1521,7 @@ class PlexInstaller:
 
         if context.install_path_created and context.install_path and context.install_path.exists():
             try:
-                shutil.rmtree(context.install_path, ignore_errors=True)
+                remove_tree_in_background(context.install_path)
                 self.printer.step(f"Removed {context.install_path}")
             except Exception as exc:
                 self.printer.warning(f"Failed to remove install directory: {exc}")
@@ -1363,7 +1593,7 @@ class PlexInstaller:
             self.printer.warning(f"No installations found in {install_dir}")
             return
 
-        products = [d for d in install_dir.iterdir() if d.is_dir() and d.name != "backups"]
+        products = list_product_dirs(install_dir)
 
         if not products:
             self.printer.warning("No installed products found")
@@ -1425,17 +1655,16 @@ class PlexInstaller:
     def _edit_config(self, product: str):
         """Edit product configuration"""
         install_path = self.config.install_dir / product
-        config_files = list(install_path.glob("config.y*ml")) + list(install_path.glob("config.json"))
-
-        if config_files:
-            self._run_editor(config_files[0])
+        config_file = self.config.find_app_config(install_path)
+        if config_file is not None:
+            self._run_editor(config_file)
             self.printer.step(f"Restart service: sudo systemctl restart plex-{product}")
         else:
             self.printer.warning("No configuration file found")
 
     def _uninstall_product(self, product: str):
         """Uninstall a product"""
-        if not re.fullmatch(r"[A-Za-z0-9_-]+", product):
+        if not _INSTANCE_NAME_RE.fullmatch(product):
             self.printer.error("Invalid installation name")
             return False
         install_path = self.config.install_dir / product
@@ -1505,7 +1734,7 @@ class PlexInstaller:
                 self.printer.warning(f"Could not remove isolated service identity: {exc}")
 
         if install_path.exists():
-            shutil.rmtree(install_path)
+            remove_tree_in_background(install_path)
             self.printer.success(f"Removed {install_path}")
 
         if not drop_data and manifest.get("mongodb", {}).get("database"):
@@ -1563,10 +1792,7 @@ class PlexInstaller:
                     if port is not None and (not isinstance(port, int) or not 1 <= port <= 65535):
                         raise ValueError("manifest firewall port is invalid")
                     domain = data.get("domain")
-                    if domain is not None and not re.fullmatch(
-                        r"[A-Za-z0-9](?:[A-Za-z0-9.-]{0,251}[A-Za-z0-9])?",
-                        str(domain),
-                    ):
+                    if domain is not None and not _MANIFEST_DOMAIN_RE.fullmatch(str(domain)):
                         raise ValueError("manifest domain is invalid")
                     mongo = data.get("mongodb") or {}
                     if not isinstance(mongo, dict):
@@ -1636,7 +1862,9 @@ class PlexInstaller:
         if confirm == "y":
             self.printer.step("Forcing SSL certificate renewal...")
             try:
-                subprocess.run(["certbot", "renew", "--force-renewal"], check=True)
+                # One certbot run covers every lineage: certbot holds a global
+                # lock, so per-certificate runs could not overlap anyway.
+                subprocess.run(["certbot", "renew", "--force-renewal", *_CERTBOT_RENEW_FLAGS], check=True)
                 self.printer.success("SSL certificates renewed successfully!")
                 self.printer.step("Reloading Nginx...")
                 subprocess.run(["systemctl", "reload", "nginx"])
@@ -1649,7 +1877,7 @@ class PlexInstaller:
         """Test SSL certificate renewal (dry run)"""
         self.printer.step("Running SSL renewal test (dry run)...")
         try:
-            subprocess.run(["certbot", "renew", "--dry-run"], check=True)
+            subprocess.run(["certbot", "renew", "--dry-run", *_CERTBOT_RENEW_FLAGS], check=True)
             self.printer.success("SSL renewal test successful! All certificates can be renewed.")
         except subprocess.CalledProcessError:
             self.printer.error("SSL renewal test failed. Check output above for details.")
@@ -1707,16 +1935,12 @@ class PlexInstaller:
         """Get list of installed products that support addons"""
         products: list[tuple[str, Path]] = []
 
-        if not self.config.install_dir.exists():
-            return products
+        for product_dir in list_product_dirs(self.config.install_dir):
+            # Check if this product type supports addons
+            product_config = self.config.get_product(product_dir.name)
 
-        for product_dir in self.config.install_dir.iterdir():
-            if product_dir.is_dir() and product_dir.name != "backups":
-                # Check if this product type supports addons
-                product_config = self.config.get_product(product_dir.name)
-
-                if product_config and getattr(product_config, "supports_addons", False):
-                    products.append((product_dir.name, product_dir))
+            if product_config and getattr(product_config, "supports_addons", False):
+                products.append((product_dir.name, product_dir))
 
         return sorted(products)
 
@@ -2073,6 +2297,23 @@ class PlexInstaller:
     # ========== END ADDON MANAGEMENT ==========
 
 
+def _load_answers(path: Path) -> dict[str, Any]:
+    """Load an answers file (YAML, or JSON) mapping prompt keys to values."""
+    text = path.read_text(encoding="utf-8")
+    if yaml is not None and path.suffix.lower() != ".json":
+        try:
+            data = yaml.safe_load(text)
+        except yaml.YAMLError as exc:
+            raise ValueError(str(exc)) from exc
+    else:
+        data = json.loads(text)
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise ValueError("expected a mapping of prompt keys to answers")
+    return {str(key): value for key, value in data.items()}
+
+
 def main(argv: list[str] | None = None):
     """Entry point"""
     setup_logging()
@@ -2087,8 +2328,20 @@ def main(argv: list[str] | None = None):
         action="store_true",
         help="opt in to dedicated non-root service users; root remains the default and fallback",
     )
+    parser.add_argument(
+        "--answers",
+        metavar="FILE",
+        help="YAML/JSON file answering install prompts (product, port, domain, email, ...)",
+    )
     args = parser.parse_args(argv)
 
+    answers = None
+    if args.answers:
+        try:
+            answers = _load_answers(Path(args.answers))
+        except (OSError, ValueError) as exc:
+            parser.error(f"cannot load answers file: {exc}")
+
     # Determine version from command line or environment
     version = os.environ.get("PLEX_INSTALLER_VERSION", "stable")
 
@@ -2098,6 +2351,7 @@ def main(argv: list[str] | None = None):
         non_interactive=args.non_interactive,
         check_updates=not args.no_update_check,
         isolate_services=True if args.isolate_services else None,
+        answers=answers,
     )
     if args.repair_dependencies:
         installer.system.detect()
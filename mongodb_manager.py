@@ -12,10 +12,62 @@ import shutil
 import string
 import subprocess
 import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from utils import ColorPrinter, SystemDetector
 
+# Repository lists and keyrings left behind by earlier MongoDB installs
+_OLD_MONGO_ARTIFACTS = (
+    "/etc/apt/sources.list.d/mongodb-org-7.0.list",
+    "/etc/apt/sources.list.d/mongodb-org-6.0.list",
+    "/etc/apt/sources.list.d/mongodb-org-5.0.list",
+    "/etc/apt/sources.list.d/mongodb-org-4.4.list",
+    "/usr/share/keyrings/mongodb-server-7.0.gpg",
+    "/usr/share/keyrings/mongodb-server-6.0.gpg",
+    "/usr/share/keyrings/mongodb-server-5.0.gpg",
+    "/usr/share/keyrings/mongodb-server-4.4.gpg",
+)
+
+# Armored MongoDB signing keys are a few KiB; anything larger is not a key
+_MONGO_KEY_MAX_BYTES = 64 * 1024
+
+# YAML keys that may hold the connection string, in order of preference
+_MONGO_URI_KEYS = ("mongouri", "mongodb_uri", "database_url")
+_MONGO_URI_FIELD_RE = re.compile(
+    r'^(\s*(mongoURI|mongodb_uri|database_url)\s*:\s*)["\']?.*?["\']?\s*$', re.IGNORECASE | re.MULTILINE
+)
+
+
+def _replace_mongo_uri_field(content: str, quoted_value: str) -> str | None:
+    """Point the preferred URI field at *quoted_value* in one scan of *content*.
+
+    Every occurrence of the most preferred key present is rewritten; other
+    keys are left alone.  Returns None when no URI field exists.
+    """
+    matches = list(_MONGO_URI_FIELD_RE.finditer(content))
+    if not matches:
+        return None
+    key = min((match.group(2).lower() for match in matches), key=_MONGO_URI_KEYS.index)
+    parts = []
+    position = 0
+    for match in matches:
+        if match.group(2).lower() == key:
+            parts += [content[position : match.start()], match.group(1), quoted_value]
+            position = match.end()
+    parts.append(content[position:])
+    return "".join(parts)
+
+
+def _fetch_signing_key(url: str) -> bytes:
+    """Download an armored repository signing key, refusing oversized bodies."""
+    with urllib.request.urlopen(url, timeout=30) as response:
+        armored_key: bytes = response.read(_MONGO_KEY_MAX_BYTES + 1)
+    if len(armored_key) > _MONGO_KEY_MAX_BYTES:
+        raise ValueError(f"MongoDB signing key at {url} is larger than {_MONGO_KEY_MAX_BYTES} bytes")
+    return armored_key
+
 
 class MongoDBManager:
     """Handles MongoDB installation, user creation, and config patching."""
@@ -31,6 +83,8 @@ class MongoDBManager:
         self.system = system
         self.mongodb_version = mongodb_version
         self.mongodb_repo_version_bookworm = mongodb_repo_version_bookworm
+        # Resolved on first use, since MongoDB may be installed after construction
+        self._shell_path: str | None = None
 
     # ------------------------------------------------------------------
     # Public API
@@ -178,20 +232,16 @@ class MongoDBManager:
 
     def run_shell(self, args: list[str], timeout: int = 30) -> subprocess.CompletedProcess:
         """Run mongosh/mongo with *args*; prefers mongosh."""
-        try:
-            return subprocess.run(
-                ["mongosh"] + args,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-            )
-        except FileNotFoundError:
-            return subprocess.run(
-                ["mongo"] + args,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-            )
+        shell = self._shell_path or shutil.which("mongosh") or shutil.which("mongo")
+        if shell is None:
+            raise FileNotFoundError("Neither mongosh nor mongo is on PATH")
+        self._shell_path = shell
+        return subprocess.run(
+            [shell, *args],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
 
     # ------------------------------------------------------------------
     # User / database provisioning
@@ -220,11 +270,11 @@ class MongoDBManager:
 
     def create_user(self, instance_name: str) -> dict | None:
         """Create a MongoDB database and user for *instance_name*."""
-        alphabet = string.ascii_letters + string.digits
         random_suffix = "".join(secrets.choice(string.ascii_lowercase + string.digits) for _ in range(5))
         db_name = f"{instance_name}_{random_suffix}"
         username = f"{instance_name}_{random_suffix}_user"
-        password = "".join(secrets.choice(alphabet) for _ in range(24))
+        # 24 URL-safe characters, so the password needs no escaping in the URI
+        password = secrets.token_urlsafe(18)
 
         self.printer.step(f"Creating MongoDB database: {db_name}")
 
@@ -309,17 +359,21 @@ class MongoDBManager:
         # Open with restrictive permissions from the start (O_CREAT|O_APPEND|O_WRONLY, mode 0600)
         fd = os.open(str(creds_file), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
         try:
+            # The create mode only applies to a new file; tighten one that predates it
+            os.fchmod(fd, 0o600)
             f = os.fdopen(fd, "a")
         except Exception:
             os.close(fd)
             raise
 
         with f:
-            f.write(f"\n# {instance_name}\n")
-            f.write(f"DATABASE={creds['database']}\n")
-            f.write(f"USERNAME={creds['username']}\n")
-            f.write(f"PASSWORD={creds['password']}\n")
-            f.write(f"URI={creds['uri']}\n")
+            f.write(
+                f"\n# {instance_name}\n"
+                f"DATABASE={creds['database']}\n"
+                f"USERNAME={creds['username']}\n"
+                f"PASSWORD={creds['password']}\n"
+                f"URI={creds['uri']}\n"
+            )
         self.printer.success(f"Credentials saved to {creds_file}")
 
     @staticmethod
@@ -388,14 +442,14 @@ class MongoDBManager:
 
     def update_config(self, install_path: Path, creds: dict):
         """Patch product config file with MongoDB connection string."""
-        config_files = list(install_path.glob("config.y*ml")) + list(install_path.glob("config.json"))
+        from config import Config
 
-        if not config_files:
+        config_file = Config.find_app_config(install_path)
+        if config_file is None:
             self.printer.warning("No config file found to update with MongoDB settings")
             self.printer.step(f"MongoDB URI: {creds['uri']}")
             return
 
-        config_file = config_files[0]
         mongo_uri = creds["uri"]
 
         if config_file.suffix.lower() == ".json":
@@ -429,33 +483,9 @@ class MongoDBManager:
         try:
             content = config_file.read_text(encoding="utf-8", errors="replace")
             escaped_uri = mongo_uri.replace("\\", "\\\\").replace('"', '\\"')
-            patterns = [
-                (
-                    r'^(\s*mongoURI\s*:\s*)["\']?.*?["\']?\s*$',
-                    r'\1"' + escaped_uri + '"',
-                ),
-                (
-                    r'^(\s*mongodb_uri\s*:\s*)["\']?.*?["\']?\s*$',
-                    r'\1"' + escaped_uri + '"',
-                ),
-                (
-                    r'^(\s*database_url\s*:\s*)["\']?.*?["\']?\s*$',
-                    r'\1"' + escaped_uri + '"',
-                ),
-                (
-                    r'^(\s*MongoURI\s*:\s*)["\']?.*?["\']?\s*$',
-                    r'\1"' + escaped_uri + '"',
-                ),
-            ]
-            updated = False
-            for pattern, replacement in patterns:
-                if re.search(pattern, content, flags=re.IGNORECASE | re.MULTILINE):
-                    content = re.sub(pattern, replacement, content, flags=re.IGNORECASE | re.MULTILINE)
-                    updated = True
-                    break
-
-            if updated:
-                config_file.write_text(content)
+            updated_content = _replace_mongo_uri_field(content, f'"{escaped_uri}"')
+            if updated_content is not None:
+                config_file.write_text(updated_content)
                 self.printer.success(f"Updated MongoDB URI in {config_file.name}")
             else:
                 self.printer.warning(f"Could not find MongoDB URI field in {config_file.name}")
@@ -497,92 +527,52 @@ class MongoDBManager:
         """Install MongoDB on Debian/Ubuntu."""
         try:
             self.printer.step("Cleaning up old MongoDB repositories...")
-            old_repo_files = [
-                "/etc/apt/sources.list.d/mongodb-org-7.0.list",
-                "/etc/apt/sources.list.d/mongodb-org-6.0.list",
-                "/etc/apt/sources.list.d/mongodb-org-5.0.list",
-                "/etc/apt/sources.list.d/mongodb-org-4.4.list",
-            ]
-            old_gpg_keys = [
-                "/usr/share/keyrings/mongodb-server-7.0.gpg",
-                "/usr/share/keyrings/mongodb-server-6.0.gpg",
-                "/usr/share/keyrings/mongodb-server-5.0.gpg",
-                "/usr/share/keyrings/mongodb-server-4.4.gpg",
-            ]
-
-            for repo_file in old_repo_files:
-                if Path(repo_file).exists():
-                    Path(repo_file).unlink()
-            for gpg_key in old_gpg_keys:
-                if Path(gpg_key).exists():
-                    Path(gpg_key).unlink()
-
-            self.printer.step("Installing prerequisites (gnupg, curl)...")
-            subprocess.run(
-                ["apt-get", "install", "-y", "gnupg", "curl"],
-                check=True,
-                capture_output=True,
-                timeout=120,
-            )
+            for artifact in _OLD_MONGO_ARTIFACTS:
+                Path(artifact).unlink(missing_ok=True)
 
             mongo_ver = self.mongodb_version
             mongo_ver_bookworm = self.mongodb_repo_version_bookworm
-            self.printer.step("Adding MongoDB repository...")
             keyring_path = Path(f"/usr/share/keyrings/mongodb-server-{mongo_ver}.gpg")
-            curl_command = [
-                "curl",
-                "-fsSL",
-                f"https://www.mongodb.org/static/pgp/server-{mongo_ver}.asc",
-            ]
-            curl_process = subprocess.Popen(curl_command, stdout=subprocess.PIPE)
+            key_url = f"https://www.mongodb.org/static/pgp/server-{mongo_ver}.asc"
+
+            # The key download does not need gnupg, so it overlaps the apt-get install
+            pool = ThreadPoolExecutor(max_workers=1)
+            key_download = pool.submit(_fetch_signing_key, key_url)
             try:
-                if curl_process.stdout is None:
-                    raise RuntimeError("Failed to capture MongoDB signing-key download")
-                try:
-                    subprocess.run(
-                        [
-                            "gpg",
-                            "-o",
-                            str(keyring_path),
-                            "--dearmor",
-                        ],
-                        stdin=curl_process.stdout,
-                        check=True,
-                        timeout=30,
-                    )
-                finally:
-                    curl_process.stdout.close()
+                self.printer.step("Installing prerequisites (gnupg)...")
+                subprocess.run(
+                    ["apt-get", "install", "-y", "gnupg"],
+                    check=True,
+                    capture_output=True,
+                    timeout=120,
+                )
             except Exception:
-                try:
-                    curl_process.terminate()
-                except OSError:
-                    pass
-                try:
-                    curl_process.wait()
-                except Exception:
-                    pass
-                try:
-                    keyring_path.unlink(missing_ok=True)
-                except OSError:
-                    pass
+                # Report the apt failure now instead of waiting out the fetch
+                key_download.cancel()
+                pool.shutdown(wait=False, cancel_futures=True)
                 raise
+            try:
+                armored_key = key_download.result()
+            finally:
+                pool.shutdown()
 
-            curl_returncode = curl_process.wait()
-            if curl_returncode != 0:
+            self.printer.step("Adding MongoDB repository...")
+            try:
+                subprocess.run(
+                    ["gpg", "--batch", "--yes", "-o", str(keyring_path), "--dearmor"],
+                    input=armored_key,
+                    check=True,
+                    timeout=30,
+                )
+            except Exception:
                 try:
                     keyring_path.unlink(missing_ok=True)
                 except OSError:
                     pass
-                raise subprocess.CalledProcessError(curl_returncode, curl_command)
+                raise
 
             distro = (self.system.distribution or "").lower()
-            distro_codename = subprocess.run(
-                ["lsb_release", "-cs"],
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=10,
-            ).stdout.strip()
+            distro_codename = self.system.distro_codename
 
             if "ubuntu" in distro:
                 repo_line = (
@@ -625,8 +615,7 @@ class MongoDBManager:
             subprocess.run(["apt-get", "install", "-y", "mongodb-org"], check=True, timeout=300)
 
             self.printer.step("Starting MongoDB service...")
-            subprocess.run(["systemctl", "start", "mongod"], check=True, timeout=60)
-            subprocess.run(["systemctl", "enable", "mongod"], check=True, timeout=30)
+            subprocess.run(["systemctl", "enable", "--now", "mongod"], check=True, timeout=90)
 
             self.printer.success("MongoDB installed successfully")
             return True
@@ -656,8 +645,7 @@ class MongoDBManager:
             else:
                 subprocess.run(["yum", "install", "-y", "mongodb-org"], check=True, timeout=300)
 
-            subprocess.run(["systemctl", "start", "mongod"], check=True, timeout=60)
-            subprocess.run(["systemctl", "enable", "mongod"], check=True, timeout=30)
+            subprocess.run(["systemctl", "enable", "--now", "mongod"], check=True, timeout=90)
 
             self.printer.success("MongoDB installed successfully")
             return True
@@ -687,8 +675,7 @@ class MongoDBManager:
                 check=True,
                 timeout=300,
             )
-            subprocess.run(["systemctl", "start", "mongodb"], check=True, timeout=60)
-            subprocess.run(["systemctl", "enable", "mongodb"], check=True, timeout=30)
+            subprocess.run(["systemctl", "enable", "--now", "mongodb"], check=True, timeout=90)
 
             self.printer.success("MongoDB installed successfully")
             return True
@@ -21,9 +21,12 @@ from colorama import Fore, Style
 from colorama import init as colorama_init
 
 try:
+    from config import APP_CONFIG_NAMES as _APP_CONFIG_NAMES
     from config import Config
 except Exception:  # pragma: no cover
     Config = None  # type: ignore[assignment,misc]
+    # Mirrors config.APP_CONFIG_NAMES (most preferred first) for standalone use
+    _APP_CONFIG_NAMES = ("config.yml", "config.yaml", "config.json")
 
 try:
     from addon_manager import AddonManager
@@ -96,6 +99,16 @@ def _confirm(prompt: str, *, assume_yes: bool = False, non_interactive: bool = F
     return input(f"{prompt} (y/N): ").strip().lower() in {"y", "yes"}
 
 
+def _find_app_config(app_dir: Path) -> Path | None:
+    """Return the preferred config.yml/config.yaml/config.json in app_dir, if any."""
+    try:
+        with os.scandir(app_dir) as it:
+            present = {entry.name for entry in it if entry.name in _APP_CONFIG_NAMES and entry.is_file()}
+    except OSError:
+        return None
+    return next((app_dir / name for name in _APP_CONFIG_NAMES if name in present), None)
+
+
 def _editor_command() -> list[str]:
     """Parse EDITOR safely and choose a usable fallback."""
     configured = os.environ.get("EDITOR", "nano")
@@ -535,11 +548,9 @@ def list_apps(json_output: bool = False):
         print(f"  Path: {app_dir}")
 
         # Show config file if exists
-        for config_name in ["config.yml", "config.yaml", "config.json"]:
-            config_file = app_dir / config_name
-            if config_file.exists():
-                print(f"  Config: {config_file}")
-                break
+        config_file = _find_app_config(app_dir)
+        if config_file is not None:
+            print(f"  Config: {config_file}")
 
         # Show if enabled on boot
         if status_info["enabled"]:
@@ -685,14 +696,7 @@ def edit_config(app: str):
         return 1
 
     app_dir = INSTALL_DIR / instance
-    config_file = None
-
-    # Look for config files
-    for config_name in ["config.yml", "config.yaml", "config.json"]:
-        potential_config = app_dir / config_name
-        if potential_config.exists():
-            config_file = potential_config
-            break
+    config_file = _find_app_config(app_dir)
 
     if not config_file:
         print_error(f"No configuration file found for {app}")
@@ -757,12 +761,7 @@ def debug_app(app: str, *, assume_yes: bool = False, non_interactive: bool = Fal
         return 1
 
     app_dir = INSTALL_DIR / instance
-    config_path = None
-    for config_name in ["config.yml", "config.yaml", "config.json"]:
-        candidate = app_dir / config_name
-        if candidate.exists():
-            config_path = candidate
-            break
+    config_path = _find_app_config(app_dir)
 
     if config_path:
         try:
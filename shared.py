@@ -6,6 +6,8 @@ Contains update logic, GPG verification, version comparison, and CLI entrypoint
 management that were previously duplicated between installer.py and plex_cli.py.
 """
 
+import contextlib
+import functools
 import hashlib
 import json
 import os
@@ -15,10 +17,16 @@ import subprocess
 import sys
 import tempfile
 import urllib.request
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
+from typing import Any
 from urllib.parse import urlsplit
 
+try:
+    import requests  # type: ignore[import-untyped]
+except Exception:  # pragma: no cover
+    requests = None  # type: ignore[assignment]
+
 INSTALLER_DIR = Path("/opt/plexinstaller")
 VERSION_CHECK_URL = "https://raw.githubusercontent.com/Bali0531-RC/plexinstaller/main/version.json"
 VERSION_SIGNATURE_URL = "https://raw.githubusercontent.com/Bali0531-RC/plexinstaller/main/version.json.sig"
@@ -27,7 +35,9 @@ RELEASE_KEY_FINGERPRINT = "431E869D5BB519AFF7B028379B0DFA4BF86307BD"
 MAX_MANIFEST_BYTES = 1024 * 1024
 MAX_SIGNATURE_BYTES = 1024 * 1024
 MAX_UPDATE_FILE_BYTES = 16 * 1024 * 1024
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
 _SHA256_PATTERN = re.compile(r"^[0-9a-fA-F]{64}$")
+_VERSION_PATTERN = re.compile(r"v?(?P<release>\d+(?:\.\d+)*)(?:-(?P<pre>[0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?")
 
 # Files managed by the auto-update system
 MANAGED_FILES = [
@@ -71,29 +81,110 @@ def _validate_download_url(url: str, *, allow_insecure_urls: bool = False) -> st
     return url
 
 
-def _download_bytes(
+def _download_session() -> contextlib.AbstractContextManager[Any]:
+    """Return a keep-alive session for a batch of downloads from one host.
+
+    Every managed file lives on the same host, so one pooled connection
+    saves a TCP and TLS handshake per file.  Without ``requests`` this is a
+    null context and each download opens its own connection.
+    """
+    if requests is None:
+        return contextlib.nullcontext(None)
+    return requests.Session()
+
+
+def _download_chunks(
     url: str,
     *,
     timeout: int,
     max_bytes: int,
     allow_insecure_urls: bool = False,
-) -> bytes:
-    """Download a bounded response while rejecting insecure redirects."""
+    session: Any = None,
+) -> Iterator[bytes]:
+    """Yield a bounded response in chunks while rejecting insecure redirects.
+
+    *session* (from :func:`_download_session`) reuses its pooled connection.
+    """
     _validate_download_url(url, allow_insecure_urls=allow_insecure_urls)
+    if session is not None:
+        with session.get(url, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            _validate_download_url(response.url, allow_insecure_urls=allow_insecure_urls)
+            yield from _bounded_chunks(response.iter_content(_DOWNLOAD_CHUNK_SIZE), max_bytes)
+        return
+
     with urllib.request.urlopen(url, timeout=timeout) as response:
         final_url = response.geturl() if hasattr(response, "geturl") else None
         if isinstance(final_url, str):
             _validate_download_url(final_url, allow_insecure_urls=allow_insecure_urls)
-        limit = max_bytes + 1
-        content = bytearray()
-        while len(content) < limit:
-            chunk = response.read(min(64 * 1024, limit - len(content)))
-            if not chunk:
-                break
-            content.extend(chunk)
-    if len(content) > max_bytes:
-        raise ValueError(f"Download exceeds the {max_bytes}-byte size limit")
-    return bytes(content)
+        yield from _bounded_chunks(iter(lambda: response.read(_DOWNLOAD_CHUNK_SIZE), b""), max_bytes)
+
+
+def _bounded_chunks(chunks: Iterable[bytes], max_bytes: int) -> Iterator[bytes]:
+    total = 0
+    for chunk in chunks:
+        total += len(chunk)
+        if total > max_bytes:
+            raise ValueError(f"Download exceeds the {max_bytes}-byte size limit")
+        yield chunk
+
+
+def _download_bytes(
+    url: str,
+    *,
+    timeout: int,
+    max_bytes: int,
+    allow_insecure_urls: bool = False,
+    session: Any = None,
+) -> bytes:
+    """Download a bounded response into memory; see :func:`_download_chunks`."""
+    return b"".join(
+        _download_chunks(
+            url,
+            timeout=timeout,
+            max_bytes=max_bytes,
+            allow_insecure_urls=allow_insecure_urls,
+            session=session,
+        )
+    )
+
+
+def _download_verified_file(
+    url: str,
+    path: Path,
+    *,
+    expected_hash: str,
+    filename: str,
+    mode: int,
+    timeout: int,
+    max_bytes: int,
+    allow_insecure_urls: bool = False,
+    session: Any = None,
+) -> None:
+    """Stream a download into a new staged file, hashing it on the way.
+
+    Each chunk is hashed and written as it arrives, so the file is never held
+    in memory.  A checksum mismatch raises once the body is complete; the
+    caller discards its staging directory.
+    """
+    digest = hashlib.sha256()
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+    with os.fdopen(fd, "wb") as handle:
+        for chunk in _download_chunks(
+            url,
+            timeout=timeout,
+            max_bytes=max_bytes,
+            allow_insecure_urls=allow_insecure_urls,
+            session=session,
+        ):
+            digest.update(chunk)
+            handle.write(chunk)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.chmod(path, mode)
+    actual_hash = digest.hexdigest()
+    if actual_hash != expected_hash.lower():
+        raise ValueError(f"Checksum mismatch for {filename}: expected {expected_hash}, got {actual_hash}")
 
 
 def _parse_manifest(version_json_bytes: bytes) -> dict:
@@ -134,12 +225,6 @@ def _validated_download_specs(
     return specs
 
 
-def _verify_checksum(content: bytes, expected_hash: str, filename: str) -> None:
-    actual_hash = hashlib.sha256(content).hexdigest()
-    if actual_hash != expected_hash.lower():
-        raise ValueError(f"Checksum mismatch for {filename}: expected {expected_hash}, got {actual_hash}")
-
-
 def _file_mode(filename: str) -> int:
     return 0o755 if filename in {"installer.py", "plex_cli.py"} else 0o644
 
@@ -268,21 +353,27 @@ def download_missing_files(
             allow_insecure_urls=allow_insecure_urls,
         )
         INSTALLER_DIR.mkdir(parents=True, exist_ok=True)
-        with tempfile.TemporaryDirectory(prefix=".repair-stage-", dir=INSTALLER_DIR) as temp_dir:
+        with (
+            tempfile.TemporaryDirectory(prefix=".repair-stage-", dir=INSTALLER_DIR) as temp_dir,
+            _download_session() as session,
+        ):
             stage_dir = Path(temp_dir)
             staged: dict[str, Path] = {}
             for key, filename in missing.items():
                 url, expected_hash = specs[key]
                 print_info(f"Downloading {filename}...")
-                content = _download_bytes(
+                staged_path = stage_dir / filename
+                _download_verified_file(
                     url,
+                    staged_path,
+                    expected_hash=expected_hash,
+                    filename=filename,
+                    mode=_file_mode(filename),
                     timeout=30,
                     max_bytes=MAX_UPDATE_FILE_BYTES,
                     allow_insecure_urls=allow_insecure_urls,
+                    session=session,
                 )
-                _verify_checksum(content, expected_hash, filename)
-                staged_path = stage_dir / filename
-                _write_staged_file(staged_path, content, _file_mode(filename))
                 staged[filename] = staged_path
 
             _replace_staged_files(staged, INSTALLER_DIR)
@@ -292,23 +383,41 @@ def download_missing_files(
         print_error(f"Missing-file repair failed; no partial repair was kept: {exc}")
 
 
+@functools.lru_cache(maxsize=32)
+def _version_key(version: str) -> tuple | None:
+    """Return a sortable key for *version*, or None if it is not a version.
+
+    Trailing zero components are dropped so ``3.1`` equals ``3.1.0``, and a
+    pre-release such as ``3.2.0-rc1`` sorts before ``3.2.0`` but after any
+    ``3.1.x``.  Build metadata after ``+`` is ignored.
+    """
+    match = _VERSION_PATTERN.fullmatch(version.strip())
+    if match is None:
+        return None
+    release = [int(part) for part in match.group("release").split(".")]
+    while len(release) > 1 and release[-1] == 0:
+        release.pop()
+    pre = match.group("pre")
+    if pre is None:
+        return (tuple(release), 1, ())
+    identifiers = tuple((0, int(part), "") if part.isdigit() else (1, 0, part) for part in pre.split("."))
+    return (tuple(release), 0, identifiers)
+
+
 def is_newer_version(remote: str, local: str) -> bool:
     """Compare semantic-ish version strings.
 
-    Returns True if *remote* is strictly newer than *local*.
+    Returns True if *remote* is strictly newer than *local*.  Parsed versions
+    are cached, so repeated checks against the constant local version are free.
     """
     try:
-        remote_parts = [int(x) for x in remote.split(".")]
-        local_parts = [int(x) for x in local.split(".")]
-
-        while len(remote_parts) < len(local_parts):
-            remote_parts.append(0)
-        while len(local_parts) < len(remote_parts):
-            local_parts.append(0)
-
-        return remote_parts > local_parts
+        remote_key = _version_key(remote)
+        local_key = _version_key(local)
     except Exception:
         return False
+    if remote_key is None or local_key is None:
+        return False
+    return remote_key > local_key
 
 
 def verify_gpg_signature(
@@ -516,22 +625,28 @@ def perform_update(
         )
         INSTALLER_DIR.mkdir(parents=True, exist_ok=True)
 
-        with tempfile.TemporaryDirectory(prefix=".update-stage-", dir=INSTALLER_DIR) as temp_dir:
+        with (
+            tempfile.TemporaryDirectory(prefix=".update-stage-", dir=INSTALLER_DIR) as temp_dir,
+            _download_session() as session,
+        ):
             stage_dir = Path(temp_dir)
             staged: dict[str, Path] = {}
             for key, filename in UPDATE_FILE_MAP.items():
                 url, expected_hash = specs[key]
                 print_info(f"Downloading {filename}...")
-                content = _download_bytes(
+                staged_path = stage_dir / filename
+                _download_verified_file(
                     url,
+                    staged_path,
+                    expected_hash=expected_hash,
+                    filename=filename,
+                    mode=_file_mode(filename),
                     timeout=30,
                     max_bytes=MAX_UPDATE_FILE_BYTES,
                     allow_insecure_urls=allow_insecure_urls,
+                    session=session,
                 )
-                _verify_checksum(content, expected_hash, filename)
                 print_success(f"Checksum verified for {filename}")
-                staged_path = stage_dir / filename
-                _write_staged_file(staged_path, content, _file_mode(filename))
                 staged[filename] = staged_path
 
             _replace_staged_files(staged, INSTALLER_DIR)
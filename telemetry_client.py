@@ -8,7 +8,7 @@ import secrets
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
 import requests
 
@@ -78,6 +78,8 @@ class TelemetryClient:
         self._instance: str | None = None
         self._current_log_path: Path | None = None
         self._events: list[dict[str, Any]] = []
+        # Held open for the whole session: one write per line, no reopen/chmod
+        self._log_stream: TextIO | None = None
 
     @property
     def log_path(self) -> Path | None:
@@ -95,6 +97,7 @@ class TelemetryClient:
         self._session_id = f"{timestamp}-{safe_product}-{safe_instance}-{nonce}"
         self._product = safe_product
         self._instance = safe_instance
+        self._close_log()
         self._current_log_path = self.log_dir / f"{self._session_id}.log"
         self._events = []
         self._active = True
@@ -145,6 +148,7 @@ class TelemetryClient:
         if safe_error:
             self._write_line(f"Session error: {safe_error}")
         self._write_line(f"Session completed with status: {safe_status.upper()}")
+        self._close_log()
 
         payload: dict[str, Any] = {
             "session_id": summary.session_id,
@@ -218,8 +222,19 @@ class TelemetryClient:
     def _write_line(self, message: str):
         if not self.enabled or not self._current_log_path:
             return
+        if self._log_stream is None:
+            fd = os.open(self._current_log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.fchmod(fd, 0o600)
+                # Line buffered so a crash mid-install still leaves every step on disk
+                self._log_stream = os.fdopen(fd, "a", encoding="utf-8", buffering=1)
+            except BaseException:
+                os.close(fd)
+                raise
         timestamp = datetime.now(timezone.utc).isoformat()
-        fd = os.open(self._current_log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
-        with os.fdopen(fd, "a", encoding="utf-8") as handle:
-            handle.write(f"{timestamp} :: {message}\n")
-        self._current_log_path.chmod(0o600)
+        self._log_stream.write(f"{timestamp} :: {message}\n")
+
+    def _close_log(self) -> None:
+        if self._log_stream is not None:
+            self._log_stream.close()
+            self._log_stream = None
@@ -1,11 +1,12 @@
 """Additional coverage tests for addon_manager.py."""
 
 import json
-import subprocess
+import os
 import tarfile
 from pathlib import Path
 from unittest import mock
 
+import addon_manager
 from addon_manager import AddonManager
 from utils import SystemdManager
 
@@ -51,6 +52,21 @@ class TestListAddons:
         assert result[0]["config_path"].name == "config.yaml"
 
 
+class TestFindAddonConfig:
+    def test_prefers_yml_over_yaml(self, tmp_path: Path):
+        (tmp_path / "config.yaml").write_text("a: 1\n")
+        (tmp_path / "config.yml").write_text("a: 1\n")
+        assert _manager()._find_addon_config(tmp_path) == tmp_path / "config.yml"
+
+    def test_ignores_directories_named_like_configs(self, tmp_path: Path):
+        (tmp_path / "config.yml").mkdir()
+        (tmp_path / "config.yaml").write_text("a: 1\n")
+        assert _manager()._find_addon_config(tmp_path) == tmp_path / "config.yaml"
+
+    def test_missing_addon_directory(self, tmp_path: Path):
+        assert _manager()._find_addon_config(tmp_path / "missing") is None
+
+
 # ---------------------------------------------------------------------------
 # _service_owner
 # ---------------------------------------------------------------------------
@@ -133,23 +149,43 @@ class TestSetPermissions:
         sub.mkdir()
         (sub / "index.js").write_text("x")
 
-        calls = []
-
-        def fake_run(cmd, **kwargs):
-            calls.append(cmd)
-            return subprocess.CompletedProcess(cmd, 0)
-
-        with mock.patch("subprocess.run", side_effect=fake_run):
+        with mock.patch("utils.os.lchown") as lchown:
             _manager()._set_permissions(addon, product_path=None)
 
-        assert calls[0][:2] == ["chown", "-R"]
-        assert "root:root" in calls[0]
-        assert calls[1][0] == "find"
+        chowned = {call.args[0] for call in lchown.call_args_list}
+        assert chowned == {
+            str(addon),
+            str(addon / "config.yml"),
+            str(addon / "run.sh"),
+            str(addon / "readme.txt"),
+            str(sub),
+            str(sub / "index.js"),
+        }
+        assert all(call.args[1:] == (0, 0) for call in lchown.call_args_list)
+        assert addon.stat().st_mode & 0o777 == 0o750
+        assert sub.stat().st_mode & 0o777 == 0o750
         assert (addon / "config.yml").stat().st_mode & 0o777 == 0o600
         assert (addon / "run.sh").stat().st_mode & 0o777 == 0o750
         assert (addon / "readme.txt").stat().st_mode & 0o777 == 0o640
         assert (sub / "index.js").stat().st_mode & 0o777 == 0o640
 
+    def test_uses_isolated_owner_ids(self, tmp_path: Path):
+        addon = tmp_path / "addon"
+        addon.mkdir()
+        (addon / "index.js").write_text("x")
+        owner = mock.MagicMock(pw_uid=1234, pw_gid=4321)
+
+        with (
+            mock.patch.object(AddonManager, "_service_owner", return_value="plex-product"),
+            mock.patch("addon_manager.pwd.getpwnam", return_value=owner) as getpwnam,
+            mock.patch("utils.os.lchown") as lchown,
+        ):
+            _manager()._set_permissions(addon, product_path=tmp_path / "product")
+
+        getpwnam.assert_called_once_with("plex-product")
+        assert all(call.args[1:] == (1234, 4321) for call in lchown.call_args_list)
+        assert len(lchown.call_args_list) == 2
+
     def test_skips_symlinks(self, tmp_path: Path):
         addon = tmp_path / "addon"
         addon.mkdir()
@@ -157,10 +193,11 @@ class TestSetPermissions:
         real.write_text("x")
         (addon / "link.txt").symlink_to(real)
 
-        with mock.patch("subprocess.run", return_value=subprocess.CompletedProcess([], 0)):
+        with mock.patch("utils.os.lchown") as lchown:
             _manager()._set_permissions(addon)
 
         assert (addon / "real.txt").stat().st_mode & 0o777 == 0o640
+        assert mock.call(str(addon / "link.txt"), 0, 0) in lchown.call_args_list
 
 
 # ---------------------------------------------------------------------------
@@ -241,6 +278,7 @@ class TestBackupAddon:
 
         assert ok is True
         assert path is not None and path.exists()
+        assert f"({path.stat().st_size / (1024 * 1024):.2f} MB)" in msg
         assert path.stat().st_mode & 0o777 == 0o600
         with tarfile.open(path) as tar:
             assert "A/index.js" in tar.getnames()
@@ -249,7 +287,7 @@ class TestBackupAddon:
         product = tmp_path / "p"
         addon = product / "addons" / "A"
         addon.mkdir(parents=True)
-        with mock.patch("addon_manager.tarfile.open", side_effect=OSError("boom")):
+        with mock.patch("utils.tarfile.open", side_effect=OSError("boom")):
             ok, msg, path = _manager().backup_addon("A", product)
         assert ok is False
         assert "boom" in msg
@@ -330,6 +368,24 @@ class TestValidateYaml:
         assert ok is False
         assert err
 
+    def test_python_tags_are_rejected(self, tmp_path: Path):
+        cfg = tmp_path / "config.yml"
+        cfg.write_text("x: !!python/object/apply:os.system ['true']\n")
+        ok, err = _manager().validate_yaml(cfg)
+        assert ok is False
+        assert err
+
+    def test_falls_back_to_pure_python_loader(self, tmp_path: Path, monkeypatch):
+        import yaml
+
+        cfg = tmp_path / "config.yml"
+        cfg.write_text("key: value\n")
+        monkeypatch.delattr(yaml, "CSafeLoader", raising=False)
+        with mock.patch.object(yaml, "load", wraps=yaml.load) as load:
+            ok, err = _manager().validate_yaml(cfg)
+        assert (ok, err) == (True, None)
+        assert load.call_args.kwargs["Loader"] is yaml.SafeLoader
+
     def test_missing_file(self, tmp_path: Path):
         ok, err = _manager().validate_yaml(tmp_path / "nope.yml")
         assert ok is False
@@ -366,15 +422,76 @@ class TestFindAddonArchive:
         assert isinstance(result, list)
 
     def test_default_search_does_not_scan_system_temp(self, tmp_path: Path):
-        rglob = mock.MagicMock(side_effect=AssertionError("system temp directory was scanned"))
+        scan = mock.MagicMock(side_effect=AssertionError("system temp directory was scanned"))
         with (
             mock.patch("addon_manager._SYSTEM_TEMP_ROOTS", frozenset({tmp_path.resolve()})),
             mock.patch("addon_manager.Path.home", return_value=tmp_path),
             mock.patch("addon_manager.Path.cwd", return_value=tmp_path / "nested"),
-            mock.patch.object(Path, "rglob", rglob),
+            mock.patch("addon_manager._scan_archives", scan),
         ):
             assert _manager().find_addon_archive() == []
-        rglob.assert_not_called()
+        scan.assert_not_called()
+
+    def test_walk_skips_directory_symlinks_and_archive_named_dirs(self, tmp_path: Path):
+        d = tmp_path / "search"
+        d.mkdir()
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (outside / "hidden.zip").write_bytes(b"")
+        (d / "linked").symlink_to(outside, target_is_directory=True)
+        (d / "folder.zip").mkdir()
+        (d / "real.zip").write_bytes(b"")
+
+        result = _manager().find_addon_archive([d])
+
+        assert [p.name for p in result] == ["real.zip"]
+
+    def test_symlinked_archives_are_reported_by_target_once(self, tmp_path: Path):
+        d = tmp_path / "search"
+        d.mkdir()
+        real = d / "real.zip"
+        real.write_bytes(b"")
+        (d / "alias.zip").symlink_to(real)
+
+        real_resolve = Path.resolve
+        resolved = []
+
+        def counting_resolve(self, strict=False):
+            resolved.append(self)
+            return real_resolve(self, strict=strict)
+
+        with mock.patch.object(Path, "resolve", counting_resolve):
+            result = _manager().find_addon_archive([d])
+
+        assert result == [real.resolve()]
+        assert resolved == [d]
+
+    def test_walk_skips_unreadable_entries(self, tmp_path: Path):
+        d = tmp_path / "search"
+        d.mkdir()
+        (d / "real.zip").write_bytes(b"")
+        real_scandir = os.scandir
+
+        def flaky_scandir(path):
+            if os.fspath(path).endswith("sub"):
+                raise PermissionError("denied")
+            return real_scandir(path)
+
+        (d / "sub").mkdir()
+        (d / "sub" / "blocked.zip").write_bytes(b"")
+        with mock.patch("addon_manager.os.scandir", side_effect=flaky_scandir):
+            result = _manager().find_addon_archive([d])
+
+        assert [p.name for p in result] == ["real.zip"]
+
+    def test_walk_skips_entries_that_fail_type_checks(self, tmp_path: Path):
+        entry = mock.MagicMock()
+        entry.is_dir.side_effect = OSError("gone")
+        scandir = mock.MagicMock()
+        scandir.return_value.__enter__.return_value = iter([entry])
+
+        with mock.patch("addon_manager.os.scandir", scandir):
+            assert addon_manager._scan_archives(tmp_path) == []
 
     def test_explicit_system_temp_search_is_still_supported(self, tmp_path: Path):
         archive = tmp_path / "addon.zip"
@@ -419,6 +536,37 @@ class TestListAddonBackups:
         assert len(backups) == 1
         assert backups[0]["addon_name"] == "X"
 
+    def test_sorted_newest_first_and_dangling_links_skipped(self, tmp_path: Path):
+        product = tmp_path / "p"
+        product.mkdir()
+        backup_dir = tmp_path / "backups" / "addons"
+        backup_dir.mkdir(parents=True)
+        older = backup_dir / "p_Old_addon_20240101_120000.tar.gz"
+        newer = backup_dir / "p_New_addon_20240102_120000.tar.gz"
+        older.write_bytes(b"o")
+        newer.write_bytes(b"n")
+        os.utime(older, (1_000_000, 1_000_000))
+        os.utime(newer, (2_000_000, 2_000_000))
+        (backup_dir / "p_Gone_addon_20240103_120000.tar.gz").symlink_to(backup_dir / "missing")
+
+        backups = _manager().list_addon_backups(product)
+
+        assert [b["addon_name"] for b in backups] == ["New", "Old"]
+        assert backups[0]["path"] == newer
+
+    def test_product_name_is_matched_literally(self, tmp_path: Path):
+        product = tmp_path / "my.app"
+        product.mkdir()
+        backup_dir = tmp_path / "backups" / "addons"
+        backup_dir.mkdir(parents=True)
+        (backup_dir / "my.app_Stats_addon_20240101_120000.tar.gz").write_bytes(b"z")
+        (backup_dir / "myXapp_Other_addon_20240101_120000.tar.gz").write_bytes(b"z")
+
+        backups = _manager().list_addon_backups(product)
+
+        assert [b["addon_name"] for b in backups] == ["Stats"]
+        assert backups[0]["timestamp"].day == 1
+
     def test_nonmatching_files_ignored(self, tmp_path: Path):
         product = tmp_path / "p"
         product.mkdir()
@@ -32,10 +32,11 @@ class TestBackupProduct:
         (product_dir / "package.json").write_text('{"name":"plextickets"}')
         (product_dir / "config.yml").write_text("Token: my-token\n")
 
-        with mock.patch.object(mgr.systemd, "get_status", return_value="active"):
+        with mock.patch.object(mgr.systemd, "is_active", return_value=True):
             with mock.patch.object(mgr.systemd, "stop"):
                 with mock.patch.object(mgr.systemd, "start"):
-                    mgr.backup_product("plextickets")
+                    with mock.patch("backup_manager.shutil.which", return_value=None):
+                        mgr.backup_product("plextickets")
 
         backups = list(mgr.backup_dir.glob("*.tar.gz"))
         assert len(backups) == 1
@@ -48,7 +49,7 @@ class TestBackupProduct:
         product_dir.mkdir(parents=True)
         (product_dir / "package.json").write_text("{}")
 
-        with mock.patch.object(mgr.systemd, "get_status", return_value="active"):
+        with mock.patch.object(mgr.systemd, "is_active", return_value=True):
             with mock.patch.object(mgr.systemd, "stop") as mock_stop:
                 with mock.patch.object(mgr.systemd, "start") as mock_start:
                     mgr.backup_product("plextickets")
@@ -62,7 +63,7 @@ class TestBackupProduct:
         product_dir.mkdir(parents=True)
         (product_dir / "package.json").write_text("{}")
 
-        with mock.patch.object(mgr.systemd, "get_status", return_value="inactive"):
+        with mock.patch.object(mgr.systemd, "is_active", return_value=False):
             with mock.patch.object(mgr.systemd, "stop") as mock_stop:
                 with mock.patch.object(mgr.systemd, "start") as mock_start:
                     mgr.backup_product("plextickets")
@@ -77,7 +78,7 @@ class TestBackupProduct:
         product_dir.mkdir(parents=True)
         (product_dir / "package.json").write_text("{}")
 
-        with mock.patch.object(mgr.systemd, "get_status", return_value="inactive"):
+        with mock.patch.object(mgr.systemd, "is_active", return_value=False):
             with mock.patch.object(mgr.systemd, "stop") as mock_stop:
                 with mock.patch.object(mgr.systemd, "start") as mock_start:
                     mgr.backup_product("plextickets")
@@ -93,7 +94,10 @@ class TestBackupProduct:
         (product_dir / "package.json").write_text('{"name":"test"}')
         (product_dir / "index.js").write_text("console.log('hello');")
 
-        with mock.patch.object(mgr.systemd, "get_status", return_value="inactive"):
+        with (
+            mock.patch.object(mgr.systemd, "is_active", return_value=False),
+            mock.patch("backup_manager.shutil.which", return_value=None),
+        ):
             mgr.backup_product("plextickets")
 
         backups = list(mgr.backup_dir.glob("*.tar.gz"))
@@ -161,8 +165,8 @@ class TestRestoreFromBackup:
 
         with mock.patch.object(mgr.systemd, "stop"):
             with mock.patch.object(mgr.systemd, "start"):
-                with mock.patch.object(mgr.systemd, "get_status", side_effect=["active", "inactive"]):
-                    with mock.patch("backup_manager.subprocess.run"):
+                with mock.patch.object(mgr.systemd, "is_active", side_effect=[True, False]):
+                    with mock.patch("backup_manager.os.lchown"):
                         mgr.restore_from_backup(backup_file, "testapp")
 
         assert (product_dir / "new_file.txt").exists()
@@ -177,7 +181,7 @@ class TestRestoreFromBackup:
         backup_file = tmp_path / "bad_backup.tar.gz"
         backup_file.write_text("not a real tarball")
 
-        with mock.patch.object(mgr.systemd, "get_status", return_value="active"):
+        with mock.patch.object(mgr.systemd, "is_active", return_value=True):
             with mock.patch.object(mgr.systemd, "stop") as mock_stop:
                 with mock.patch.object(mgr.systemd, "start") as mock_start:
                     mgr.restore_from_backup(backup_file, "testapp")
@@ -186,7 +190,7 @@ class TestRestoreFromBackup:
         mock_start.assert_not_called()
         assert (product_dir / "original.txt").read_text() == "keep me"
 
-    def test_restore_calls_check_on_permissions(self, tmp_path: Path):
+    def test_restore_sets_ownership_on_restored_files(self, tmp_path: Path):
         mgr = _make_manager(tmp_path)
         product_dir = mgr.install_dir / "testapp"
         product_dir.mkdir(parents=True)
@@ -206,13 +210,14 @@ class TestRestoreFromBackup:
 
         with mock.patch.object(mgr.systemd, "stop"):
             with mock.patch.object(mgr.systemd, "start"):
-                with mock.patch.object(mgr.systemd, "get_status", return_value="active"):
-                    with mock.patch("backup_manager.subprocess.run") as mock_run:
+                with mock.patch.object(mgr.systemd, "is_active", return_value=True):
+                    with mock.patch("backup_manager.os.lchown") as mock_lchown:
                         mgr.restore_from_backup(backup_file, "testapp")
 
-        # All three subprocess.run calls should have check=True
-        for call in mock_run.call_args_list:
-            assert call.kwargs.get("check") is True or (len(call.args) > 0 and "check" not in str(call))
+        # Ownership is applied to every restored entry, without a chown -R subprocess
+        owned = {Path(call.args[0]).name: call.args[1:] for call in mock_lchown.call_args_list}
+        assert owned["testapp"] == (0, 0)
+        assert owned["file.txt"] == (0, 0)
 
     def test_restore_does_not_start_inactive_service(self, tmp_path: Path):
         mgr = _make_manager(tmp_path)
@@ -221,10 +226,10 @@ class TestRestoreFromBackup:
         (product_dir / "old.txt").write_text("old")
         backup_file = _make_product_backup(tmp_path, mgr, "testapp", "new.txt", b"new")
 
-        with mock.patch.object(mgr.systemd, "get_status", return_value="inactive"):
+        with mock.patch.object(mgr.systemd, "is_active", return_value=False):
             with mock.patch.object(mgr.systemd, "stop") as mock_stop:
                 with mock.patch.object(mgr.systemd, "start") as mock_start:
-                    with mock.patch("backup_manager.subprocess.run"):
+                    with mock.patch("backup_manager.os.lchown"):
                         mgr.restore_from_backup(backup_file, "testapp")
 
         mock_stop.assert_not_called()
@@ -237,10 +242,10 @@ class TestRestoreFromBackup:
         product_dir.mkdir(parents=True)
         backup_file = _make_product_backup(tmp_path, mgr, "testapp", "new.txt", b"new")
 
-        with mock.patch.object(mgr.systemd, "get_status", return_value="active"):
+        with mock.patch.object(mgr.systemd, "is_active", return_value=True):
             with mock.patch.object(mgr.systemd, "stop") as mock_stop:
                 with mock.patch.object(mgr.systemd, "start") as mock_start:
-                    with mock.patch("backup_manager.subprocess.run"):
+                    with mock.patch("backup_manager.os.lchown"):
                         mgr.restore_from_backup(backup_file, "testapp")
 
         mock_stop.assert_called_once_with("plex-testapp")
@@ -259,7 +264,7 @@ class TestRestoreFromBackup:
         with tarfile.open(backup_file, "w:gz") as tf:
             tf.addfile(member, BytesIO(data))
 
-        with mock.patch.object(mgr.systemd, "get_status", return_value="active"):
+        with mock.patch.object(mgr.systemd, "is_active", return_value=True):
             with mock.patch.object(mgr.systemd, "stop") as mock_stop:
                 with mock.patch.object(mgr.systemd, "start") as mock_start:
                     mgr.restore_from_backup(backup_file, "testapp")
@@ -276,7 +281,7 @@ class TestRestoreFromBackup:
         (product_dir / "original.txt").write_text("keep")
         backup_file = _make_product_backup(tmp_path, mgr, "other", "file.txt", b"wrong")
 
-        with mock.patch.object(mgr.systemd, "get_status", return_value="inactive"):
+        with mock.patch.object(mgr.systemd, "is_active", return_value=False):
             with mock.patch.object(mgr.systemd, "stop") as mock_stop:
                 with mock.patch.object(mgr.systemd, "start") as mock_start:
                     mgr.restore_from_backup(backup_file, "testapp")
@@ -292,7 +297,7 @@ class TestRestoreFromBackup:
         (product_dir / "original.txt").write_text("keep")
         backup_file = _make_product_backup(tmp_path, mgr, "testapp", "new.txt", b"new")
 
-        with mock.patch.object(mgr.systemd, "get_status", return_value="active"):
+        with mock.patch.object(mgr.systemd, "is_active", return_value=True):
             with mock.patch.object(mgr.systemd, "stop") as mock_stop:
                 with mock.patch.object(mgr.systemd, "start") as mock_start:
                     with mock.patch.object(mgr, "_set_permissions", side_effect=RuntimeError("chmod failed")):
@@ -317,10 +322,10 @@ class TestRestoreFromBackup:
                 raise OSError("publish failed")
             return original_rename(path, target)
 
-        with mock.patch.object(mgr.systemd, "get_status", return_value="active"):
+        with mock.patch.object(mgr.systemd, "is_active", return_value=True):
             with mock.patch.object(mgr.systemd, "stop"):
                 with mock.patch.object(mgr.systemd, "start"):
-                    with mock.patch("backup_manager.subprocess.run"):
+                    with mock.patch("backup_manager.os.lchown"):
                         with mock.patch.object(Path, "rename", fail_publish):
                             mgr.restore_from_backup(backup_file, "testapp")
 
@@ -1,8 +1,10 @@
 """Additional coverage tests for backup_manager.py."""
 
 import json
-import subprocess
+import os
+import shutil
 import tarfile
+import threading
 from pathlib import Path
 from unittest import mock
 
@@ -112,10 +114,11 @@ class TestBackupProductFailure:
         mgr = _make_manager(tmp_path)
         (mgr.install_dir / "p").mkdir(parents=True)
         with (
-            mock.patch.object(mgr.systemd, "get_status", return_value="active"),
+            mock.patch.object(mgr.systemd, "is_active", return_value=True),
             mock.patch.object(mgr.systemd, "stop"),
             mock.patch.object(mgr.systemd, "start") as start,
-            mock.patch("backup_manager.tarfile.open", side_effect=OSError("disk full")),
+            mock.patch("backup_manager.shutil.which", return_value=None),
+            mock.patch("backup_manager.write_tar_gz", side_effect=OSError("disk full")),
             mock.patch.object(mgr.printer, "error") as err,
         ):
             mgr.backup_product("p")
@@ -123,12 +126,68 @@ class TestBackupProductFailure:
         err.assert_called_once()
         assert list(mgr.backup_dir.glob("*.tar.gz")) == []
 
+    def test_backup_streams_through_shared_tar_writer(self, tmp_path: Path):
+        mgr = _make_manager(tmp_path)
+        (mgr.install_dir / "p").mkdir(parents=True)
+        with (
+            mock.patch.object(mgr.systemd, "is_active", return_value=False),
+            mock.patch("backup_manager.shutil.which", return_value=None),
+            mock.patch("backup_manager.write_tar_gz") as writer,
+        ):
+            mgr.backup_product("p")
+        assert writer.call_args.args[1:] == (mgr.install_dir / "p", "p")
+        assert writer.call_args.kwargs["skip_dirs"] == frozenset({".cache", ".npm"})
+        assert [backup.suffixes for backup in mgr.backup_dir.iterdir()] == [[".tar", ".gz"]]
+
+    def test_backup_prefers_zstd_when_installed(self, tmp_path: Path):
+        mgr = _make_manager(tmp_path)
+        (mgr.install_dir / "p").mkdir(parents=True)
+        with (
+            mock.patch.object(mgr.systemd, "is_active", return_value=False),
+            mock.patch("backup_manager.shutil.which", return_value="/usr/bin/zstd"),
+            mock.patch("backup_manager.write_tar_zst") as writer,
+            mock.patch("backup_manager.write_tar_gz") as gz_writer,
+        ):
+            mgr.backup_product("p")
+        gz_writer.assert_not_called()
+        assert writer.call_args.args[1:] == (mgr.install_dir / "p", "p")
+        (backup,) = mgr.list_backups()
+        assert backup.name.endswith(".tar.zst")
+
 
 # ---------------------------------------------------------------------------
 # restore_backup (interactive)
 # ---------------------------------------------------------------------------
 
 
+class TestDecompressedBackup:
+    def test_gzip_backup_is_inflated_once_into_work_dir(self, tmp_path: Path):
+        mgr = _make_manager(tmp_path)
+        backup = _make_backup(mgr)
+        work = tmp_path / "work"
+        work.mkdir()
+        plain = BackupManager._decompressed_backup(backup, work)
+        assert plain == work / "backup.tar"
+        assert plain.stat().st_mode & 0o777 == 0o600
+        with tarfile.open(plain, "r:") as tar:
+            assert tar.getnames()
+
+    def test_zstd_backup_is_decompressed_with_zstd(self, tmp_path: Path):
+        backup = tmp_path / "p_backup_20240101_120000.tar.zst"
+        backup.write_bytes(b"\x28\xb5\x2f\xfd" + b"frame")
+        with mock.patch("backup_manager.unzstd_to") as unzstd, mock.patch("backup_manager.gunzip_to") as gunzip:
+            plain = BackupManager._decompressed_backup(backup, tmp_path)
+        gunzip.assert_not_called()
+        assert plain == tmp_path / "backup.tar"
+        assert unzstd.call_args.args[0] == backup
+
+    def test_plain_tar_is_used_directly(self, tmp_path: Path):
+        plain = tmp_path / "p_backup_1.tar.gz"
+        with tarfile.open(plain, "w") as tar:
+            tar.add(tmp_path, arcname="p", recursive=False)
+        assert BackupManager._decompressed_backup(plain, tmp_path) == plain
+
+
 class TestRestoreBackupInteractive:
     def test_no_backup_dir(self, tmp_path: Path):
         mgr = _make_manager(tmp_path)
@@ -190,20 +249,61 @@ class TestRestoreFromBackup:
         (install_path / "package.json").write_text('{"v": 2}')
 
         with (
-            mock.patch.object(mgr.systemd, "get_status", return_value="inactive"),
+            mock.patch.object(mgr.systemd, "is_active", return_value=False),
             mock.patch.object(mgr, "_set_permissions"),
         ):
             mgr.restore_from_backup(backup, "plextickets")
 
         assert (install_path / "package.json").read_text() == '{"v": 1}'
+        mgr.wait_for_cleanup()
+        assert not list(mgr.install_dir.glob(".plextickets.rollback-*"))
+
+    def test_inflated_tar_is_removed_right_after_extraction(self, tmp_path: Path):
+        mgr = _make_manager(tmp_path)
+        backup = _make_backup(mgr)
+        leftovers = []
+
+        def check_permissions(staged):
+            leftovers.extend(staged.parent.parent.glob("backup.tar"))
+
+        with (
+            mock.patch.object(mgr.systemd, "is_active", return_value=False),
+            mock.patch.object(mgr, "_set_permissions", side_effect=check_permissions) as set_permissions,
+        ):
+            mgr.restore_from_backup(backup, "plextickets")
+        set_permissions.assert_called_once()
+        assert leftovers == []
+        assert backup.exists()
+
+    def test_rollback_copy_is_removed_after_restore_returns(self, tmp_path: Path):
+        mgr = _make_manager(tmp_path)
+        backup = _make_backup(mgr)
+        (mgr.install_dir / "plextickets" / "old.js").write_text("old")
+        release = threading.Event()
+        real_rmtree = shutil.rmtree
+
+        def slow_rmtree(path, *args, **kwargs):
+            if ".rollback-" in str(path):
+                release.wait(5)
+            real_rmtree(path, *args, **kwargs)
+
+        with (
+            mock.patch.object(mgr.systemd, "is_active", return_value=False),
+            mock.patch.object(mgr, "_set_permissions"),
+            mock.patch("backup_manager.shutil.rmtree", side_effect=slow_rmtree),
+        ):
+            mgr.restore_from_backup(backup, "plextickets")
+            assert list(mgr.install_dir.glob(".plextickets.rollback-*"))
+            release.set()
+            mgr.wait_for_cleanup()
         assert not list(mgr.install_dir.glob(".plextickets.rollback-*"))
 
     def test_stops_and_restarts_running_service(self, tmp_path: Path):
         mgr = _make_manager(tmp_path)
         backup = _make_backup(mgr)
-        statuses = iter(["active", "inactive"])
+        statuses = iter([True, False])
         with (
-            mock.patch.object(mgr.systemd, "get_status", side_effect=lambda _n: next(statuses)),
+            mock.patch.object(mgr.systemd, "is_active", side_effect=lambda _n: next(statuses)),
             mock.patch.object(mgr.systemd, "stop") as stop,
             mock.patch.object(mgr.systemd, "start") as start,
             mock.patch.object(mgr, "_set_permissions"),
@@ -219,7 +319,7 @@ class TestRestoreFromBackup:
         (install_path / "package.json").write_text('{"v": 2}')
 
         with (
-            mock.patch.object(mgr.systemd, "get_status", return_value="active"),
+            mock.patch.object(mgr.systemd, "is_active", return_value=True),
             mock.patch.object(mgr.systemd, "stop"),
             mock.patch.object(mgr.systemd, "start") as start,
             mock.patch.object(mgr, "_set_permissions"),
@@ -248,7 +348,7 @@ class TestRestoreFromBackup:
             return original_rename(self, target)
 
         with (
-            mock.patch.object(mgr.systemd, "get_status", return_value="inactive"),
+            mock.patch.object(mgr.systemd, "is_active", return_value=False),
             mock.patch.object(mgr, "_set_permissions"),
             mock.patch.object(Path, "rename", flaky_rename),
             mock.patch.object(mgr.printer, "error"),
@@ -271,7 +371,7 @@ class TestRestoreFromBackup:
 
         # Make the final success print raise to trigger the except with published install
         with (
-            mock.patch.object(mgr.systemd, "get_status", return_value="inactive"),
+            mock.patch.object(mgr.systemd, "is_active", return_value=False),
             mock.patch.object(mgr, "_set_permissions"),
             mock.patch.object(mgr.printer, "success", side_effect=RuntimeError("boom")),
             mock.patch.object(mgr.printer, "error"),
@@ -289,7 +389,7 @@ class TestRestoreFromBackup:
         backup.write_bytes(b"not a tarball")
 
         with (
-            mock.patch.object(mgr.systemd, "get_status", return_value="inactive"),
+            mock.patch.object(mgr.systemd, "is_active", return_value=False),
             mock.patch.object(mgr.printer, "error") as err,
         ):
             mgr.restore_from_backup(backup, "plextickets")
@@ -310,6 +410,30 @@ class TestProductFromBackupName:
         with pytest.raises(ValueError, match="Invalid backup filename"):
             BackupManager._product_from_backup_name(Path("random.tar.gz"))
 
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "random.tar.gz",
+            "plexstaff_backup_x.tar.gz",
+            "plexstaff_backup_20240101_120000.tar",
+            "..\\_backup_20240101_120000.tar.gz",
+        ],
+    )
+    def test_parse_rejects_stray_names(self, name):
+        assert BackupManager._parse_backup_name(name) is None
+
+    def test_parse_accepts_zstd_backups(self):
+        assert BackupManager._parse_backup_name("plexstaff_backup_20240101_120000.tar.zst") == (
+            "plexstaff",
+            "20240101_120000",
+        )
+
+    def test_listing_skips_stray_files(self, tmp_path: Path):
+        mgr = _make_manager(tmp_path)
+        backup = _make_backup(mgr)
+        (mgr.backup_dir / "notes.tar.gz").write_text("not a backup")
+        assert mgr.list_backups() == [backup]
+
 
 # ---------------------------------------------------------------------------
 # _set_permissions
@@ -318,15 +442,9 @@ class TestProductFromBackupName:
 
 class TestSetPermissions:
     def _run(self, install_path: Path) -> list:
-        calls = []
-
-        def fake_run(cmd, **kwargs):
-            calls.append(cmd)
-            return subprocess.CompletedProcess(cmd, 0)
-
-        with mock.patch("backup_manager.subprocess.run", side_effect=fake_run):
+        with mock.patch("backup_manager.os.lchown") as lchown:
             BackupManager._set_permissions(install_path)
-        return calls
+        return lchown.call_args_list
 
     def test_defaults_to_root(self, tmp_path: Path):
         install = tmp_path / "p"
@@ -335,8 +453,13 @@ class TestSetPermissions:
         (install / "cert.pem").write_text("pem")
         (install / "run.sh").write_text("#!/bin/sh")
         (install / "notes.txt").write_text("hi")
+        (install / "lib" / "nested").mkdir(parents=True)
+        (install / "lib" / "nested").chmod(0o777)
         calls = self._run(install)
-        assert "root:root" in calls[0]
+        assert {call.args[1:] for call in calls} == {(0, 0)}
+        assert len(calls) == 7
+        assert install.stat().st_mode & 0o777 == 0o750
+        assert (install / "lib" / "nested").stat().st_mode & 0o777 == 0o750
         assert (install / "config.yml").stat().st_mode & 0o777 == 0o600
         assert (install / "cert.pem").stat().st_mode & 0o777 == 0o600
         assert (install / "run.sh").stat().st_mode & 0o777 == 0o750
@@ -349,25 +472,26 @@ class TestSetPermissions:
         (install / ".plexinstaller-resources.json").write_text(
             json.dumps({"service_isolated": True, "service_user": user})
         )
-        calls = []
-
-        def fake_run(cmd, **kwargs):
-            calls.append(cmd)
-            return subprocess.CompletedProcess(cmd, 0)
+        owner = mock.Mock(pw_uid=1234, pw_gid=1234)
 
         with (
-            mock.patch("backup_manager.subprocess.run", side_effect=fake_run),
-            mock.patch("backup_manager.pwd.getpwnam", return_value=object()),
+            mock.patch("backup_manager.os.lchown") as lchown,
+            mock.patch("backup_manager.pwd.getpwnam", return_value=owner) as getpwnam,
         ):
             BackupManager._set_permissions(install)
-        assert f"{user}:{user}" in calls[0]
+        assert getpwnam.call_args_list[-1].args == (user,)
+        lchown.assert_any_call(str(install), 1234, 1234)
 
     def test_invalid_manifest_falls_back_to_root(self, tmp_path: Path):
         install = tmp_path / "tickets"
         install.mkdir()
         (install / ".plexinstaller-resources.json").write_text("{broken")
+        (install / "lib" / "nested").mkdir(parents=True)
+        (install / "lib" / "nested").chmod(0o777)
         calls = self._run(install)
-        assert "root:root" in calls[0]
+        assert {call.args[1:] for call in calls} == {(0, 0)}
+        assert install.stat().st_mode & 0o777 == 0o750
+        assert (install / "lib" / "nested").stat().st_mode & 0o777 == 0o750
 
     def test_legacy_long_isolated_owner_from_manifest(self, tmp_path: Path):
         install = tmp_path / ("tickets-" + "x" * 40)
@@ -377,18 +501,15 @@ class TestSetPermissions:
         (install / ".plexinstaller-resources.json").write_text(
             json.dumps({"service_isolated": True, "service_user": legacy_user})
         )
-        calls = []
-
-        def fake_run(cmd, **kwargs):
-            calls.append(cmd)
-            return subprocess.CompletedProcess(cmd, 0)
+        owner = mock.Mock(pw_uid=1234, pw_gid=1234)
 
         with (
-            mock.patch("backup_manager.subprocess.run", side_effect=fake_run),
-            mock.patch("backup_manager.pwd.getpwnam", return_value=object()),
+            mock.patch("backup_manager.os.lchown") as lchown,
+            mock.patch("backup_manager.pwd.getpwnam", return_value=owner) as getpwnam,
         ):
             BackupManager._set_permissions(install)
-        assert f"{legacy_user}:{legacy_user}" in calls[0]
+        assert getpwnam.call_args_list[-1].args == (legacy_user,)
+        lchown.assert_any_call(str(install), 1234, 1234)
 
     def test_skips_symlinked_files(self, tmp_path: Path):
         install = tmp_path / "p"
@@ -474,3 +595,71 @@ class TestListBackups:
         result = mgr.list_backups()
         assert result[0] == newer
         assert result[1] == old
+
+    def test_restore_reuses_one_scan(self, tmp_path: Path):
+        mgr = _make_manager(tmp_path)
+        backup = _make_backup(mgr)
+        with (
+            mock.patch("backup_manager.Path.stat", side_effect=AssertionError("re-stat")),
+            mock.patch("builtins.input", side_effect=["1", "y"]),
+            mock.patch.object(mgr, "restore_from_backup") as rfb,
+        ):
+            mgr.restore_backup()
+        rfb.assert_called_once_with(backup, "plextickets")
+
+    def test_unchanged_directory_is_not_rescanned(self, tmp_path: Path):
+        mgr = _make_manager(tmp_path)
+        backup = _make_backup(mgr)
+        assert mgr.list_backups() == [backup]
+        with mock.patch("backup_manager.os.scandir", side_effect=AssertionError("rescanned")):
+            assert mgr.list_backups() == [backup]
+
+    def test_backup_rewritten_in_place_reports_new_size(self, tmp_path: Path):
+        mgr = _make_manager(tmp_path)
+        backup = _make_backup(mgr)
+        assert mgr.list_backups() == [backup]
+        dir_mtime = mgr.backup_dir.stat().st_mtime_ns
+        backup.write_bytes(b"x" * 4096)
+        os.utime(mgr.backup_dir, ns=(0, dir_mtime))
+        ((_path, backup_stat),) = mgr._scan_backups()
+        assert backup_stat.st_size == 4096
+
+    def test_unreadable_directory_is_not_reported_missing(self, tmp_path: Path):
+        mgr = _make_manager(tmp_path)
+        mgr.backup_dir.mkdir(parents=True)
+        with (
+            mock.patch("backup_manager.os.stat", side_effect=PermissionError("denied")),
+            mock.patch.object(mgr.printer, "warning") as warn,
+            mock.patch.object(mgr.printer, "error") as err,
+        ):
+            assert mgr.list_backups() == []
+        warn.assert_not_called()
+        err.assert_called_once_with("Could not read backups directory: denied")
+
+    def test_directory_change_triggers_rescan(self, tmp_path: Path):
+        import os
+
+        mgr = _make_manager(tmp_path)
+        old = _make_backup(mgr, "plextickets")
+        assert mgr.list_backups() == [old]
+        newer = _make_backup(mgr, "plexstaff")
+        os.utime(old, (1, 1))
+        os.utime(mgr.backup_dir, ns=(0, mgr.backup_dir.stat().st_mtime_ns + 1))
+        assert mgr.list_backups() == [newer, old]
+
+    def test_delete_drops_cached_listing(self, tmp_path: Path):
+        mgr = _make_manager(tmp_path)
+        backup = _make_backup(mgr)
+        assert mgr.list_backups() == [backup]
+        with mock.patch("builtins.input", side_effect=["1", "y"]):
+            mgr.delete_backup()
+        assert mgr._backup_cache is None
+        assert mgr.list_backups() == []
+
+    def test_backup_drops_cached_listing(self, tmp_path: Path):
+        mgr = _make_manager(tmp_path)
+        _make_backup(mgr)
+        mgr.list_backups()
+        with mock.patch.object(mgr.systemd, "is_active", return_value=False):
+            mgr.backup_product("plextickets")
+        assert mgr._backup_cache is None
@@ -1,7 +1,10 @@
 """Tests for config.py — product metadata and system package lists."""
 
+import dataclasses
 from pathlib import Path
 
+import pytest
+
 from config import Config, ProductConfig
 
 
@@ -84,6 +87,18 @@ class TestConfig:
         for legacy, current in aliases.items():
             assert config.get_product(legacy).name == current
 
+    @pytest.mark.parametrize(
+        ("name", "expected"),
+        [
+            ("PlexTickets", "plextickets"),
+            (" plexstatus-eu ", "plexstatus"),
+            ("drakostore-2", "drakostore"),
+            ("unknown-product", "unknown"),
+        ],
+    )
+    def test_instance_product_base(self, name, expected):
+        assert Config.instance_product_base(name) == expected
+
     def test_equivalent_instance_names_preserve_suffix(self):
         assert Config.equivalent_instance_names("drakostore-prod") == ("drakostore-prod", "plexstore-prod")
         assert Config.equivalent_instance_names("plexstore-prod") == ("drakostore-prod", "plexstore-prod")
@@ -118,6 +133,12 @@ class TestProductConfig:
         assert p.supports_addons is True
         assert p.description == "desc"
 
+    def test_shared_product_metadata_is_immutable(self):
+        product = Config.PRODUCTS["plextickets"]
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            product.default_port = 1  # type: ignore[misc]
+        assert not hasattr(product, "__dict__")
+
 
 # ---------------------------------------------------------------------------
 # Per-product validation
@@ -186,6 +207,9 @@ class TestSystemPackages:
         config = Config()
         assert "bind-utils" in config.SYSTEM_PACKAGES["dnf"]
 
+    def test_package_lists_are_immutable(self):
+        assert all(isinstance(pkgs, tuple) for pkgs in Config.SYSTEM_PACKAGES.values())
+
 
 # ---------------------------------------------------------------------------
 # Config class-level attributes
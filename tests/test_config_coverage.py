@@ -13,6 +13,16 @@ class TestFindAppConfig:
     def test_returns_none_when_no_config_present(self, tmp_path: Path):
         assert Config.find_app_config(tmp_path) is None
 
+    def test_missing_directory_returns_none(self, tmp_path: Path):
+        assert Config.find_app_config(tmp_path / "missing") is None
+
+    def test_prefers_yml_then_yaml_then_json_files(self, tmp_path: Path):
+        (tmp_path / "config.yml").mkdir()
+        (tmp_path / "config.json").write_text("{}")
+        assert Config.find_app_config(tmp_path) == tmp_path / "config.json"
+        (tmp_path / "config.yaml").write_text("a: 1\n")
+        assert Config.find_app_config(tmp_path) == tmp_path / "config.yaml"
+
 
 class TestIsPortAvailable:
     def test_port_out_of_range(self):
@@ -397,7 +397,8 @@ class TestSystemHealthCheck:
                     with mock.patch("health_checker.subprocess.run"):
                         hc.system_health_check()
 
-        mock_status.assert_called_once_with("plex-plextickets")
+        checked = [call.args[0] for call in mock_status.call_args_list]
+        assert checked == ["plex-plextickets", "nginx", "mongod"]
 
 
 # ---------------------------------------------------------------------------
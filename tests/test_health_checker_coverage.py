@@ -6,6 +6,9 @@ from pathlib import Path
 from types import SimpleNamespace
 from unittest import mock
 
+import pytest
+
+import health_checker
 from health_checker import HealthChecker, SelfTestResult
 from utils import ColorPrinter, SystemdManager
 
@@ -35,6 +38,12 @@ def _context(tmp_path: Path, **overrides) -> SimpleNamespace:
     return SimpleNamespace(**base)
 
 
+def _meminfo_file(tmp_path: Path, content: str) -> str:
+    path = tmp_path / "meminfo"
+    path.write_text(content)
+    return str(path)
+
+
 def _completed(stdout="", stderr="", returncode=0):
     return subprocess.CompletedProcess([], returncode, stdout=stdout, stderr=stderr)
 
@@ -337,13 +346,30 @@ class TestCheckNginxSsl:
         assert by_name["nginx config test"].status == "warn"
 
 
+# ---------------------------------------------------------------------------
+# _read_meminfo
+# ---------------------------------------------------------------------------
+
+
+class TestReadMeminfo:
+    def test_reads_total_and_available_in_mb(self, tmp_path: Path):
+        content = "MemTotal: 8192 kB\nMemFree: 1024 kB\nMemAvailable: 2048 kB\nCommitted_AS: 1 kB\n"
+        with mock.patch("health_checker._MEMINFO_PATH", _meminfo_file(tmp_path, content)):
+            assert health_checker._read_meminfo() == (8.0, 2.0)
+
+    def test_missing_field_raises(self, tmp_path: Path):
+        with mock.patch("health_checker._MEMINFO_PATH", _meminfo_file(tmp_path, "MemTotal: 8192 kB\n")):
+            with pytest.raises(ValueError):
+                health_checker._read_meminfo()
+
+
 # ---------------------------------------------------------------------------
 # system_health_check
 # ---------------------------------------------------------------------------
 
 
 class TestSystemHealthCheck:
-    def _run(self, tmp_path: Path, *, statuses=None, run_map=None, meminfo=None, load=(0.1, 0.1, 0.1)):
+    def _run(self, tmp_path: Path, *, statuses=None, run_map=None, meminfo=None, load=(0.1, 0.1, 0.1), certbot=False):
         checker = _checker(tmp_path)
         statuses = statuses or {}
         run_map = run_map or {}
@@ -363,7 +389,8 @@ class TestSystemHealthCheck:
             mock.patch("health_checker.clear_terminal"),
             mock.patch.object(checker.systemd, "get_status", side_effect=fake_systemd_status),
             mock.patch("health_checker.subprocess.run", side_effect=fake_run),
-            mock.patch("builtins.open", mock.mock_open(read_data=meminfo)),
+            mock.patch("health_checker.shutil.which", return_value="/usr/bin/certbot" if certbot else None),
+            mock.patch("health_checker._MEMINFO_PATH", _meminfo_file(tmp_path, meminfo)),
             mock.patch("health_checker.os.getloadavg", return_value=load),
             mock.patch("health_checker.os.cpu_count", return_value=4),
         ):
@@ -375,12 +402,38 @@ class TestSystemHealthCheck:
         (install / "plextickets").mkdir(parents=True)
         (install / "backups").mkdir()
         run_map = {
-            "systemctl is-active nginx": _completed(stdout="active\n"),
-            "systemctl is-active mongod": _completed(stdout="active\n"),
-            "which certbot": _completed(returncode=0),
             "certbot certificates": _completed(stdout="Certificate Name: example.com\n"),
         }
-        self._run(tmp_path, statuses={"plex-plextickets": "active"}, run_map=run_map)
+        statuses = {"plex-plextickets": "active", "nginx": "active", "mongod": "active"}
+        self._run(tmp_path, statuses=statuses, run_map=run_map, certbot=True)
+
+    def test_products_nginx_and_mongod_share_one_systemctl_call(self, tmp_path: Path):
+        (tmp_path / "plex" / "plextickets").mkdir(parents=True)
+        checker = _checker(tmp_path)
+        run = mock.Mock(return_value=_completed(stdout="active\n\nactive\n\ninactive\n"))
+        with (
+            mock.patch("health_checker.clear_terminal"),
+            mock.patch("health_checker.subprocess.run", run),
+            mock.patch("health_checker.shutil.which", return_value=None),
+            mock.patch("health_checker._MEMINFO_PATH", str(tmp_path / "missing-meminfo")),
+            mock.patch("health_checker.os.getloadavg", side_effect=OSError),
+            mock.patch.object(checker.printer, "success") as ok,
+            mock.patch.object(checker.printer, "warning") as warn,
+        ):
+            checker.system_health_check()
+        run.assert_called_once()
+        assert run.call_args.args[0] == [
+            "systemctl",
+            "show",
+            "--property=ActiveState",
+            "--value",
+            "plex-plextickets",
+            "nginx",
+            "mongod",
+        ]
+        assert any("All services are running" in str(c.args[0]) for c in ok.call_args_list)
+        assert any("Nginx is running" in str(c.args[0]) for c in ok.call_args_list)
+        assert any("MongoDB is not running" in str(c.args[0]) for c in warn.call_args_list)
 
     def test_stopped_and_missing_services(self, tmp_path: Path, caplog):
         install = tmp_path / "plex"
@@ -401,10 +454,9 @@ class TestSystemHealthCheck:
     def test_certbot_no_certificates(self, tmp_path: Path):
         (tmp_path / "plex").mkdir()
         run_map = {
-            "which certbot": _completed(returncode=0),
             "certbot certificates": _completed(stdout="No certificates found.\n"),
         }
-        self._run(tmp_path, run_map=run_map)
+        self._run(tmp_path, run_map=run_map, certbot=True)
 
     def test_high_memory_and_load(self, tmp_path: Path):
         (tmp_path / "plex").mkdir()
@@ -413,7 +465,7 @@ class TestSystemHealthCheck:
         with (
             mock.patch("health_checker.clear_terminal"),
             mock.patch("health_checker.subprocess.run", return_value=_completed(returncode=1)),
-            mock.patch("builtins.open", mock.mock_open(read_data=meminfo)),
+            mock.patch("health_checker._MEMINFO_PATH", _meminfo_file(tmp_path, meminfo)),
             mock.patch("health_checker.os.getloadavg", return_value=(9.0, 9.0, 9.0)),
             mock.patch("health_checker.os.cpu_count", return_value=4),
             mock.patch.object(checker.printer, "error") as err,
@@ -430,7 +482,7 @@ class TestSystemHealthCheck:
         with (
             mock.patch("health_checker.clear_terminal"),
             mock.patch("health_checker.subprocess.run", return_value=_completed(returncode=1)),
-            mock.patch("builtins.open", mock.mock_open(read_data=meminfo)),
+            mock.patch("health_checker._MEMINFO_PATH", _meminfo_file(tmp_path, meminfo)),
             mock.patch("health_checker.os.getloadavg", return_value=(5.0, 5.0, 5.0)),
             mock.patch("health_checker.os.cpu_count", return_value=4),
             mock.patch.object(checker.printer, "warning") as warn,
@@ -445,14 +497,13 @@ class TestSystemHealthCheck:
         checker = _checker(tmp_path)
 
         def fake_run(cmd, **kwargs):
-            if cmd[0] == "which":
-                return _completed(returncode=1)
             raise FileNotFoundError(cmd[0])
 
         with (
             mock.patch("health_checker.clear_terminal"),
             mock.patch("health_checker.subprocess.run", side_effect=fake_run),
-            mock.patch("builtins.open", side_effect=OSError("no /proc")),
+            mock.patch("health_checker.shutil.which", return_value=None),
+            mock.patch("health_checker._MEMINFO_PATH", str(tmp_path / "missing-meminfo")),
             mock.patch("health_checker.os.getloadavg", side_effect=OSError("unsupported")),
             mock.patch.object(checker.printer, "warning") as warn,
         ):
@@ -471,13 +522,27 @@ class TestSystemHealthCheck:
             mock.patch("health_checker.clear_terminal"),
             mock.patch("health_checker.os.statvfs", return_value=stat),
             mock.patch("health_checker.subprocess.run", return_value=_completed(returncode=1)),
-            mock.patch("builtins.open", side_effect=OSError),
+            mock.patch("health_checker._MEMINFO_PATH", str(tmp_path / "missing-meminfo")),
             mock.patch("health_checker.os.getloadavg", side_effect=OSError),
             mock.patch.object(checker.printer, "error") as err,
         ):
             checker.system_health_check()
         assert any("90" in str(c.args[0]) for c in err.call_args_list)
 
+    def test_zero_sized_filesystem_reports_healthy(self, tmp_path: Path):
+        checker = _checker(tmp_path)
+        stat = mock.MagicMock(f_bavail=0, f_frsize=4096, f_blocks=0)
+        with (
+            mock.patch("health_checker.clear_terminal"),
+            mock.patch("health_checker.os.statvfs", return_value=stat),
+            mock.patch("health_checker.subprocess.run", return_value=_completed(returncode=1)),
+            mock.patch("health_checker._MEMINFO_PATH", str(tmp_path / "missing-meminfo")),
+            mock.patch("health_checker.os.getloadavg", side_effect=OSError),
+            mock.patch.object(checker.printer, "success") as ok,
+        ):
+            checker.system_health_check()
+        assert any("Disk space healthy" in str(c.args[0]) for c in ok.call_args_list)
+
     def test_disk_above_80(self, tmp_path: Path):
         checker = _checker(tmp_path)
         stat = mock.MagicMock()
@@ -488,7 +553,7 @@ class TestSystemHealthCheck:
             mock.patch("health_checker.clear_terminal"),
             mock.patch("health_checker.os.statvfs", return_value=stat),
             mock.patch("health_checker.subprocess.run", return_value=_completed(returncode=1)),
-            mock.patch("builtins.open", side_effect=OSError),
+            mock.patch("health_checker._MEMINFO_PATH", str(tmp_path / "missing-meminfo")),
             mock.patch("health_checker.os.getloadavg", side_effect=OSError),
             mock.patch.object(checker.printer, "warning") as warn,
         ):
@@ -500,14 +565,13 @@ class TestSystemHealthCheck:
         checker = _checker(tmp_path)
 
         def fake_run(cmd, **kwargs):
-            if cmd[0] == "which":
-                return _completed(returncode=1)
             raise FileNotFoundError(cmd[0])
 
         with (
             mock.patch("health_checker.clear_terminal"),
             mock.patch("health_checker.subprocess.run", side_effect=fake_run),
-            mock.patch("builtins.open", side_effect=OSError),
+            mock.patch("health_checker.shutil.which", return_value=None),
+            mock.patch("health_checker._MEMINFO_PATH", str(tmp_path / "missing-meminfo")),
             mock.patch("health_checker.os.getloadavg", side_effect=OSError),
             mock.patch.object(checker.printer, "warning") as warn,
             mock.patch.object(checker.printer, "step") as step,
@@ -523,8 +587,6 @@ class TestSystemHealthCheck:
         checker = _checker(tmp_path)
 
         def fake_run(cmd, **kwargs):
-            if cmd[0] == "which":
-                return _completed(returncode=0)
             if cmd[0] == "certbot":
                 raise OSError("certbot broke")
             return _completed(stdout="inactive\n")
@@ -532,7 +594,8 @@ class TestSystemHealthCheck:
         with (
             mock.patch("health_checker.clear_terminal"),
             mock.patch("health_checker.subprocess.run", side_effect=fake_run),
-            mock.patch("builtins.open", side_effect=OSError),
+            mock.patch("health_checker.shutil.which", return_value="/usr/bin/certbot"),
+            mock.patch("health_checker._MEMINFO_PATH", str(tmp_path / "missing-meminfo")),
             mock.patch("health_checker.os.getloadavg", side_effect=OSError),
             mock.patch.object(checker.printer, "warning") as warn,
         ):
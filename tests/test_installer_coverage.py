@@ -1,6 +1,7 @@
 """Broad coverage tests for installer.py core flows (no system interaction)."""
 
 import json
+import os
 import subprocess
 import sys
 from pathlib import Path
@@ -19,10 +20,14 @@ def _installer(tmp_path: Path) -> PlexInstaller:
     inst.version = "stable"
     inst.config = Config()
     inst.config.install_dir = tmp_path
+    inst.config.npm_cache_dir = tmp_path / "npm-cache"
     inst.printer = mock.MagicMock()
     inst.assume_yes = False
     inst.non_interactive = False
+    inst.stdout_is_tty = True
     inst.isolate_services = None
+    inst.answers = {}
+    inst._manifest_future = None
     inst.telemetry_enabled = True
     inst.check_updates = False
     inst.systemd = mock.MagicMock()
@@ -78,6 +83,17 @@ def test_init_builds_managers(monkeypatch, tmp_path):
     assert inst.telemetry_enabled is False
 
 
+def test_init_starts_manifest_fetch_when_checking_updates(monkeypatch, tmp_path):
+    _patched_init_env(monkeypatch, tmp_path)
+    monkeypatch.setattr(PlexInstaller, "_acquire_lock", lambda self: True)
+    start = mock.MagicMock()
+    monkeypatch.setattr(PlexInstaller, "_start_manifest_fetch", start)
+    PlexInstaller(assume_yes=True, non_interactive=True, check_updates=False)
+    start.assert_not_called()
+    PlexInstaller(assume_yes=True, non_interactive=True)
+    start.assert_called_once()
+
+
 def test_init_requires_root(monkeypatch, tmp_path):
     _patched_init_env(monkeypatch, tmp_path)
     monkeypatch.setattr("installer.os.geteuid", lambda: 1000)
@@ -138,12 +154,30 @@ def test_run_with_missing_deps_declined(monkeypatch, tmp_path):
     inst.system.install_dependencies.assert_not_called()
 
 
+def test_run_waits_for_backup_cleanup_even_when_menu_raises(monkeypatch, tmp_path):
+    inst = _installer(tmp_path)
+    inst._missing_dependencies = mock.MagicMock(return_value=[])
+    inst._show_main_menu = mock.MagicMock(side_effect=KeyboardInterrupt)
+    monkeypatch.setattr("installer.os.system", lambda *_a: 0)
+    with pytest.raises(KeyboardInterrupt):
+        inst.run()
+    inst.backup_mgr.wait_for_cleanup.assert_called_once_with()
+
+
 def test_display_banner_prints(tmp_path, capsys):
     inst = _installer(tmp_path)
     inst._display_banner()
     assert "UNOFFICIAL" in capsys.readouterr().out
 
 
+def test_display_banner_is_a_single_write(tmp_path):
+    inst = _installer(tmp_path)
+    with mock.patch("installer.sys.stdout") as stdout:
+        inst._display_banner()
+    stdout.write.assert_called_once()
+    assert "STABLE Version" in stdout.write.call_args.args[0]
+
+
 def test_confirm_assume_yes(tmp_path):
     inst = _installer(tmp_path)
     inst.assume_yes = True
@@ -166,6 +200,73 @@ def test_confirm_interactive_answers(monkeypatch, tmp_path):
     assert inst._confirm("q?", default=True) is True
 
 
+def test_ask_prefers_answers_then_input(monkeypatch, tmp_path):
+    inst = _installer(tmp_path)
+    inst.answers = {"domain": " app.example.com ", "proceed_without_dns": True, "port": 3100}
+    _answers(monkeypatch, ["typed", ""])
+    assert inst._ask("domain", "d: ") == "app.example.com"
+    assert inst._ask("proceed_without_dns", "p: ") == "y"
+    assert inst._ask("port", "p: ") == "3100"
+    assert inst._ask("email", "e: ") == "typed"
+    assert inst._ask("email", "e: ", "fallback") == "fallback"
+    inst.non_interactive = True
+    assert inst._ask("email", "e: ", "fallback") == "fallback"
+
+
+def test_confirm_uses_keyed_answer(tmp_path):
+    inst = _installer(tmp_path)
+    inst.assume_yes = True
+    inst.answers = {"autostart": False}
+    assert inst._confirm("q?", default=True, key="autostart") is False
+    assert inst._confirm("q?", key="edit_config") is True
+
+
+def test_setup_web_invalid_answered_domain_aborts(tmp_path):
+    inst = _installer(tmp_path)
+    inst.answers = {"port": 3100, "domain": "not a domain"}
+    inst.config.is_port_available = mock.MagicMock(return_value=True)
+    with pytest.raises(UserAbortError):
+        inst._setup_web("plexstaff", 3001, tmp_path, InstallationContext("plexstaff", "plexstaff", tmp_path, 3001))
+
+
+def test_find_archive_uses_answered_path(tmp_path):
+    inst = _installer(tmp_path)
+    archive = tmp_path / "bundle.zip"
+    archive.write_bytes(b"zip")
+    inst.answers = {"archive": str(archive)}
+    assert inst._find_archive("plexstaff") == archive
+    inst.answers = {"dashboard_archive": str(tmp_path / "missing.zip")}
+    assert inst._find_archive("dashboard") is None
+
+
+def test_run_installs_answered_product(tmp_path):
+    inst = _installer(tmp_path)
+    inst.answers = {"product": "drakostore"}
+    inst._display_banner = mock.MagicMock()
+    inst._missing_dependencies = mock.MagicMock(return_value=[])
+    inst._install_product = mock.MagicMock(return_value=0)
+    inst._show_main_menu = mock.MagicMock()
+    with mock.patch("installer.clear_terminal"):
+        assert inst.run() == 0
+    inst._install_product.assert_called_once_with("drakostore", 3003)
+    inst._show_main_menu.assert_not_called()
+    inst.answers = {"product": "nope"}
+    assert inst._install_from_answers() == 1
+
+
+def test_load_answers_yaml_and_json(tmp_path):
+    answers_yaml = tmp_path / "answers.yaml"
+    answers_yaml.write_text("product: plexstaff\nport: 3001\n")
+    assert installer_module._load_answers(answers_yaml) == {"product": "plexstaff", "port": 3001}
+    answers_json = tmp_path / "answers.json"
+    answers_json.write_text('{"domain": "a.example.com"}')
+    assert installer_module._load_answers(answers_json) == {"domain": "a.example.com"}
+    listing = tmp_path / "list.yaml"
+    listing.write_text("- a\n- b\n")
+    with pytest.raises(ValueError):
+        installer_module._load_answers(listing)
+
+
 def test_missing_dependencies(monkeypatch):
     monkeypatch.setattr("installer.shutil.which", lambda cmd: None if cmd == "npm" else "/usr/bin/x")
     assert PlexInstaller._missing_dependencies() == ["npm"]
@@ -273,6 +374,45 @@ def test_check_updates_up_to_date(monkeypatch, tmp_path):
     inst.printer.success.assert_called()
 
 
+def test_check_updates_uses_prefetched_manifest(monkeypatch, tmp_path):
+    inst = _installer(tmp_path)
+    payload = json.dumps({"version": "0.0.1"}).encode()
+    urlopen = _urlopen_returning(payload)
+    monkeypatch.setattr("installer.urllib.request.urlopen", urlopen)
+    inst._verify_gpg_signature = mock.MagicMock(return_value=True)
+    inst._download_missing_files = mock.MagicMock()
+    inst._ensure_cli_entrypoints = mock.MagicMock()
+    inst._start_manifest_fetch()
+    inst._check_for_updates()
+    urlopen.assert_called_once()
+    inst._verify_gpg_signature.assert_called_once_with(payload)
+    assert inst._manifest_future is None
+
+
+def test_manifest_prefetch_runs_on_daemon_thread(monkeypatch, tmp_path):
+    import threading
+
+    inst = _installer(tmp_path)
+    release = threading.Event()
+    monkeypatch.setattr("installer._fetch_version_manifest", lambda: release.wait(5) and b"{}")
+    inst._start_manifest_fetch()
+    try:
+        workers = [thread for thread in threading.enumerate() if thread.name == "version-check"]
+        assert workers and all(thread.daemon for thread in workers)
+        assert not inst._manifest_future.done()
+    finally:
+        release.set()
+    assert inst._manifest_future.result(timeout=5) == b"{}"
+
+
+def test_check_updates_prefetch_failure_is_reported(monkeypatch, tmp_path):
+    inst = _installer(tmp_path)
+    monkeypatch.setattr("installer.urllib.request.urlopen", mock.MagicMock(side_effect=OSError("offline")))
+    inst._start_manifest_fetch()
+    inst._check_for_updates()
+    assert "offline" in inst.printer.warning.call_args.args[0]
+
+
 def test_check_updates_network_failure(monkeypatch, tmp_path):
     inst = _installer(tmp_path)
     monkeypatch.setattr("installer.urllib.request.urlopen", mock.MagicMock(side_effect=OSError("offline")))
@@ -356,6 +496,34 @@ def test_find_archive_manual_path_found(monkeypatch, tmp_path):
     assert inst._find_archive("zzq1prod") == archive
 
 
+def test_find_archive_searches_sudo_users_home(monkeypatch, tmp_path):
+    inst = _installer(tmp_path)
+    user_home = tmp_path / "alice"
+    (user_home / "Downloads").mkdir(parents=True)
+    archive = user_home / "Downloads" / "zzq9prod.zip"
+    archive.write_bytes(b"x")
+    root_home = tmp_path / "root"
+    root_home.mkdir()
+    monkeypatch.setattr(installer_module, "_SYSTEM_TEMP_ROOTS", frozenset())
+    monkeypatch.setenv("SUDO_USER", "alice")
+    monkeypatch.setattr("installer.pwd.getpwnam", lambda name: mock.Mock(pw_dir=str(user_home)))
+    monkeypatch.setattr("installer.Path.home", lambda: root_home)
+    monkeypatch.setattr("installer.Path.cwd", lambda: root_home)
+    _answers(monkeypatch, ["1"])
+    assert inst._find_archive("zzq9prod") == archive
+
+
+def test_archive_search_home_falls_back_to_own_home(monkeypatch, tmp_path):
+    monkeypatch.setattr("installer.Path.home", lambda: tmp_path)
+    monkeypatch.delenv("SUDO_USER", raising=False)
+    assert installer_module._archive_search_home() == tmp_path
+    monkeypatch.setenv("SUDO_USER", "root")
+    assert installer_module._archive_search_home() == tmp_path
+    monkeypatch.setenv("SUDO_USER", "ghost")
+    monkeypatch.setattr("installer.pwd.getpwnam", mock.Mock(side_effect=KeyError("ghost")))
+    assert installer_module._archive_search_home() == tmp_path
+
+
 def test_find_archive_manual_path_missing(monkeypatch, tmp_path):
     inst = _installer(tmp_path)
     empty = tmp_path / "empty"
@@ -402,30 +570,91 @@ def test_find_archive_does_not_recursively_scan_system_temp(monkeypatch, tmp_pat
     inst = _installer(tmp_path)
     (tmp_path / "nested").mkdir()
     (tmp_path / "nested" / "temp-product.zip").write_bytes(b"x")
-    rglob = mock.MagicMock(side_effect=AssertionError("system temp directory was scanned"))
+    walk = mock.MagicMock(side_effect=AssertionError("system temp directory was scanned"))
     monkeypatch.setattr(installer_module, "_SYSTEM_TEMP_ROOTS", frozenset({tmp_path.resolve()}))
-    monkeypatch.setattr(Path, "rglob", rglob)
+    monkeypatch.setattr(installer_module, "_iter_archives", walk)
     monkeypatch.setattr("installer.Path.home", lambda: tmp_path)
     monkeypatch.setattr("installer.Path.cwd", lambda: tmp_path / "nested")
     _answers(monkeypatch, [str(tmp_path / "missing.zip")])
 
     assert inst._find_archive("temp-product") is None
-    rglob.assert_not_called()
+    walk.assert_not_called()
+
+
+def test_iter_archives_prunes_noise_depth_and_dir_symlinks(tmp_path):
+    root = tmp_path / "root"
+    deep = root / "a" / "b" / "c" / "d"
+    deep.mkdir(parents=True)
+    (root / "a" / "prod-1.zip").write_bytes(b"12345")
+    (root / "a" / "Prod-Upper.ZIP").write_bytes(b"123")
+    (deep / "prod-deep.zip").write_bytes(b"x")
+    (deep / "e").mkdir()
+    (deep / "e" / "prod-too-deep.zip").write_bytes(b"x")
+    for noise in ("node_modules", ".git", ".cache", "snap"):
+        (root / noise).mkdir()
+        (root / noise / "prod-noise.zip").write_bytes(b"x")
+    (root / "prod-readme.txt").write_text("x")
+    (root / "other.zip").write_bytes(b"x")
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "prod-linked-dir.zip").write_bytes(b"x")
+    (root / "linked").symlink_to(outside, target_is_directory=True)
+    (root / "prod-link.tar.gz").symlink_to(outside / "prod-linked-dir.zip")
+
+    found = dict(installer_module._iter_archives(root, ("prod",)))
+
+    assert found == {
+        root / "a" / "prod-1.zip": 5,
+        root / "a" / "Prod-Upper.ZIP": 3,
+        deep / "prod-deep.zip": 1,
+        outside / "prod-linked-dir.zip": 1,
+    }
+
+
+def test_iter_archives_stays_on_one_filesystem(tmp_path, monkeypatch):
+    (tmp_path / "prod-top.zip").write_bytes(b"x")
+    (tmp_path / "mounted").mkdir()
+    (tmp_path / "mounted" / "prod.zip").write_bytes(b"x")
+    monkeypatch.setattr(installer_module.Path, "stat", lambda self, **kwargs: mock.Mock(st_dev=-1))
+    assert installer_module._iter_archives(tmp_path, ("prod",)) == [(tmp_path / "prod-top.zip", 1)]
+
+
+def test_iter_archives_stops_after_entry_budget(tmp_path, monkeypatch):
+    for index in range(5):
+        (tmp_path / f"dir{index}").mkdir()
+        (tmp_path / f"dir{index}" / "prod.zip").write_bytes(b"x")
+    monkeypatch.setattr(installer_module, "_ARCHIVE_SEARCH_MAX_ENTRIES", 5)
+    assert len(installer_module._iter_archives(tmp_path, ("prod",))) == 0
+
+
+def test_iter_archives_skips_unreadable_root_and_entries(tmp_path, monkeypatch):
+    assert installer_module._iter_archives(tmp_path / "missing", ("prod",)) == []
+    (tmp_path / "prod.zip").symlink_to(tmp_path / "gone.zip")
+    (tmp_path / "sub").mkdir()
+    real_scandir = installer_module.os.scandir
+
+    def scandir(path):
+        if str(path).endswith("sub"):
+            raise PermissionError(path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(installer_module.os, "scandir", scandir)
+    assert installer_module._iter_archives(tmp_path, ("prod",)) == []
 
 
 def test_find_archive_accepts_manual_system_temp_path(monkeypatch, tmp_path):
     inst = _installer(tmp_path)
     archive = tmp_path / "manual-product.zip"
     archive.write_bytes(b"x")
-    rglob = mock.MagicMock(side_effect=AssertionError("system temp directory was scanned"))
+    walk = mock.MagicMock(side_effect=AssertionError("system temp directory was scanned"))
     monkeypatch.setattr(installer_module, "_SYSTEM_TEMP_ROOTS", frozenset({tmp_path.resolve()}))
-    monkeypatch.setattr(Path, "rglob", rglob)
+    monkeypatch.setattr(installer_module, "_iter_archives", walk)
     monkeypatch.setattr("installer.Path.home", lambda: tmp_path)
     monkeypatch.setattr("installer.Path.cwd", lambda: tmp_path)
     _answers(monkeypatch, [str(archive)])
 
     assert inst._find_archive("manual-product") == archive
-    rglob.assert_not_called()
+    walk.assert_not_called()
 
 
 def test_extract_product_refuses_existing(tmp_path):
@@ -454,12 +683,92 @@ def test_npm_install_no_package_json(tmp_path):
     assert inst._install_npm_dependencies(tmp_path) is False
 
 
+def test_npm_install_discards_stdout_and_keeps_stderr(tmp_path):
+    inst = _installer(tmp_path)
+    (tmp_path / "package.json").write_text("{}")
+    with mock.patch("installer.subprocess.run") as run:
+        assert inst._install_npm_dependencies(tmp_path, run_as_user="plex-svc") is True
+    assert run.call_args.args[0] == [
+        "runuser",
+        "--user",
+        "plex-svc",
+        "--",
+        "npm",
+        "install",
+        "--prefer-offline",
+        "--no-audit",
+        "--no-fund",
+        "--no-progress",
+        "--no-update-notifier",
+        "--loglevel=error",
+    ]
+    assert run.call_args.kwargs["stdin"] is subprocess.DEVNULL
+    assert run.call_args.kwargs["stdout"] is subprocess.DEVNULL
+    assert run.call_args.kwargs["stderr"] not in (subprocess.PIPE, None)
+
+
+def test_npm_install_uses_ci_with_lockfile(tmp_path):
+    inst = _installer(tmp_path)
+    (tmp_path / "package.json").write_text("{}")
+    (tmp_path / "package-lock.json").write_text("{}")
+    with mock.patch("installer.subprocess.run") as run:
+        assert inst._install_npm_dependencies(tmp_path) is True
+    assert run.call_args.args[0][:2] == ["npm", "ci"]
+    assert "--prefer-offline" in run.call_args.args[0]
+    assert run.call_args.args[0][-1] == f"--cache={tmp_path / 'npm-cache'}"
+    assert (tmp_path / "npm-cache").stat().st_mode & 0o777 == 0o700
+
+
+def test_npm_ci_lockfile_mismatch_falls_back_to_install(tmp_path):
+    inst = _installer(tmp_path)
+    (tmp_path / "package.json").write_text("{}")
+    (tmp_path / "package-lock.json").write_text("{}")
+
+    def run(command, **kwargs):
+        if command[1] == "ci":
+            kwargs["stderr"].write(
+                b"npm error `npm ci` can only install packages when your package.json and "
+                b"package-lock.json or npm-shrinkwrap.json are in sync.\n"
+            )
+            raise subprocess.CalledProcessError(1, command)
+
+    with mock.patch("installer.subprocess.run", side_effect=run) as runner:
+        assert inst._install_npm_dependencies(tmp_path) is True
+    commands = [call.args[0] for call in runner.call_args_list]
+    assert [command[1] for command in commands] == ["ci", "install"]
+    assert commands[0][2:] == commands[1][2:]
+    inst.printer.error.assert_not_called()
+
+
+def test_npm_ci_other_failure_is_not_retried(tmp_path):
+    inst = _installer(tmp_path)
+    (tmp_path / "package.json").write_text("{}")
+    (tmp_path / "package-lock.json").write_text("{}")
+
+    def fail(command, **kwargs):
+        kwargs["stderr"].write(b"npm error network timeout\n")
+        raise subprocess.CalledProcessError(1, command)
+
+    with mock.patch("installer.subprocess.run", side_effect=fail) as runner:
+        assert inst._install_npm_dependencies(tmp_path) is False
+    runner.assert_called_once()
+    assert inst.printer.error.call_args.args[0] == "NPM install failed: npm error network timeout"
+
+
 def test_npm_install_failure(tmp_path):
     inst = _installer(tmp_path)
     (tmp_path / "package.json").write_text("{}")
-    err = subprocess.CalledProcessError(1, "npm", stderr=b"broken")
-    with mock.patch("installer.subprocess.run", side_effect=err):
+
+    def fail(command, **kwargs):
+        kwargs["stderr"].write(b"npm warn noise\n" * 2000 + b"npm error broken\n")
+        raise subprocess.CalledProcessError(1, command)
+
+    with mock.patch("installer.subprocess.run", side_effect=fail):
         assert inst._install_npm_dependencies(tmp_path) is False
+    message = inst.printer.error.call_args.args[0]
+    assert message.endswith("npm error broken")
+    assert message.startswith("NPM install failed: npm warn noise\n")
+    assert len(message) < installer_module._NPM_STDERR_TAIL_BYTES + 100
 
 
 def test_npm_install_failure_without_stderr_is_reported(tmp_path):
@@ -474,7 +783,34 @@ def test_npm_install_failure_without_stderr_is_reported(tmp_path):
 def test_create_502_page(tmp_path):
     inst = _installer(tmp_path)
     inst._create_502_page(tmp_path, "plexstaff")
-    assert "502" in (tmp_path / "502.html").read_text()
+    page = tmp_path / "502.html"
+    assert "502" in page.read_text(encoding="utf-8")
+    assert "🔄 Retry" in page.read_text(encoding="utf-8")
+    assert page.stat().st_mode & 0o777 == 0o644
+
+
+def test_create_502_page_overrides_umask_and_existing_mode(tmp_path):
+    inst = _installer(tmp_path)
+    page = tmp_path / "502.html"
+    page.write_text("old page that is much longer than nothing" * 200)
+    page.chmod(0o600)
+    previous = os.umask(0o077)
+    try:
+        inst._create_502_page(tmp_path, "plexstaff")
+    finally:
+        os.umask(previous)
+    assert page.stat().st_mode & 0o777 == 0o644
+    assert page.read_bytes() == installer_module._ERROR_502_HTML
+
+
+def test_create_502_page_refuses_symlink(tmp_path):
+    inst = _installer(tmp_path)
+    target = tmp_path / "target.txt"
+    target.write_text("keep")
+    (tmp_path / "502.html").symlink_to(target)
+    with pytest.raises(OSError):
+        inst._create_502_page(tmp_path, "plexstaff")
+    assert target.read_text() == "keep"
 
 
 # ---------- port selection / web setup ----------
@@ -487,6 +823,14 @@ def test_select_port_interactive_retry(monkeypatch, tmp_path):
     assert inst._select_available_port(3000) == 3006
 
 
+def test_select_port_rejects_non_decimal_digits(monkeypatch, tmp_path):
+    inst = _installer(tmp_path)
+    inst.config.is_port_available = mock.MagicMock(return_value=True)
+    _answers(monkeypatch, ["80\u00b2", "3005"])
+    assert inst._select_available_port(3000) == 3005
+    inst.config.is_port_available.assert_called_once_with(3005)
+
+
 def test_select_port_non_interactive_invalid_default(tmp_path):
     inst = _installer(tmp_path)
     inst.non_interactive = True
@@ -513,6 +857,39 @@ def test_setup_web_happy_path(monkeypatch, tmp_path):
     assert (domain, port, email) == ("app.example.com", 3001, "a@b.com")
     assert ctx.nginx_configured and ctx.ssl_configured
     inst.firewall.close_port.assert_called_once_with(3001)
+    inst.dns_checker.lookup_async.assert_called_once_with("app.example.com")
+    inst.dns_checker.check.assert_called_once_with("app.example.com", inst.dns_checker.lookup_async.return_value)
+
+
+def test_setup_web_closes_firewall_after_ssl(monkeypatch, tmp_path):
+    inst = _installer(tmp_path)
+    inst.config.nginx_available = tmp_path / "avail"
+    inst.config.nginx_enabled = tmp_path / "enabled"
+    inst.config.is_port_available = mock.MagicMock(return_value=True)
+    inst.config.persist_app_port = mock.MagicMock()
+    inst.dns_checker.check.return_value = True
+    order = mock.MagicMock()
+    order.attach_mock(inst.nginx.setup, "nginx")
+    order.attach_mock(inst.ssl.setup, "ssl")
+    order.attach_mock(inst.firewall.close_port, "close_port")
+    _answers(monkeypatch, ["3001", "app.example.com", "a@b.com"])
+    inst._setup_web("plexstaff", 3001, tmp_path, _web_context(tmp_path))
+    assert [name for name, _args, _kwargs in order.mock_calls] == ["nginx", "ssl", "close_port"]
+
+
+def test_setup_web_ssl_failure_keeps_app_port(monkeypatch, tmp_path):
+    inst = _installer(tmp_path)
+    inst.config.nginx_available = tmp_path / "avail"
+    inst.config.nginx_enabled = tmp_path / "enabled"
+    inst.config.is_port_available = mock.MagicMock(return_value=True)
+    inst.config.persist_app_port = mock.MagicMock()
+    inst.dns_checker.check.return_value = True
+    inst.ssl.setup.side_effect = RuntimeError("certbot failed")
+    inst._remove_nginx_config = mock.MagicMock()
+    _answers(monkeypatch, ["3001", "app.example.com", "a@b.com"])
+    with pytest.raises(RuntimeError):
+        inst._setup_web("plexstaff", 3001, tmp_path, _web_context(tmp_path))
+    inst.firewall.close_port.assert_not_called()
 
 
 def test_setup_web_dns_failure_abort(monkeypatch, tmp_path):
@@ -562,6 +939,7 @@ def test_setup_web_nginx_failure_rolls_back(monkeypatch, tmp_path):
         inst._setup_web("plexstaff", 3001, tmp_path, ctx)
     inst._remove_nginx_config.assert_called_once_with("app.example.com")
     assert ctx.nginx_configured is False
+    inst.firewall.close_port.assert_not_called()
 
 
 def test_setup_web_firewall_close_warning(monkeypatch, tmp_path):
@@ -1029,3 +1407,15 @@ def test_main_runs_installer(monkeypatch):
     assert installer_module.main(["--yes", "--isolate-services"]) == 3
     assert ctor.call_args.kwargs["assume_yes"] is True
     assert ctor.call_args.kwargs["isolate_services"] is True
+
+
+def test_main_passes_answers_file(monkeypatch, tmp_path):
+    answers_file = tmp_path / "answers.yml"
+    answers_file.write_text("product: plexstaff\n")
+    ctor = mock.MagicMock()
+    monkeypatch.setattr("installer.PlexInstaller", ctor)
+    monkeypatch.setattr("installer.setup_logging", lambda: None)
+    installer_module.main(["--answers", str(answers_file)])
+    assert ctor.call_args.kwargs["answers"] == {"product": "plexstaff"}
+    with pytest.raises(SystemExit):
+        installer_module.main(["--answers", str(tmp_path / "missing.yml")])
@@ -5,6 +5,7 @@ from unittest import mock
 
 import pytest
 
+import installer as installer_module
 from config import Config
 from installer import PlexInstaller
 
@@ -17,7 +18,10 @@ def _installer(tmp_path: Path) -> PlexInstaller:
     inst.printer = mock.MagicMock()
     inst.assume_yes = False
     inst.non_interactive = False
+    inst.stdout_is_tty = True
     inst.isolate_services = None
+    inst.answers = {}
+    inst._manifest_future = None
     inst.telemetry_enabled = True
     inst.systemd = mock.MagicMock()
     inst.firewall = mock.MagicMock()
@@ -83,7 +87,6 @@ def test_main_menu_dispatches_all_products(monkeypatch, tmp_path):
         "13",
         "",
         "bogus",
-        "",
         "0",
     ]
     _answers(monkeypatch, seq)
@@ -97,6 +100,17 @@ def test_main_menu_dispatches_all_products(monkeypatch, tmp_path):
     inst.health.system_health_check.assert_called_once()
 
 
+def test_main_menu_reprompts_invalid_choice_without_redraw(monkeypatch, tmp_path):
+    inst = _installer(tmp_path)
+    inst._draw_main_menu = mock.MagicMock()
+    inst._manage_installations = mock.MagicMock()
+    _answers(monkeypatch, ["bogus", "", "9", "", "0"])
+    assert inst._show_main_menu() == 0
+    assert inst.printer.error.call_count == 2
+    assert inst._draw_main_menu.call_count == 2
+    inst._manage_installations.assert_called_once()
+
+
 def test_main_menu_missing_optional_managers(monkeypatch, tmp_path):
     inst = _installer(tmp_path)
     inst._display_banner = mock.MagicMock()
@@ -122,6 +136,30 @@ def test_show_services_status_table(monkeypatch, tmp_path, capsys):
     out = capsys.readouterr().out
     assert "3123" in out
     assert "Product" in out
+    inst.systemd.prime_cache.assert_called_once()
+    assert sorted(inst.systemd.prime_cache.call_args.args[0]) == ["plex-drakostore", "plex-other", "plex-plexstaff"]
+
+
+def test_show_services_status_requeries_each_redraw(tmp_path, capsys):
+    inst = _installer(tmp_path)
+    (tmp_path / "plexstaff").mkdir()
+    inst.systemd.get_status.return_value = "active"
+    inst._show_services_status()
+    (tmp_path / "drakostore").mkdir()
+    inst._show_services_status()
+    assert inst.systemd.prime_cache.call_count == 2
+    assert sorted(inst.systemd.prime_cache.call_args.args[0]) == ["plex-drakostore", "plex-plexstaff"]
+    assert "drakostore" in capsys.readouterr().out
+
+
+def test_show_services_status_skipped_without_tty(tmp_path, capsys):
+    inst = _installer(tmp_path)
+    inst.stdout_is_tty = False
+    (tmp_path / "plexstaff").mkdir()
+    inst._show_services_status()
+    assert capsys.readouterr().out == ""
+    inst.systemd.prime_cache.assert_not_called()
+    inst.systemd.get_status.assert_not_called()
 
 
 def test_show_services_status_matches_only_yaml_port_key(tmp_path, capsys):
@@ -144,10 +182,27 @@ def test_show_services_status_matches_only_yaml_port_key(tmp_path, capsys):
     assert "3333" not in out
 
 
-def test_show_services_status_empty_dirs(tmp_path):
+def test_scan_product_dir_reads_preferred_config(tmp_path, monkeypatch):
+    (tmp_path / "config.json").write_text('{"port": 1}')
+    assert installer_module._scan_product_dir(tmp_path) == (tmp_path / "config.json", None)
+    (tmp_path / "config.yaml").write_bytes(b"name: x\r\nport: 3210 # web\r\n")
+    assert installer_module._scan_product_dir(tmp_path) == (tmp_path / "config.yaml", "3210")
+    (tmp_path / "config.yml").write_bytes(b"\xff\xfe not utf-8\n")
+    assert installer_module._scan_product_dir(tmp_path) == (tmp_path / "config.yml", None)
+    (tmp_path / "config.yml").write_bytes(b"")
+    assert installer_module._scan_product_dir(tmp_path) == (tmp_path / "config.yml", None)
+    (tmp_path / "config.yml").write_bytes(b"# filler\n" * 1000 + b"port: 4321\n")
+    assert installer_module._scan_product_dir(tmp_path) == (tmp_path / "config.yml", "4321")
+    monkeypatch.setattr(installer_module, "open", mock.Mock(side_effect=PermissionError), raising=False)
+    assert installer_module._scan_product_dir(tmp_path) == (tmp_path / "config.yml", None)
+    assert installer_module._scan_product_dir(tmp_path / "missing") == (None, None)
+
+
+def test_show_services_status_empty_dirs(tmp_path, capsys):
     inst = _installer(tmp_path)
     inst.config.install_dir = tmp_path / "missing"
     inst._show_services_status()
+    assert capsys.readouterr().out == ""
     inst.config.install_dir = tmp_path
     inst._show_services_status()  # exists but no products
 
@@ -296,6 +351,8 @@ def test_force_ssl_renewal(monkeypatch, tmp_path):
     with mock.patch("installer.subprocess.run") as run:
         inst._force_ssl_renewal()
     assert run.call_count == 2
+    assert run.call_args_list[0].args[0] == ["certbot", "renew", "--force-renewal", "--no-random-sleep-on-renew"]
+    assert run.call_args_list[1].args[0] == ["systemctl", "reload", "nginx"]
     _answers(monkeypatch, ["y"])
     with mock.patch("installer.subprocess.run", side_effect=sp.CalledProcessError(1, "certbot")):
         inst._force_ssl_renewal()
@@ -308,9 +365,10 @@ def test_test_ssl_renewal(monkeypatch, tmp_path):
     import subprocess as sp
 
     inst = _installer(tmp_path)
-    with mock.patch("installer.subprocess.run"):
+    with mock.patch("installer.subprocess.run") as run:
         inst._test_ssl_renewal()
     inst.printer.success.assert_called()
+    run.assert_called_once_with(["certbot", "renew", "--dry-run", "--no-random-sleep-on-renew"], check=True)
     with mock.patch("installer.subprocess.run", side_effect=sp.CalledProcessError(1, "certbot")):
         inst._test_ssl_renewal()
     inst.printer.error.assert_called()
@@ -2,6 +2,7 @@
 
 import datetime
 import importlib
+import os
 import sys
 from pathlib import Path
 from unittest import mock
@@ -19,7 +20,10 @@ def _installer(tmp_path: Path) -> PlexInstaller:
     inst.printer = mock.MagicMock()
     inst.assume_yes = False
     inst.non_interactive = False
+    inst.stdout_is_tty = True
     inst.isolate_services = None
+    inst.answers = {}
+    inst._manifest_future = None
     inst.telemetry_enabled = True
     inst.check_updates = False
     inst.systemd = mock.MagicMock()
@@ -93,14 +97,33 @@ def test_release_lock_swallows_unlink_error(tmp_path, monkeypatch):
     assert inst._lock_fd is None
 
 
-def test_release_lock_swallows_generic_exception(tmp_path):
+def test_release_lock_swallows_generic_exception(tmp_path, monkeypatch):
     inst = _installer(tmp_path)
-    bad_fd = mock.MagicMock()
-    bad_fd.fileno.side_effect = RuntimeError("boom")
-    inst._lock_fd = bad_fd
+    monkeypatch.setattr(installer_module.fcntl, "flock", mock.MagicMock(side_effect=RuntimeError("boom")))
+    inst._lock_fd = 12345
     inst._release_lock()  # must not raise
 
 
+def test_acquire_lock_failure_keeps_holder_pid(tmp_path, monkeypatch):
+    inst = _installer(tmp_path)
+    lock_file = tmp_path / "lock"
+    lock_file.write_text("4242")
+    monkeypatch.setattr(installer_module, "LOCK_FILE", str(lock_file))
+    monkeypatch.setattr(installer_module.fcntl, "flock", mock.MagicMock(side_effect=OSError("busy")))
+    assert inst._acquire_lock() is False
+    assert lock_file.read_text() == "4242"
+
+
+def test_acquire_lock_replaces_stale_pid(tmp_path, monkeypatch):
+    inst = _installer(tmp_path)
+    lock_file = tmp_path / "lock"
+    lock_file.write_text("99999999")
+    monkeypatch.setattr(installer_module, "LOCK_FILE", str(lock_file))
+    assert inst._acquire_lock() is True
+    assert lock_file.read_text() == str(os.getpid())
+    inst._release_lock()
+
+
 # ---------- telemetry preference (301->307) ----------
 
 
@@ -320,7 +343,7 @@ def test_cleanup_failed_install_rmtree_failure(tmp_path, monkeypatch):
         port=3001,
         install_path_created=True,
     )
-    monkeypatch.setattr(installer_module.shutil, "rmtree", mock.MagicMock(side_effect=RuntimeError("locked")))
+    monkeypatch.setattr(installer_module, "remove_tree_in_background", mock.MagicMock(side_effect=OSError("locked")))
     inst._cleanup_failed_install(context)
     inst.printer.warning.assert_any_call("Failed to remove install directory: locked")
 
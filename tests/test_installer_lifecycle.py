@@ -18,7 +18,10 @@ def _installer(tmp_path: Path) -> PlexInstaller:
     installer.printer = mock.MagicMock()
     installer.assume_yes = False
     installer.non_interactive = False
+    installer.stdout_is_tty = True
     installer.isolate_services = None
+    installer.answers = {}
+    installer._manifest_future = None
     installer.telemetry_enabled = True
     installer.systemd = mock.MagicMock()
     installer.firewall = mock.MagicMock()
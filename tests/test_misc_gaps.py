@@ -73,7 +73,7 @@ def _rename_recreates_source(monkeypatch):
 
 def test_restore_target_reappears_and_recovery_succeeds(tmp_path, monkeypatch):
     bm = _backup_manager(tmp_path)
-    bm.systemd.get_status.return_value = "inactive"
+    bm.systemd.is_active.return_value = False
     install = tmp_path / "plexstaff"
     install.mkdir()
     (install / "old.js").write_text("old")
@@ -88,7 +88,7 @@ def test_restore_target_reappears_and_recovery_succeeds(tmp_path, monkeypatch):
 
 def test_restore_target_reappears_and_cleanup_fails(tmp_path, monkeypatch):
     bm = _backup_manager(tmp_path)
-    bm.systemd.get_status.return_value = "inactive"
+    bm.systemd.is_active.return_value = False
     install = tmp_path / "plexstaff"
     install.mkdir()
     monkeypatch.setattr(backup_manager_module, "safe_extract_tar", _fake_extract_tar("plexstaff"))
@@ -103,7 +103,7 @@ def test_restore_target_reappears_and_cleanup_fails(tmp_path, monkeypatch):
 
 def test_restore_success_rollback_removal_fails(tmp_path, monkeypatch):
     bm = _backup_manager(tmp_path)
-    bm.systemd.get_status.return_value = "inactive"
+    bm.systemd.is_active.return_value = False
     install = tmp_path / "plexstaff"
     install.mkdir()
     (install / "old.js").write_text("old")
@@ -118,6 +118,9 @@ def test_restore_success_rollback_removal_fails(tmp_path, monkeypatch):
 
     monkeypatch.setattr(backup_manager_module.shutil, "rmtree", selective_rmtree)
     bm.restore_from_backup(tmp_path / "plexstaff_backup_x.tar.gz", "plexstaff")
+    bm._cleanup_threads[0].join()
+    assert not any("rollback copy" in str(c.args[0]) for c in bm.printer.warning.call_args_list)
+    bm.wait_for_cleanup()
     assert (install / "app.js").exists()
     warnings = [str(c.args[0]) for c in bm.printer.warning.call_args_list]
     assert any("Could not remove rollback copy" in w for w in warnings)
@@ -125,7 +128,7 @@ def test_restore_success_rollback_removal_fails(tmp_path, monkeypatch):
 
 def test_restore_failure_after_publish_unlinks_symlink(tmp_path, monkeypatch):
     bm = _backup_manager(tmp_path)
-    bm.systemd.get_status.return_value = "inactive"
+    bm.systemd.is_active.return_value = False
     real_dir = tmp_path / "payload-target"
     real_dir.mkdir()
 
@@ -154,11 +157,10 @@ def test_backup_set_permissions_isolated_user_mismatch(tmp_path, monkeypatch):
     (install / ".plexinstaller-resources.json").write_text(
         json.dumps({"service_isolated": True, "service_user": "someone-else"})
     )
-    run = mock.MagicMock()
-    monkeypatch.setattr(backup_manager_module.subprocess, "run", run)
+    lchown = mock.MagicMock()
+    monkeypatch.setattr(backup_manager_module.os, "lchown", lchown)
     BackupManager._set_permissions(install)
-    assert run.call_args_list[0].args[0][:2] == ["chown", "-R"]
-    assert "root:root" in run.call_args_list[0].args[0]
+    assert lchown.call_args_list[0].args == (str(install), 0, 0)
 
 
 # ====================== addon_manager ======================
@@ -168,9 +170,7 @@ def test_validate_yaml_error_without_problem_mark(tmp_path, monkeypatch):
     manager = AddonManager()
     config = tmp_path / "config.yml"
     config.write_text("a: 1\n")
-    monkeypatch.setattr(
-        addon_manager_module.yaml, "safe_load", mock.MagicMock(side_effect=yaml.YAMLError("plain error"))
-    )
+    monkeypatch.setattr(yaml, "load", mock.MagicMock(side_effect=yaml.YAMLError("plain error")))
     ok, error = manager.validate_yaml(config)
     assert ok is False
     assert error == "plain error"
@@ -570,7 +570,7 @@ def test_write_entrypoint_closes_fd_on_write_failure(tmp_path, monkeypatch):
 
 def test_restore_target_reappears_as_symlink_and_is_unlinked(tmp_path, monkeypatch):
     bm = _backup_manager(tmp_path)
-    bm.systemd.get_status.return_value = "inactive"
+    bm.systemd.is_active.return_value = False
     payload = tmp_path / "somewhere-else"
     payload.mkdir()
     install = tmp_path / "plexstaff"
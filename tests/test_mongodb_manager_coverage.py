@@ -8,11 +8,14 @@ and the default TCP wait helper.  Everything system-facing is mocked.
 
 import json
 import subprocess
+import threading
+import urllib.parse
 from pathlib import Path
 from unittest import mock
 
 import pytest
 
+import mongodb_manager
 from mongodb_manager import MongoDBManager
 from utils import ColorPrinter, SystemDetector
 
@@ -219,21 +222,46 @@ class TestEnsureRunning:
 class TestRunShell:
     def test_prefers_mongosh(self):
         mgr = _make_manager()
-        with mock.patch("mongodb_manager.subprocess.run", return_value=_ok()) as run:
+        with (
+            mock.patch("mongodb_manager.shutil.which", side_effect=lambda name: f"/usr/bin/{name}"),
+            mock.patch("mongodb_manager.subprocess.run", return_value=_ok()) as run,
+        ):
             mgr.run_shell(["--eval", "1"])
-        assert run.call_args.args[0][0] == "mongosh"
+        assert run.call_args.args[0] == ["/usr/bin/mongosh", "--eval", "1"]
 
     def test_falls_back_to_mongo(self):
         mgr = _make_manager()
-
-        def side_effect(cmd, **kw):
-            if cmd[0] == "mongosh":
-                raise FileNotFoundError("mongosh")
-            return _ok("ok")
-
-        with mock.patch("mongodb_manager.subprocess.run", side_effect=side_effect):
+        which = {"mongo": "/usr/bin/mongo"}
+        with (
+            mock.patch("mongodb_manager.shutil.which", side_effect=which.get),
+            mock.patch("mongodb_manager.subprocess.run", return_value=_ok("ok")) as run,
+        ):
             result = mgr.run_shell(["--eval", "1"])
         assert result.stdout == "ok"
+        run.assert_called_once()
+        assert run.call_args.args[0][0] == "/usr/bin/mongo"
+
+    def test_shell_path_is_resolved_once(self):
+        mgr = _make_manager()
+        with (
+            mock.patch("mongodb_manager.shutil.which", return_value="/usr/bin/mongosh") as which,
+            mock.patch("mongodb_manager.subprocess.run", return_value=_ok()),
+        ):
+            mgr.run_shell(["--eval", "1"])
+            mgr.run_shell(["--eval", "2"])
+        which.assert_called_once_with("mongosh")
+
+    def test_missing_shell_raises_and_is_retried_later(self):
+        mgr = _make_manager()
+        with mock.patch("mongodb_manager.shutil.which", return_value=None):
+            with pytest.raises(FileNotFoundError):
+                mgr.run_shell(["--eval", "1"])
+        with (
+            mock.patch("mongodb_manager.shutil.which", return_value="/usr/bin/mongosh"),
+            mock.patch("mongodb_manager.subprocess.run", return_value=_ok()) as run,
+        ):
+            mgr.run_shell(["--eval", "1"])
+        assert run.call_args.args[0][0] == "/usr/bin/mongosh"
 
 
 # ---------------------------------------------------------------------------
@@ -252,6 +280,8 @@ class TestCreateUser:
         assert creds["host"] == "localhost"
         assert creds["port"] == 27017
         assert creds["password"] in creds["uri"]
+        assert len(creds["password"]) == 24
+        assert urllib.parse.quote(creds["password"], safe="") == creds["password"]
         assert f"authSource={creds['database']}" in creds["uri"]
 
     def test_retries_then_succeeds(self):
@@ -451,12 +481,36 @@ class TestUpdateConfigBranches:
         mgr.update_config(tmp_path, {"uri": 'mongodb://u:p"x@h/db'})
         assert '\\"' in cfg.read_text()
 
+    def test_only_preferred_key_is_rewritten_in_one_scan(self, tmp_path: Path):
+        mgr = _make_manager()
+        cfg = tmp_path / "config.yml"
+        cfg.write_text("database_url: 'postgres://x'\nmongodb_uri: old\nBot:\n  MONGOURI: ''\n  name: x\n")
+        with mock.patch("mongodb_manager._MONGO_URI_FIELD_RE", wraps=mongodb_manager._MONGO_URI_FIELD_RE) as pattern:
+            mgr.update_config(tmp_path, {"uri": "mongodb://h/db"})
+        assert pattern.method_calls == [mock.call.finditer(mock.ANY)]
+        assert cfg.read_text() == (
+            "database_url: 'postgres://x'\nmongodb_uri: old\nBot:\n  MONGOURI: \"mongodb://h/db\"\n  name: x\n"
+        )
+
+    def test_uri_backslashes_are_yaml_escaped(self, tmp_path: Path):
+        mgr = _make_manager()
+        cfg = tmp_path / "config.yml"
+        cfg.write_text("Bot:\n  mongoURI: ''\n  Prefix: '!'\n")
+        mgr.update_config(tmp_path, {"uri": "mongodb://u:p\\1x@h/db"})
+        assert cfg.read_text() == "Bot:\n  mongoURI: \"mongodb://u:p\\\\1x@h/db\"\n  Prefix: '!'\n"
+
 
 # ---------------------------------------------------------------------------
 # _install_debian / _install_rhel
 # ---------------------------------------------------------------------------
 
 
+def _key_response(body: bytes = b"-----BEGIN PGP PUBLIC KEY BLOCK-----"):
+    response = mock.MagicMock()
+    response.__enter__.return_value.read.side_effect = lambda size=-1: body if size < 0 else body[:size]
+    return mock.MagicMock(return_value=response)
+
+
 class TestInstallDebian:
     def _run(self, mgr, codename="jammy"):
         """Run _install_debian with everything mocked; return list of run() cmds and written repo lines."""
@@ -467,19 +521,12 @@ class TestInstallDebian:
             handle.write.side_effect = lambda data: written.setdefault(path, []).append(data)
             return handle
 
-        def run_side_effect(cmd, **kw):
-            if cmd[:1] == ["lsb_release"]:
-                return _ok(f"{codename}\n")
-            return _ok()
-
-        popen = mock.MagicMock()
-        popen.stdout = mock.MagicMock()
-        popen.wait.return_value = 0
+        mgr.system.distro_codename = codename
         with (
             mock.patch("mongodb_manager.Path") as path_cls,
             mock.patch("builtins.open", side_effect=fake_open),
-            mock.patch("mongodb_manager.subprocess.run", side_effect=run_side_effect) as run,
-            mock.patch("mongodb_manager.subprocess.Popen", return_value=popen),
+            mock.patch("mongodb_manager.subprocess.run", return_value=_ok()) as run,
+            mock.patch("mongodb_manager.urllib.request.urlopen", _key_response()),
         ):
             path_cls.return_value.exists.return_value = False
             result = mgr._install_debian()
@@ -492,6 +539,12 @@ class TestInstallDebian:
         repo_lines = [line for lines in written.values() for line in lines]
         assert any("repo.mongodb.org/apt/ubuntu" in line and "jammy" in line for line in repo_lines)
 
+    def test_service_is_enabled_and_started_in_one_call(self):
+        mgr = _make_manager(distro="ubuntu")
+        _, run, _ = self._run(mgr)
+        systemctl = [call.args[0] for call in run.call_args_list if call.args[0][0] == "systemctl"]
+        assert systemctl == [["systemctl", "enable", "--now", "mongod"]]
+
     def test_debian_bullseye_repo_line(self):
         mgr = _make_manager(distro="debian")
         result, _, written = self._run(mgr, codename="bullseye")
@@ -515,46 +568,125 @@ class TestInstallDebian:
 
     def test_cleans_old_repo_files(self):
         mgr = _make_manager(distro="ubuntu")
-        popen = mock.MagicMock()
-        popen.stdout = mock.MagicMock()
-        popen.wait.return_value = 0
+        mgr.system.distro_codename = "jammy"
         with (
             mock.patch("mongodb_manager.Path") as path_cls,
             mock.patch("builtins.open", mock.mock_open()),
-            mock.patch("mongodb_manager.subprocess.run", return_value=_ok("jammy\n")),
-            mock.patch("mongodb_manager.subprocess.Popen", return_value=popen),
+            mock.patch("mongodb_manager.subprocess.run", return_value=_ok()),
+            mock.patch("mongodb_manager.urllib.request.urlopen", _key_response()),
         ):
-            path_cls.return_value.exists.return_value = True
             assert mgr._install_debian() is True
-        assert path_cls.return_value.unlink.call_count == 8
+        removed = [call.args[0] for call in path_cls.call_args_list[: len(mongodb_manager._OLD_MONGO_ARTIFACTS)]]
+        assert removed == list(mongodb_manager._OLD_MONGO_ARTIFACTS)
+        path_cls.return_value.exists.assert_not_called()
+        assert path_cls.return_value.unlink.call_args_list == [mock.call(missing_ok=True)] * 8
 
-    def test_curl_failure_returns_false_and_removes_partial_key(self, capsys):
+    def test_key_is_fetched_in_process_and_piped_to_gpg(self):
         mgr = _make_manager(distro="ubuntu")
-        popen = mock.MagicMock()
-        popen.stdout = mock.MagicMock()
-        popen.wait.return_value = 22
+        result, run, _ = self._run(mgr)
+        assert result is True
+        gpg = next(call for call in run.call_args_list if call.args[0][0] == "gpg")
+        assert gpg.kwargs["input"] == b"-----BEGIN PGP PUBLIC KEY BLOCK-----"
+        assert "--batch" in gpg.args[0]
+        assert not any(call.args[0][0] == "curl" for call in run.call_args_list)
 
+    def test_key_download_failure_returns_false_before_gpg(self, capsys):
+        mgr = _make_manager(distro="ubuntu")
         with (
             mock.patch("mongodb_manager.Path") as path_cls,
             mock.patch("mongodb_manager.subprocess.run", return_value=_ok()) as run,
-            mock.patch("mongodb_manager.subprocess.Popen", return_value=popen),
+            mock.patch("mongodb_manager.urllib.request.urlopen", side_effect=OSError("HTTP Error 404")),
         ):
             path_cls.return_value.exists.return_value = False
             assert mgr._install_debian() is False
 
-        popen.stdout.close.assert_called_once()
-        popen.wait.assert_called_once()
-        path_cls.return_value.unlink.assert_called_once_with(missing_ok=True)
+        assert not any(call.args[0][0] == "gpg" for call in run.call_args_list)
         assert not any(call.args[0] == ["apt-get", "update"] for call in run.call_args_list)
-        error = capsys.readouterr().err
-        assert "curl" in error
-        assert "exit status 22" in error
+        assert "HTTP Error 404" in capsys.readouterr().err
+
+    def test_key_download_overlaps_prerequisite_install(self):
+        mgr = _make_manager(distro="ubuntu")
+        mgr.system.distro_codename = "jammy"
+        fetch_started = threading.Event()
+
+        def fetch(url):
+            fetch_started.set()
+            return b"key"
+
+        def run_side_effect(cmd, **kwargs):
+            if cmd[:2] == ["apt-get", "install"] and "gnupg" in cmd:
+                assert fetch_started.wait(5)
+            return _ok()
+
+        with (
+            mock.patch("mongodb_manager.Path"),
+            mock.patch("builtins.open", mock.mock_open()),
+            mock.patch("mongodb_manager.subprocess.run", side_effect=run_side_effect),
+            mock.patch("mongodb_manager._fetch_signing_key", side_effect=fetch),
+        ):
+            assert mgr._install_debian() is True
+
+    def test_prerequisite_failure_skips_gpg(self):
+        mgr = _make_manager(distro="ubuntu")
+
+        def run_side_effect(cmd, **kwargs):
+            if cmd[:2] == ["apt-get", "install"]:
+                raise subprocess.CalledProcessError(100, cmd)
+            return _ok()
+
+        with (
+            mock.patch("mongodb_manager.Path"),
+            mock.patch("mongodb_manager.subprocess.run", side_effect=run_side_effect) as run,
+            mock.patch("mongodb_manager._fetch_signing_key", return_value=b"key"),
+        ):
+            assert mgr._install_debian() is False
+        assert not any(call.args[0][0] == "gpg" for call in run.call_args_list)
+
+    def test_prerequisite_failure_does_not_wait_for_key_download(self):
+        mgr = _make_manager(distro="ubuntu")
+        fetch_started = threading.Event()
+        release_fetch = threading.Event()
+        fetch_finished = threading.Event()
+
+        def fetch(url):
+            fetch_started.set()
+            release_fetch.wait(5)
+            fetch_finished.set()
+            return b"key"
+
+        def run_side_effect(cmd, **kwargs):
+            if cmd[:2] == ["apt-get", "install"]:
+                assert fetch_started.wait(5)
+                raise subprocess.CalledProcessError(100, cmd)
+            return _ok()
+
+        with (
+            mock.patch("mongodb_manager.Path"),
+            mock.patch("mongodb_manager.subprocess.run", side_effect=run_side_effect),
+            mock.patch("mongodb_manager._fetch_signing_key", side_effect=fetch),
+        ):
+            try:
+                assert mgr._install_debian() is False
+                assert not fetch_finished.is_set()
+            finally:
+                release_fetch.set()
+
+    def test_oversized_key_is_rejected(self, capsys):
+        mgr = _make_manager(distro="ubuntu")
+        oversized = _key_response(b"x" * (mongodb_manager._MONGO_KEY_MAX_BYTES + 1))
+        with (
+            mock.patch("mongodb_manager.Path") as path_cls,
+            mock.patch("mongodb_manager.subprocess.run", return_value=_ok()) as run,
+            mock.patch("mongodb_manager.urllib.request.urlopen", oversized),
+        ):
+            path_cls.return_value.exists.return_value = False
+            assert mgr._install_debian() is False
+
+        assert not any(call.args[0][0] == "gpg" for call in run.call_args_list)
+        assert "larger than" in capsys.readouterr().err
 
-    def test_gpg_failure_reaps_curl_and_preserves_error(self, capsys):
+    def test_gpg_failure_removes_partial_key_and_preserves_error(self, capsys):
         mgr = _make_manager(distro="ubuntu")
-        popen = mock.MagicMock()
-        popen.stdout = mock.MagicMock()
-        popen.wait.return_value = 0
         gpg_error = subprocess.CalledProcessError(2, ["gpg", "--dearmor"])
 
         def run_side_effect(cmd, **kwargs):
@@ -565,15 +697,13 @@ class TestInstallDebian:
         with (
             mock.patch("mongodb_manager.Path") as path_cls,
             mock.patch("mongodb_manager.subprocess.run", side_effect=run_side_effect),
-            mock.patch("mongodb_manager.subprocess.Popen", return_value=popen),
+            mock.patch("mongodb_manager.urllib.request.urlopen", _key_response()),
         ):
             path_cls.return_value.exists.return_value = False
             assert mgr._install_debian() is False
 
-        popen.stdout.close.assert_called_once()
-        popen.terminate.assert_called_once()
-        popen.wait.assert_called_once()
-        path_cls.return_value.unlink.assert_called_once_with(missing_ok=True)
+        assert path_cls.return_value.unlink.call_count == len(mongodb_manager._OLD_MONGO_ARTIFACTS) + 1
+        assert path_cls.return_value.unlink.call_args == mock.call(missing_ok=True)
         error = capsys.readouterr().err
         assert "gpg" in error
         assert "exit status 2" in error
@@ -600,6 +730,7 @@ class TestInstallRhel:
             assert mgr._install_rhel() is True
         assert opened.call_args.args[0] == "/etc/yum.repos.d/mongodb-org-8.0.repo"
         assert run.call_args_list[0].args[0][0] == "yum"
+        assert run.call_args.args[0] == ["systemctl", "enable", "--now", "mongod"]
 
     def test_fedora_uses_dnf(self):
         mgr = _make_manager(distro="fedora")
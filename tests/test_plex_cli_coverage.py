@@ -77,6 +77,20 @@ def test_shutil_which_returns_string_or_none():
     assert result is None
 
 
+def test_find_app_config_prefers_yaml_and_ignores_directories(tmp_path: Path):
+    (tmp_path / "config.yml").mkdir()
+    (tmp_path / "config.json").write_text("{}")
+    (tmp_path / "config.yaml").write_text("Port: 1\n")
+    assert plex_cli._find_app_config(tmp_path) == tmp_path / "config.yaml"
+    assert plex_cli._find_app_config(tmp_path / "missing") is None
+
+
+def test_app_config_names_match_config_module():
+    import config
+
+    assert plex_cli._APP_CONFIG_NAMES == config.APP_CONFIG_NAMES == ("config.yml", "config.yaml", "config.json")
+
+
 def test_run_editor_oserror(tmp_path: Path):
     with mock.patch("plex_cli.subprocess.run", side_effect=OSError("boom")):
         assert plex_cli._run_editor(tmp_path / "c.yml") == plex_cli.EXIT_ERROR
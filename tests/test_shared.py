@@ -246,7 +246,8 @@ class TestDownloadMissingFiles:
         manifest = json.dumps(version_data).encode()
         with (
             mock.patch("shared.INSTALLER_DIR", tmp_path),
-            mock.patch("shared._download_bytes", side_effect=[manifest, content]),
+            mock.patch("shared._download_bytes", return_value=manifest),
+            mock.patch("shared._download_chunks", return_value=iter([content])),
             mock.patch("shared.verify_gpg_signature", return_value=True),
         ):
             download_missing_files(**_PRINTER_KWARGS)
@@ -266,7 +267,8 @@ class TestDownloadMissingFiles:
         manifest = json.dumps(version_data).encode()
         with (
             mock.patch("shared.INSTALLER_DIR", tmp_path),
-            mock.patch("shared._download_bytes", side_effect=[manifest, content]),
+            mock.patch("shared._download_bytes", return_value=manifest),
+            mock.patch("shared._download_chunks", return_value=iter([content])),
             mock.patch("shared.verify_gpg_signature", return_value=True),
         ):
             download_missing_files(**_PRINTER_KWARGS)
@@ -316,7 +318,8 @@ class TestDownloadMissingFiles:
         ).encode()
         with (
             mock.patch("shared.INSTALLER_DIR", tmp_path),
-            mock.patch("shared._download_bytes", side_effect=[manifest, config, utils]),
+            mock.patch("shared._download_bytes", return_value=manifest),
+            mock.patch("shared._download_chunks", side_effect=[iter([config]), iter([utils])]),
             mock.patch("shared.verify_gpg_signature", return_value=True),
         ):
             download_missing_files(**_PRINTER_KWARGS)
@@ -350,6 +353,24 @@ class TestIsNewerVersionExtra:
         assert is_newer_version("3.1", "3.1.0") is False
         assert is_newer_version("3.1.0", "3.1") is False
 
+    def test_prerelease_is_newer_than_previous_release(self):
+        assert is_newer_version("3.2.0-rc1", "3.1.17") is True
+
+    def test_release_is_newer_than_its_prerelease(self):
+        assert is_newer_version("3.2.0", "3.2.0-rc1") is True
+        assert is_newer_version("3.2.0-rc1", "3.2.0") is False
+
+    def test_prerelease_identifiers_are_ordered(self):
+        assert is_newer_version("3.2.0-rc.10", "3.2.0-rc.2") is True
+        assert is_newer_version("3.2.0-rc.1", "3.2.0-beta.9") is True
+
+    def test_tag_prefix_and_build_metadata(self):
+        assert is_newer_version("v3.2.0", "3.1.17") is True
+        assert is_newer_version("3.1.17+build.5", "3.1.17") is False
+
+    def test_non_string_is_not_newer(self):
+        assert is_newer_version(None, "3.1.17") is False  # type: ignore[arg-type]
+
 
 # ---------------------------------------------------------------------------
 # Additional _force_symlink cases
@@ -1,5 +1,6 @@
 """Additional coverage tests for shared.py."""
 
+import contextlib
 import hashlib
 import json
 import subprocess
@@ -126,6 +127,87 @@ class TestDownloadBytes:
             with pytest.raises(ValueError, match="scheme"):
                 _download_bytes("https://example.com/f", timeout=5, max_bytes=100)
 
+    @staticmethod
+    def _session(chunks: list[bytes], url: str = "https://example.com/f") -> mock.MagicMock:
+        session = mock.MagicMock()
+        response = session.get.return_value.__enter__.return_value
+        response.url = url
+        response.iter_content.return_value = iter(chunks)
+        return session
+
+    def test_session_download_reuses_pooled_connection(self):
+        session = self._session([b"hel", b"lo"])
+        with mock.patch("shared.urllib.request.urlopen") as urlopen:
+            assert _download_bytes("https://example.com/f", timeout=5, max_bytes=100, session=session) == b"hello"
+        urlopen.assert_not_called()
+        session.get.assert_called_once_with("https://example.com/f", timeout=5, stream=True)
+
+    def test_session_download_enforces_limit_and_redirects(self):
+        with pytest.raises(ValueError, match="size limit"):
+            _download_bytes("https://example.com/f", timeout=5, max_bytes=4, session=self._session([b"abc", b"de"]))
+        with pytest.raises(ValueError, match="scheme"):
+            _download_bytes(
+                "https://example.com/f",
+                timeout=5,
+                max_bytes=100,
+                session=self._session([b"x"], url="http://evil.example/f"),
+            )
+
+    def test_download_session_without_requests(self):
+        with mock.patch("shared.requests", None), shared._download_session() as session:
+            assert session is None
+
+
+class TestDownloadVerifiedFile:
+    def test_streams_chunks_to_file(self, tmp_path):
+        body = [b"abc", b"def"]
+        expected = hashlib.sha256(b"abcdef").hexdigest()
+        target = tmp_path / "plex_cli.py"
+        with mock.patch("shared._download_chunks", return_value=iter(body)):
+            shared._download_verified_file(
+                "https://example.com/plex_cli.py",
+                target,
+                expected_hash=expected.upper(),
+                filename="plex_cli.py",
+                mode=0o755,
+                timeout=5,
+                max_bytes=100,
+            )
+        assert target.read_bytes() == b"abcdef"
+        assert target.stat().st_mode & 0o777 == 0o755
+
+    def test_checksum_mismatch_raises(self, tmp_path):
+        target = tmp_path / "config.py"
+        with (
+            mock.patch("shared._download_chunks", return_value=iter([b"tampered"])),
+            pytest.raises(ValueError, match="Checksum mismatch for config.py"),
+        ):
+            shared._download_verified_file(
+                "https://example.com/config.py",
+                target,
+                expected_hash="0" * 64,
+                filename="config.py",
+                mode=0o644,
+                timeout=5,
+                max_bytes=100,
+            )
+
+    def test_refuses_existing_path(self, tmp_path):
+        target = tmp_path / "config.py"
+        target.write_bytes(b"old")
+        with mock.patch("shared._download_chunks") as chunks, pytest.raises(FileExistsError):
+            shared._download_verified_file(
+                "https://example.com/config.py",
+                target,
+                expected_hash="0" * 64,
+                filename="config.py",
+                mode=0o644,
+                timeout=5,
+                max_bytes=100,
+            )
+        chunks.assert_not_called()
+        assert target.read_bytes() == b"old"
+
 
 # ---------------------------------------------------------------------------
 # _parse_manifest / _validated_download_specs
@@ -578,13 +660,16 @@ class TestPerformUpdate:
         manifest_bytes = json.dumps(manifest).encode()
 
         def fake_download(url, **kwargs):
-            return contents[url.rsplit("/", 1)[1]]
+            body = contents[url.rsplit("/", 1)[1]]
+            return iter([body[:3], body[3:]])
 
+        session = object()
         with (
             mock.patch("shared.os.geteuid", return_value=0),
             mock.patch("shared.verify_gpg_signature", return_value=True),
             mock.patch.object(shared, "INSTALLER_DIR", tmp_path),
-            mock.patch("shared._download_bytes", side_effect=fake_download),
+            mock.patch("shared._download_chunks", side_effect=fake_download) as download,
+            mock.patch("shared._download_session", return_value=contextlib.nullcontext(session)),
             mock.patch("shared.ensure_cli_entrypoints") as entry,
             mock.patch("shared.os.execv") as execv,
         ):
@@ -592,6 +677,7 @@ class TestPerformUpdate:
 
         entry.assert_called_once()
         execv.assert_called_once()
+        assert [call.kwargs["session"] for call in download.call_args_list] == [session] * len(UPDATE_FILE_MAP)
         for filename in UPDATE_FILE_MAP.values():
             assert (tmp_path / filename).read_bytes() == contents[filename]
         assert (tmp_path / "installer.py").stat().st_mode & 0o777 == 0o755
@@ -608,7 +694,7 @@ class TestPerformUpdate:
             mock.patch("shared.os.geteuid", return_value=0),
             mock.patch("shared.verify_gpg_signature", return_value=True),
             mock.patch.object(shared, "INSTALLER_DIR", tmp_path),
-            mock.patch("shared._download_bytes", return_value=b"tampered content"),
+            mock.patch("shared._download_chunks", side_effect=lambda *_a, **_k: iter([b"tampered content"])),
             mock.patch("shared.os.execv") as execv,
         ):
             perform_update(
@@ -634,7 +720,7 @@ class TestPerformUpdate:
             mock.patch("shared.os.geteuid", return_value=0),
             mock.patch("shared.verify_gpg_signature", return_value=True),
             mock.patch.object(shared, "INSTALLER_DIR", tmp_path),
-            mock.patch("shared._download_bytes", return_value=b"x"),
+            mock.patch("shared._download_chunks", side_effect=lambda *_a, **_k: iter([b"x"])),
             mock.patch("shared.ensure_cli_entrypoints"),
             mock.patch("shared.os.execv", side_effect=OSError("cannot exec")),
         ):
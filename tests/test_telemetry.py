@@ -1,5 +1,6 @@
 """Tests for telemetry_client.py — redaction, session lifecycle, payload assembly."""
 
+import os
 import stat
 from pathlib import Path
 from unittest import mock
@@ -168,6 +169,21 @@ class TestTelemetryClientSession:
         assert "test_step" in log_content
         assert stat.S_IMODE(client.log_path.stat().st_mode) == 0o600
 
+    @mock.patch("telemetry_client.requests.post")
+    def test_log_is_opened_once_per_session(self, mock_post, tmp_path: Path):
+        mock_post.return_value = mock.MagicMock(status_code=200)
+        client = self._make_client(tmp_path)
+        with mock.patch("telemetry_client.os.open", wraps=os.open) as opened:
+            client.start_session("plextickets", "default")
+            for index in range(5):
+                client.log_step(f"step_{index}", "ok")
+            summary = client.finish_session("success")
+        assert opened.call_count == 1
+        assert client._log_stream is None
+        assert summary is not None
+        assert summary.log_path is not None
+        assert "step_4" in summary.log_path.read_text()
+
     @mock.patch("telemetry_client.requests.post")
     def test_finish_session_with_failure(self, mock_post, tmp_path: Path):
         """failure_step and error are propagated to the summary."""
@@ -2,7 +2,9 @@
 
 import logging
 import stat
+import sys
 import tarfile
+import threading
 import zipfile
 from io import BytesIO
 from pathlib import Path
@@ -178,11 +180,11 @@ class TestArchiveExtractor:
         with zipfile.ZipFile(archive_path, "w") as zf:
             zf.write(content_dir / "package.json", "myapp/package.json")
 
-        # Extract — mock subprocess.run so chown/chmod don't change ownership to root
+        # Extract — mock lchown so ownership isn't changed to root
         extractor = ArchiveExtractor()
         target_dir = tmp_path / "myapp"
 
-        with mock.patch("utils.subprocess.run"):
+        with mock.patch("utils.os.lchown"):
             extractor.extract(archive_path, target_dir)
 
         assert (target_dir / "package.json").exists()
@@ -263,7 +265,7 @@ class TestArchiveExtractorEdgeCases:
         extractor = ArchiveExtractor()
         target_dir = tmp_path / "myapp"
 
-        with mock.patch("utils.subprocess.run"):
+        with mock.patch("utils.os.lchown"):
             extractor.extract(archive_path, target_dir)
 
         assert (target_dir / "package.json").exists()
@@ -277,7 +279,7 @@ class TestArchiveExtractorEdgeCases:
         extractor = ArchiveExtractor()
         target_dir = tmp_path / "nonexistent" / "myapp"
 
-        with mock.patch("utils.subprocess.run"):
+        with mock.patch("utils.os.lchown"):
             extractor.extract(archive_path, target_dir)
 
         assert target_dir.exists()
@@ -428,11 +430,15 @@ class TestSystemdIsolation:
             return original_path(value)
 
         with mock.patch("utils.Path", side_effect=fake_path):
-            with mock.patch("utils.subprocess.run"):
+            with mock.patch("utils.subprocess.run") as run:
                 manager.create_service("example", tmp_path)
 
         content = service_path.read_text()
         assert "User=root" in content
+        assert [call.args[0] for call in run.call_args_list] == [
+            ["systemctl", "daemon-reload"],
+            ["systemctl", "enable", "--now", "plex-example"],
+        ]
         assert "ProtectSystem=strict" not in content
 
     def test_isolated_service_creates_user_and_hardening(self, tmp_path: Path):
@@ -502,6 +508,23 @@ class TestColorPrinterExtra:
         captured = capsys.readouterr()
         assert "doing something" in captured.err
 
+    def test_progress_without_tty_prints_only_the_step(self, capsys):
+        cp = ColorPrinter()
+        with cp.progress("Archiving", interval=0.001):
+            threading.Event().wait(0.02)
+        err = capsys.readouterr().err
+        assert "Archiving" in err
+        assert "." not in err.replace("Archiving", "")
+
+    def test_progress_on_tty_ticks_until_the_block_ends(self, capsys):
+        cp = ColorPrinter()
+        with mock.patch.object(sys.stderr, "isatty", return_value=True):
+            with cp.progress("Archiving", interval=0.001):
+                threading.Event().wait(0.05)
+            err = capsys.readouterr().err
+        assert err.count(".") >= 1
+        assert err.endswith(".\n")
+
     def test_nc_resets_color(self):
         cp = ColorPrinter()
         assert cp.NC == "\x1b[0m" or "reset" in repr(cp.NC).lower() or cp.NC == str(cp.NC)
@@ -6,6 +6,9 @@ staged install, archive extraction edge cases, and permission policy.
 All system-facing calls are mocked.
 """
 
+import gzip
+import os
+import shutil
 import subprocess
 import tarfile
 import zipfile
@@ -26,12 +29,21 @@ from utils import (
     SystemdManager,
     UnsafeArchiveError,
     clear_terminal,
+    gunzip_to,
     install_staged_directory,
+    is_gzip_file,
+    is_zstd_file,
+    list_product_dirs,
     redact_sensitive_yaml,
+    remove_tree,
+    remove_tree_in_background,
     safe_extract_archive,
     safe_extract_tar,
     safe_extract_zip,
+    unzstd_to,
     validate_path_component,
+    write_tar_gz,
+    write_tar_zst,
 )
 
 
@@ -73,6 +85,28 @@ class TestSystemDetector:
         ):
             det.detect()
 
+    def test_distro_codename_read_once_from_os_release(self):
+        det = SystemDetector()
+        with (
+            mock.patch(
+                "utils.platform.freedesktop_os_release", return_value={"ID": "ubuntu", "VERSION_CODENAME": "noble"}
+            ) as os_release,
+            mock.patch("utils.subprocess.run") as run,
+        ):
+            assert det.distro_codename == "noble"
+            assert det.distro_codename == "noble"
+        os_release.assert_called_once_with()
+        run.assert_not_called()
+
+    def test_distro_codename_falls_back_to_lsb_release(self):
+        det = SystemDetector()
+        with (
+            mock.patch("utils.platform.freedesktop_os_release", side_effect=OSError),
+            mock.patch("utils.subprocess.run", return_value=_ok("bookworm\n")) as run,
+        ):
+            assert det.distro_codename == "bookworm"
+        assert run.call_args.args[0] == ["lsb_release", "-cs"]
+
     def test_install_dependencies_without_detect_errors(self, capsys):
         det = SystemDetector()
         det.install_dependencies()
@@ -166,12 +200,16 @@ class TestSystemDetector:
 # ---------------------------------------------------------------------------
 
 
+def _addrinfo(address: str) -> list:
+    return [(2, 1, 6, "", (address, 0))]
+
+
 class TestDNSChecker:
     def test_check_match(self):
         checker = DNSChecker()
         with (
             mock.patch.object(checker, "_get_public_ip", return_value="1.2.3.4"),
-            mock.patch("utils.socket.gethostbyname", return_value="1.2.3.4"),
+            mock.patch("utils.socket.getaddrinfo", return_value=_addrinfo("1.2.3.4")),
         ):
             assert checker.check("example.com") is True
 
@@ -179,7 +217,7 @@ class TestDNSChecker:
         checker = DNSChecker()
         with (
             mock.patch.object(checker, "_get_public_ip", return_value="1.2.3.4"),
-            mock.patch("utils.socket.gethostbyname", return_value="5.6.7.8"),
+            mock.patch("utils.socket.getaddrinfo", return_value=_addrinfo("5.6.7.8")),
         ):
             assert checker.check("example.com") is False
 
@@ -189,7 +227,7 @@ class TestDNSChecker:
         checker = DNSChecker()
         with (
             mock.patch.object(checker, "_get_public_ip", return_value="1.2.3.4"),
-            mock.patch("utils.socket.gethostbyname", side_effect=socket_mod.gaierror),
+            mock.patch("utils.socket.getaddrinfo", side_effect=socket_mod.gaierror),
         ):
             assert checker.check("nope.invalid") is False
 
@@ -198,6 +236,72 @@ class TestDNSChecker:
         with mock.patch.object(checker, "_get_public_ip", return_value=None):
             assert checker.check("example.com") is False
 
+    def test_lookup_async_feeds_check(self):
+        checker = DNSChecker()
+        with (
+            mock.patch.object(checker, "_get_public_ip", return_value="1.2.3.4"),
+            mock.patch("utils.socket.getaddrinfo", return_value=_addrinfo("1.2.3.4")) as resolve,
+        ):
+            lookup = checker.lookup_async("example.com")
+            assert lookup.result(timeout=5) == ("1.2.3.4", "1.2.3.4")
+            assert checker.check("example.com", lookup) is True
+        resolve.assert_called_once()
+        assert resolve.call_args.args[0] == "example.com"
+
+    def test_lookup_caches_successful_answers(self):
+        checker = DNSChecker()
+        with (
+            mock.patch.object(checker, "_get_public_ip", return_value="1.2.3.4") as public_ip,
+            mock.patch("utils.socket.getaddrinfo", return_value=_addrinfo("1.2.3.4")) as resolve,
+        ):
+            assert checker.lookup("example.com") == ("1.2.3.4", "1.2.3.4")
+            assert checker.lookup("example.com") == ("1.2.3.4", "1.2.3.4")
+            assert checker.lookup("other.example.com") == ("1.2.3.4", "1.2.3.4")
+        public_ip.assert_called_once()
+        assert resolve.call_count == 2
+
+    def test_lookup_cache_expires_and_skips_failures(self):
+        import socket as socket_mod
+
+        checker = DNSChecker()
+        with (
+            mock.patch.object(checker, "_get_public_ip", return_value="1.2.3.4"),
+            mock.patch(
+                "utils.socket.getaddrinfo",
+                side_effect=[socket_mod.gaierror, [], _addrinfo("1.2.3.4"), _addrinfo("5.6.7.8")],
+            ) as resolve,
+        ):
+            assert checker.lookup("example.com") == ("1.2.3.4", None)
+            assert checker.lookup("example.com") == ("1.2.3.4", None)
+            assert checker.lookup("example.com") == ("1.2.3.4", "1.2.3.4")
+            checker._resolved["example.com"] = (0.0, "1.2.3.4")
+            checker._public_ip = (0.0, "1.2.3.4")
+            assert checker.lookup("example.com") == ("1.2.3.4", "5.6.7.8")
+        assert resolve.call_count == 4
+
+    def test_lookup_does_not_cache_mismatch(self):
+        checker = DNSChecker()
+        with (
+            mock.patch.object(checker, "_get_public_ip", return_value="1.2.3.4"),
+            mock.patch(
+                "utils.socket.getaddrinfo",
+                side_effect=[_addrinfo("5.6.7.8"), _addrinfo("1.2.3.4")],
+            ) as resolve,
+        ):
+            assert checker.lookup("example.com") == ("1.2.3.4", "5.6.7.8")
+            assert checker.lookup("example.com") == ("1.2.3.4", "1.2.3.4")
+            assert checker.lookup("example.com") == ("1.2.3.4", "1.2.3.4")
+        assert resolve.call_count == 2
+
+    def test_lookup_skips_resolution_without_public_ip(self):
+        checker = DNSChecker()
+        with (
+            mock.patch.object(checker, "_get_public_ip", return_value=None),
+            mock.patch("utils.socket.getaddrinfo") as resolve,
+        ):
+            assert checker.lookup("example.com") == (None, None)
+        resolve.assert_not_called()
+
     def test_get_public_ip_success(self):
         checker = DNSChecker()
         with mock.patch("utils.subprocess.run", return_value=_ok("9.9.9.9\n")):
@@ -597,6 +701,80 @@ class TestSystemdManager:
         with mock.patch("utils.subprocess.run", side_effect=OSError):
             assert mgr.get_status("svc") == "unknown"
 
+    def test_is_active_uses_exit_status(self):
+        mgr = SystemdManager()
+        with mock.patch("utils.subprocess.run", return_value=_ok(returncode=0)) as run:
+            assert mgr.is_active("svc") is True
+        assert run.call_args.args[0] == ["systemctl", "is-active", "--quiet", "svc"]
+        assert "capture_output" not in run.call_args.kwargs
+        with mock.patch("utils.subprocess.run", return_value=_ok(returncode=3)):
+            assert mgr.is_active("svc") is False
+        with mock.patch("utils.subprocess.run", side_effect=OSError):
+            assert mgr.is_active("svc") is False
+
+    def test_is_active_prefers_primed_cache(self):
+        mgr = SystemdManager()
+        with mock.patch("utils.subprocess.run", return_value=_ok("active\n\ninactive\n")):
+            mgr.prime_cache(["plex-a", "plex-b"])
+        with mock.patch("utils.subprocess.run") as run:
+            assert mgr.is_active("plex-a") is True
+            assert mgr.is_active("plex-b") is False
+        run.assert_not_called()
+
+    def test_prime_cache_serves_statuses_from_one_call(self):
+        mgr = SystemdManager()
+        with mock.patch("utils.subprocess.run", return_value=_ok("active\n\ninactive\n")) as run:
+            mgr.prime_cache(["plex-a", "plex-b"])
+            assert mgr.get_status("plex-a") == "active"
+            assert mgr.get_status("plex-b") == "inactive"
+        assert run.call_count == 1
+        assert run.call_args.args[0] == ["systemctl", "show", "--property=ActiveState", "--value", "plex-a", "plex-b"]
+
+    def test_prime_cache_expires_after_ttl(self):
+        mgr = SystemdManager()
+        with mock.patch("utils.time.monotonic", return_value=100.0):
+            with mock.patch("utils.subprocess.run", return_value=_ok("active\n")):
+                mgr.prime_cache(["plex-a"])
+        with (
+            mock.patch("utils.time.monotonic", return_value=100.0 + SystemdManager.STATUS_CACHE_TTL),
+            mock.patch("utils.subprocess.run", return_value=_ok("failed\n")) as run,
+        ):
+            assert mgr.get_status("plex-a") == "failed"
+        assert run.call_args.args[0] == ["systemctl", "is-active", "plex-a"]
+        assert mgr._status_cache == {}
+
+    @pytest.mark.parametrize(
+        "outcome",
+        [
+            {"side_effect": OSError},
+            {"return_value": _ok("active\n")},
+            {"return_value": _ok("active\nactive\n", returncode=1)},
+        ],
+    )
+    def test_prime_cache_ignores_unusable_output(self, outcome):
+        mgr = SystemdManager()
+        with mock.patch("utils.subprocess.run", **outcome):
+            mgr.prime_cache(["plex-a", "plex-b"])
+        assert mgr._status_cache == {}
+
+    def test_prime_cache_skips_empty_list(self):
+        mgr = SystemdManager()
+        with mock.patch("utils.subprocess.run") as run:
+            mgr.prime_cache([])
+        run.assert_not_called()
+
+    @pytest.mark.parametrize("action", ["start", "stop", "restart", "remove_service"])
+    def test_service_actions_invalidate_cached_status(self, action, tmp_path: Path):
+        mgr = SystemdManager()
+        with mock.patch("utils.subprocess.run", return_value=_ok("active\n")):
+            mgr.prime_cache(["plex-a"])
+        with (
+            mock.patch("utils.Path", return_value=tmp_path / "missing.service"),
+            mock.patch("utils.subprocess.run", return_value=_ok()),
+        ):
+            getattr(mgr, action)("plex-a")
+        assert "plex-a" not in mgr._status_cache
+
     def test_view_logs_handles_keyboard_interrupt(self):
         mgr = SystemdManager()
         with mock.patch("utils.subprocess.run", side_effect=KeyboardInterrupt):
@@ -615,10 +793,14 @@ class TestSystemdManager:
 
         with (
             mock.patch("utils.Path", side_effect=fake_path),
-            mock.patch("utils.subprocess.run", return_value=_ok()),
+            mock.patch("utils.subprocess.run", return_value=_ok()) as run,
         ):
             mgr.remove_service("plex-svc")
         assert not service_file.exists()
+        assert [call.args[0] for call in run.call_args_list] == [
+            ["systemctl", "disable", "--now", "plex-svc"],
+            ["systemctl", "daemon-reload"],
+        ]
         assert "removed" in capsys.readouterr().err
 
     def test_remove_service_missing_file_ok(self, tmp_path: Path):
@@ -682,23 +864,124 @@ class TestClearTerminal:
             clear_terminal()
         run.assert_not_called()
 
-    def test_tty_executes_clear_without_shell(self):
+    def test_tty_writes_ansi_clear_without_subprocess(self, capsys):
         with (
             mock.patch("utils.sys.stdout.isatty", return_value=True),
             mock.patch.dict("utils.os.environ", {"TERM": "xterm"}),
             mock.patch("utils.subprocess.run") as run,
         ):
             clear_terminal()
-        run.assert_called_once_with(["clear"], check=False)
+        run.assert_not_called()
+        assert capsys.readouterr().out == "\x1b[H\x1b[2J\x1b[3J"
 
-    def test_clear_os_error_is_swallowed(self):
+    @pytest.mark.parametrize("environ", [{}, {"TERM": "dumb"}])
+    def test_missing_or_dumb_term_is_left_alone(self, environ, capsys):
         with (
             mock.patch("utils.sys.stdout.isatty", return_value=True),
-            mock.patch.dict("utils.os.environ", {"TERM": "xterm"}),
-            mock.patch("utils.subprocess.run", side_effect=OSError("clear unavailable")) as run,
+            mock.patch.dict("utils.os.environ", environ, clear=True),
         ):
             clear_terminal()
-        run.assert_called_once_with(["clear"], check=False)
+        assert capsys.readouterr().out == ""
+
+    def test_windows_writes_sequence_without_term_or_cls(self, capsys):
+        with (
+            mock.patch("utils.sys.stdout.isatty", return_value=True),
+            mock.patch("utils.os.name", "nt"),
+            mock.patch.dict("utils.os.environ", {}, clear=True),
+            mock.patch("utils.subprocess.run") as run,
+        ):
+            clear_terminal()
+        run.assert_not_called()
+        assert capsys.readouterr().out == "\x1b[H\x1b[2J\x1b[3J"
+
+
+class TestListProductDirs:
+    def test_lists_directories_except_backups_and_hidden(self, tmp_path: Path):
+        (tmp_path / "plexstaff").mkdir()
+        (tmp_path / "backups").mkdir()
+        (tmp_path / "lost+found").mkdir()
+        (tmp_path / ".plexstaff.staging-abc").mkdir()
+        (tmp_path / "notes.txt").write_text("x")
+        (tmp_path / "linked").symlink_to(tmp_path / "plexstaff", target_is_directory=True)
+        assert sorted(list_product_dirs(tmp_path)) == [tmp_path / "linked", tmp_path / "plexstaff"]
+
+    def test_missing_install_dir_has_no_products(self, tmp_path: Path):
+        assert list_product_dirs(tmp_path / "missing") == []
+
+
+class TestRemoveTree:
+    def test_removes_nested_tree_without_following_symlinks(self, tmp_path: Path):
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (outside / "keep.txt").write_text("keep")
+        root = tmp_path / "app"
+        (root / "node_modules" / "pkg").mkdir(parents=True)
+        (root / "node_modules" / "pkg" / "index.js").write_text("x")
+        (root / "src").mkdir()
+        (root / "config.yml").write_text("port: 1")
+        (root / "linked").symlink_to(outside, target_is_directory=True)
+        remove_tree(root)
+        assert not root.exists()
+        assert (outside / "keep.txt").read_text() == "keep"
+
+    def test_refuses_symlinked_root(self, tmp_path: Path):
+        (tmp_path / "real").mkdir()
+        (tmp_path / "alias").symlink_to(tmp_path / "real", target_is_directory=True)
+        with pytest.raises(OSError):
+            remove_tree(tmp_path / "alias")
+        assert (tmp_path / "real").is_dir()
+
+    def test_reports_subtree_failure_after_attempting_all(self, tmp_path: Path):
+        root = tmp_path / "app"
+        (root / "a").mkdir(parents=True)
+        (root / "b").mkdir()
+        (root / "file.txt").write_text("x")
+        real_rmtree = shutil.rmtree
+
+        def flaky(path, *args, **kwargs):
+            if path.endswith("a"):
+                raise PermissionError("locked")
+            real_rmtree(path, *args, **kwargs)
+
+        with mock.patch("utils.shutil.rmtree", side_effect=flaky), pytest.raises(PermissionError):
+            remove_tree(root)
+        assert (root / "a").is_dir()
+        assert not (root / "b").exists()
+        assert not (root / "file.txt").exists()
+
+    def test_reports_file_unlink_failure(self, tmp_path: Path):
+        root = tmp_path / "app"
+        root.mkdir()
+        (root / "file.txt").write_text("x")
+        with mock.patch("utils.os.unlink", side_effect=PermissionError("denied")), pytest.raises(PermissionError):
+            remove_tree(root)
+        assert root.is_dir()
+
+
+class TestRemoveTreeInBackground:
+    def test_frees_path_at_once_and_removes_parked_tree(self, tmp_path: Path):
+        root = tmp_path / "app"
+        (root / "node_modules" / "pkg").mkdir(parents=True)
+        (root / "node_modules" / "pkg" / "index.js").write_text("x")
+        thread = remove_tree_in_background(root)
+        assert not root.exists()
+        assert thread is not None
+        thread.join()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_falls_back_to_foreground_removal_when_rename_fails(self, tmp_path: Path):
+        root = tmp_path / "app"
+        (root / "src").mkdir(parents=True)
+        with mock.patch("utils.os.rename", side_effect=OSError("busy")):
+            assert remove_tree_in_background(root) is None
+        assert not root.exists()
+
+    def test_refuses_symlinked_root(self, tmp_path: Path):
+        (tmp_path / "real").mkdir()
+        (tmp_path / "alias").symlink_to(tmp_path / "real", target_is_directory=True)
+        with pytest.raises(OSError):
+            remove_tree_in_background(tmp_path / "alias")
+        assert (tmp_path / "alias").is_symlink()
 
 
 class TestInstallStagedDirectory:
@@ -835,6 +1118,219 @@ class TestArchiveEdgeCases:
         assert not target.exists()
 
 
+# ---------------------------------------------------------------------------
+# write_tar_gz
+# ---------------------------------------------------------------------------
+
+
+def _fake_pigz(tmp_path: Path, body: str) -> str:
+    script = tmp_path / "pigz"
+    script.write_text(f"#!/bin/sh\n{body}\n")
+    script.chmod(0o755)
+    return str(script)
+
+
+class TestWriteTarGz:
+    def _source(self, tmp_path: Path) -> Path:
+        source = tmp_path / "src"
+        source.mkdir()
+        (source / "index.js").write_text("content")
+        return source
+
+    def test_falls_back_to_tarfile_gzip(self, tmp_path: Path):
+        source = self._source(tmp_path)
+        output = tmp_path / "out.tar.gz"
+        with (
+            mock.patch("utils.shutil.which", return_value=None),
+            mock.patch("utils.gzip.GzipFile", wraps=gzip.GzipFile) as gzip_file,
+            mock.patch("utils.tarfile.open", wraps=tarfile.open) as tar_open,
+            output.open("wb") as stream,
+        ):
+            write_tar_gz(stream, source, "app")
+
+        assert gzip_file.call_args.kwargs["compresslevel"] == 6
+        assert tar_open.call_args.kwargs["copybufsize"] == 1024 * 1024
+        with tarfile.open(output, "r:gz") as tar:
+            assert tar.extractfile("app/index.js").read() == b"content"
+
+    def test_streams_through_pigz(self, tmp_path: Path):
+        source = self._source(tmp_path)
+        output = tmp_path / "out.tar.gz"
+        pigz = _fake_pigz(tmp_path, "exec gzip -c")
+        with (
+            mock.patch("utils.shutil.which", return_value=pigz),
+            mock.patch("utils.subprocess.Popen", wraps=subprocess.Popen) as popen,
+            mock.patch("utils.tarfile.open", wraps=tarfile.open) as tar_open,
+            output.open("wb") as stream,
+        ):
+            write_tar_gz(stream, source, "app")
+
+        assert popen.call_args.args[0][:2] == [pigz, "-6"]
+        assert tar_open.call_args.kwargs["bufsize"] == tar_open.call_args.kwargs["copybufsize"] == 1024 * 1024
+        with tarfile.open(output, "r:gz") as tar:
+            assert tar.extractfile("app/index.js").read() == b"content"
+
+    @pytest.mark.parametrize("pigz_body", [None, "exec gzip -c"])
+    def test_skip_dirs_prunes_whole_subtrees(self, tmp_path: Path, pigz_body):
+        source = self._source(tmp_path)
+        (source / "node_modules" / ".cache").mkdir(parents=True)
+        (source / "node_modules" / ".cache" / "blob").write_text("regenerable")
+        (source / "node_modules" / "lib.js").write_text("kept")
+        (source / ".cache").write_text("a file, not a directory")
+        output = tmp_path / "out.tar.gz"
+        pigz = _fake_pigz(tmp_path, pigz_body) if pigz_body else None
+        with mock.patch("utils.shutil.which", return_value=pigz), output.open("wb") as stream:
+            write_tar_gz(stream, source, "app", skip_dirs=frozenset({".cache"}))
+
+        with tarfile.open(output, "r:gz") as tar:
+            names = set(tar.getnames())
+        assert {"app/node_modules/lib.js", "app/.cache", "app/index.js"} <= names
+        assert not any(name.startswith("app/node_modules/.cache") for name in names)
+
+    def test_pigz_failure_raises(self, tmp_path: Path):
+        source = self._source(tmp_path)
+        pigz = _fake_pigz(tmp_path, "cat >/dev/null; exit 3")
+        with (
+            mock.patch("utils.shutil.which", return_value=pigz),
+            (tmp_path / "out.tar.gz").open("wb") as stream,
+            pytest.raises(subprocess.CalledProcessError),
+        ):
+            write_tar_gz(stream, source, "app")
+
+    def test_tar_error_kills_pigz(self, tmp_path: Path):
+        source = self._source(tmp_path)
+        pigz = _fake_pigz(tmp_path, "exec gzip -c")
+        process = mock.MagicMock()
+        with (
+            mock.patch("utils.shutil.which", return_value=pigz),
+            mock.patch("utils.subprocess.Popen", return_value=process),
+            mock.patch("utils.tarfile.open", side_effect=OSError("disk full")),
+            (tmp_path / "out.tar.gz").open("wb") as stream,
+            pytest.raises(OSError, match="disk full"),
+        ):
+            write_tar_gz(stream, source, "app")
+
+        process.kill.assert_called_once()
+        process.wait.assert_called_once()
+
+
+# ---------------------------------------------------------------------------
+# gunzip_to / is_gzip_file
+# ---------------------------------------------------------------------------
+
+
+class TestGunzipTo:
+    def _gz(self, tmp_path: Path, payload: bytes = b"tar bytes" * 100) -> Path:
+        archive = tmp_path / "in.tar.gz"
+        archive.write_bytes(gzip.compress(payload))
+        return archive
+
+    def test_is_gzip_file(self, tmp_path: Path):
+        plain = tmp_path / "plain.tar"
+        plain.write_bytes(b"ustar")
+        assert is_gzip_file(self._gz(tmp_path)) is True
+        assert is_gzip_file(plain) is False
+        assert is_gzip_file(tmp_path / "missing.gz") is False
+
+    def test_python_fallback(self, tmp_path: Path):
+        output = BytesIO()
+        with mock.patch("utils.shutil.which", return_value=None):
+            assert gunzip_to(self._gz(tmp_path), output, max_bytes=10_000) == 900
+        assert output.getvalue() == b"tar bytes" * 100
+
+    def test_python_fallback_corrupt_input(self, tmp_path: Path):
+        broken = tmp_path / "broken.gz"
+        broken.write_bytes(gzip.compress(b"payload")[:-6])
+        with mock.patch("utils.shutil.which", return_value=None), pytest.raises(ValueError, match="Corrupted"):
+            gunzip_to(broken, BytesIO(), max_bytes=10_000)
+
+    def test_streams_through_pigz(self, tmp_path: Path):
+        pigz = _fake_pigz(tmp_path, 'exec gzip -dc "$2"')
+        output = BytesIO()
+        with (
+            mock.patch("utils.shutil.which", return_value=pigz),
+            mock.patch("utils.subprocess.Popen", wraps=subprocess.Popen) as popen,
+        ):
+            assert gunzip_to(self._gz(tmp_path), output, max_bytes=10_000) == 900
+        assert popen.call_args.args[0][:2] == [pigz, "-dc"]
+        assert output.getvalue() == b"tar bytes" * 100
+
+    def test_pigz_failure_raises(self, tmp_path: Path):
+        pigz = _fake_pigz(tmp_path, "exit 1")
+        with mock.patch("utils.shutil.which", return_value=pigz), pytest.raises(ValueError, match="Corrupted"):
+            gunzip_to(self._gz(tmp_path), BytesIO(), max_bytes=10_000)
+
+    def test_limit_kills_pigz(self, tmp_path: Path):
+        pigz = _fake_pigz(tmp_path, 'exec gzip -dc "$2"')
+        with mock.patch("utils.shutil.which", return_value=pigz), pytest.raises(ArchiveLimitError):
+            gunzip_to(self._gz(tmp_path), BytesIO(), max_bytes=100)
+
+
+# ---------------------------------------------------------------------------
+# write_tar_zst / unzstd_to / is_zstd_file
+# ---------------------------------------------------------------------------
+
+
+class TestZstd:
+    def test_is_zstd_file(self, tmp_path: Path):
+        framed = tmp_path / "in.tar.zst"
+        framed.write_bytes(b"\x28\xb5\x2f\xfd" + b"frame")
+        assert is_zstd_file(framed) is True
+        assert is_zstd_file(TestGunzipTo()._gz(tmp_path)) is False
+        assert is_zstd_file(tmp_path / "missing.zst") is False
+
+    def test_write_streams_through_zstd(self, tmp_path: Path):
+        source = tmp_path / "src"
+        source.mkdir()
+        (source / "index.js").write_text("content")
+        output = tmp_path / "out.tar.zst"
+        zstd = _fake_pigz(tmp_path, "exec gzip -c")
+        with (
+            mock.patch("utils.shutil.which", return_value=zstd),
+            mock.patch("utils.subprocess.Popen", wraps=subprocess.Popen) as popen,
+            output.open("wb") as stream,
+        ):
+            write_tar_zst(stream, source, "app")
+
+        assert popen.call_args.args[0] == [zstd, "-3", "-T0", "-q", "-c"]
+        with tarfile.open(output, "r:gz") as tar:
+            assert tar.extractfile("app/index.js").read() == b"content"
+
+    def test_missing_binary_raises(self, tmp_path: Path):
+        with mock.patch("utils.shutil.which", return_value=None):
+            with (tmp_path / "out.tar.zst").open("wb") as stream, pytest.raises(FileNotFoundError):
+                write_tar_zst(stream, tmp_path, "app")
+            with pytest.raises(FileNotFoundError, match="in.tar.zst"):
+                unzstd_to(tmp_path / "in.tar.zst", BytesIO(), max_bytes=10_000)
+
+    def test_unzstd_streams_through_zstd(self, tmp_path: Path):
+        archive = tmp_path / "in.tar.zst"
+        archive.write_bytes(b"tar bytes" * 100)
+        zstd = _fake_pigz(tmp_path, 'exec cat "$3"')
+        output = BytesIO()
+        with (
+            mock.patch("utils.shutil.which", return_value=zstd),
+            mock.patch("utils.subprocess.Popen", wraps=subprocess.Popen) as popen,
+        ):
+            assert unzstd_to(archive, output, max_bytes=10_000) == 900
+        assert popen.call_args.args[0] == [zstd, "-dcq", "--", str(archive)]
+        assert output.getvalue() == b"tar bytes" * 100
+
+    def test_unzstd_failure_and_limit(self, tmp_path: Path):
+        archive = tmp_path / "in.tar.zst"
+        archive.write_bytes(b"tar bytes" * 100)
+        with (
+            mock.patch("utils.shutil.which", return_value=_fake_pigz(tmp_path, "exit 1")),
+            pytest.raises(ValueError, match="Corrupted zstd file"),
+        ):
+            unzstd_to(archive, BytesIO(), max_bytes=10_000)
+        with (
+            mock.patch("utils.shutil.which", return_value=_fake_pigz(tmp_path, 'exec cat "$3"')),
+            pytest.raises(ArchiveLimitError),
+        ):
+            unzstd_to(archive, BytesIO(), max_bytes=100)
+
+
 # ---------------------------------------------------------------------------
 # ArchiveExtractor internals
 # ---------------------------------------------------------------------------
@@ -849,8 +1345,16 @@ class TestArchiveExtractorInternals:
         (root / "run.sh").write_text("#!/bin/sh")
         (root / "readme.txt").write_text("hi")
         (root / "secret.key").write_text("k")
-        with mock.patch("utils.subprocess.run", return_value=_ok()):
+        (root / "lib").mkdir(mode=0o700)
+        (root / "lib" / "index.js").write_text("//")
+        with mock.patch("utils.os.lchown") as lchown, mock.patch("utils.subprocess.run") as run:
             extractor._set_permissions(root)
+        run.assert_not_called()
+        assert {call.args for call in lchown.call_args_list} == {
+            (os.fspath(path), 0, 0) for path in [root, *root.rglob("*")]
+        }
+        assert (root / "lib").stat().st_mode & 0o777 == 0o750
+        assert (root / "lib" / "index.js").stat().st_mode & 0o777 == 0o640
         assert (root / "config.yml").stat().st_mode & 0o777 == 0o600
         assert (root / "secret.key").stat().st_mode & 0o777 == 0o600
         assert (root / "run.sh").stat().st_mode & 0o777 == 0o750
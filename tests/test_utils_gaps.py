@@ -29,6 +29,7 @@ from utils import (
     _validated_zip_entries,
     _write_archive_file,
     install_staged_directory,
+    safe_extract_zip,
 )
 
 # ---------- SystemDetector (113->121, 172-179, 190-198, 228-236) ----------
@@ -200,6 +201,103 @@ def test_member_destination_rejects_escape(tmp_path):
         _member_destination(root, ("link", "file.txt"))
 
 
+def test_member_destination_reuses_verified_parents(tmp_path):
+    root = tmp_path / "root"
+    root.mkdir()
+    root_resolved = root.resolve()
+    verified: set[Path] = set()
+
+    first = _member_destination(root, ("dir", "a.txt"), root_resolved=root_resolved, verified_parents=verified)
+    assert verified == {root / "dir"}
+
+    with mock.patch.object(Path, "resolve", side_effect=AssertionError("parent resolved twice")):
+        second = _member_destination(root, ("dir", "b.txt"), root_resolved=root_resolved, verified_parents=verified)
+
+    assert first == root / "dir" / "a.txt"
+    assert second == root / "dir" / "b.txt"
+    assert _member_destination(root, ("dir", "c.txt")) == root / "dir" / "c.txt"
+
+
+def test_extract_zip_resolves_each_directory_once(tmp_path):
+    zip_path = tmp_path / "many.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        for index in range(20):
+            zf.writestr(f"pkg/lib/file{index}.js", "x")
+    target = tmp_path / "out"
+    real_resolve = Path.resolve
+    calls = []
+
+    def counting_resolve(self, strict=False):
+        calls.append(self)
+        return real_resolve(self, strict=strict)
+
+    with mock.patch.object(Path, "resolve", counting_resolve):
+        safe_extract_zip(zip_path, target)
+
+    assert calls.count(target / "pkg" / "lib") == 1
+    assert len(list((target / "pkg" / "lib").iterdir())) == 20
+
+
+def _write_many_member_zip(path: Path, count: int) -> None:
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for index in range(count):
+            zf.writestr(f"pkg/mod{index % 4}/file{index}.js", f"content-{index}" * 50)
+
+
+def test_extract_zip_in_parallel_matches_contents(tmp_path, monkeypatch):
+    zip_path = tmp_path / "many.zip"
+    _write_many_member_zip(zip_path, 100)
+    monkeypatch.setattr(utils_module, "_ARCHIVE_EXTRACT_WORKERS", 4)
+    monkeypatch.setattr(utils_module, "_PARALLEL_ZIP_MIN_FILES", 10)
+    target = tmp_path / "out"
+
+    with mock.patch.object(
+        utils_module, "_extract_zip_files_parallel", wraps=utils_module._extract_zip_files_parallel
+    ) as parallel:
+        safe_extract_zip(zip_path, target)
+
+    parallel.assert_called_once()
+    for index in range(100):
+        member = target / "pkg" / f"mod{index % 4}" / f"file{index}.js"
+        assert member.read_text() == f"content-{index}" * 50
+        assert member.stat().st_mode & 0o777 == 0o600
+
+
+def test_extract_zip_parallel_failure_cleans_up(tmp_path, monkeypatch):
+    zip_path = tmp_path / "many.zip"
+    _write_many_member_zip(zip_path, 40)
+    monkeypatch.setattr(utils_module, "_ARCHIVE_EXTRACT_WORKERS", 4)
+    monkeypatch.setattr(utils_module, "_PARALLEL_ZIP_MIN_FILES", 10)
+    real_write = utils_module._write_archive_file
+
+    def failing_write(source, destination, entry, total, max_bytes):
+        if destination.name == "file7.js":
+            source.close()
+            raise UnsafeArchiveError("bad member")
+        return real_write(source, destination, entry, total, max_bytes)
+
+    monkeypatch.setattr(utils_module, "_write_archive_file", failing_write)
+    target = tmp_path / "out"
+
+    with pytest.raises(UnsafeArchiveError, match="bad member"):
+        safe_extract_zip(zip_path, target)
+
+    assert not target.exists()
+
+
+def test_extract_zip_small_archives_stay_serial(tmp_path, monkeypatch):
+    zip_path = tmp_path / "few.zip"
+    _write_many_member_zip(zip_path, 5)
+    monkeypatch.setattr(utils_module, "_ARCHIVE_EXTRACT_WORKERS", 4)
+    parallel = mock.MagicMock()
+    monkeypatch.setattr(utils_module, "_extract_zip_files_parallel", parallel)
+
+    safe_extract_zip(zip_path, tmp_path / "out")
+
+    parallel.assert_not_called()
+    assert (tmp_path / "out" / "pkg" / "mod0" / "file0.js").exists()
+
+
 # ---------- entry layout / limits (845-854, 872-874) ----------
 
 
@@ -5,10 +5,13 @@ Utility functions for PlexDevelopment Installer
 
 import ctypes
 import errno
+import functools
+import gzip
 import hashlib
 import ipaddress
 import logging
 import os
+import platform
 import pwd
 import re
 import shutil
@@ -18,9 +21,16 @@ import subprocess
 import sys
 import tarfile
 import tempfile
+import threading
+import time
 import zipfile
+import zlib
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path, PurePosixPath
+from typing import IO, BinaryIO
 
 from colorama import Fore, Style
 from colorama import init as colorama_init
@@ -31,6 +41,10 @@ colorama_init(autoreset=False)
 logger = logging.getLogger("plexinstaller")
 
 
+# Home, erase display, erase scrollback: what clear(1) emits on any ANSI terminal
+_CLEAR_SEQUENCE = "\x1b[H\x1b[2J\x1b[3J"
+
+
 def clear_terminal() -> None:
     """Clear an interactive terminal without invoking a shell."""
     try:
@@ -39,14 +53,12 @@ def clear_terminal() -> None:
     except (AttributeError, OSError):
         return
 
-    if os.name != "nt" and not os.environ.get("TERM"):
+    # Windows consoles set no TERM; colorama (initialised above) translates
+    # the sequence for consoles without native VT support, so no cls fork.
+    if os.name != "nt" and os.environ.get("TERM", "dumb") == "dumb":
         return
-
-    command = ["cmd", "/c", "cls"] if os.name == "nt" else ["clear"]
-    try:
-        subprocess.run(command, check=False)
-    except OSError:
-        pass
+    sys.stdout.write(_CLEAR_SEQUENCE)
+    sys.stdout.flush()
 
 
 def _subprocess_output_text(value: bytes | str | None) -> str:
@@ -123,6 +135,37 @@ class ColorPrinter:
         print(f"{self.YELLOW}[!] {message}{self.NC}", file=sys.stderr)
         logger.warning(message)
 
+    @contextmanager
+    def progress(self, message: str, interval: float = 0.5) -> Iterator[None]:
+        """Print a step, then a dot every *interval* seconds until the block finishes.
+
+        The dots come from a background thread so blocking work (archiving,
+        extraction) shows it is alive; they are skipped when stderr is not a TTY.
+        """
+        self.step(message)
+        try:
+            interactive = sys.stderr.isatty()
+        except (AttributeError, OSError):
+            interactive = False
+        if not interactive:
+            yield
+            return
+
+        done = threading.Event()
+
+        def tick() -> None:
+            while not done.wait(interval):
+                print(".", end="", file=sys.stderr, flush=True)
+
+        ticker = threading.Thread(target=tick, name="progress", daemon=True)
+        ticker.start()
+        try:
+            yield
+        finally:
+            done.set()
+            ticker.join()
+            print(file=sys.stderr)
+
 
 class SystemDetector:
     """System detection and package management"""
@@ -169,6 +212,28 @@ class SystemDetector:
 
         self.printer.success(f"Using package manager: {self.pkg_manager}")
 
+    @functools.cached_property
+    def distro_codename(self) -> str:
+        """Return the release codename (e.g. ``jammy``), resolved once per run.
+
+        ``/etc/os-release`` normally carries it; ``lsb_release`` is a Python
+        script of its own and only runs when the file does not.
+        """
+        try:
+            os_release = platform.freedesktop_os_release()
+        except OSError:
+            os_release = {}
+        codename = os_release.get("VERSION_CODENAME") or os_release.get("UBUNTU_CODENAME")
+        if codename:
+            return codename
+        return subprocess.run(
+            ["lsb_release", "-cs"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=10,
+        ).stdout.strip()
+
     def install_dependencies(self):
         """Install system dependencies"""
         from config import Config
@@ -180,7 +245,7 @@ class SystemDetector:
             return
 
         config = Config()
-        packages = config.SYSTEM_PACKAGES.get(self.pkg_manager, [])
+        packages = config.SYSTEM_PACKAGES.get(self.pkg_manager, ())
 
         if not packages:
             self.printer.warning("No package list for this package manager")
@@ -208,11 +273,11 @@ class SystemDetector:
         self.printer.step(f"Installing {len(packages)} packages...")
 
         install_cmds = {
-            "apt": ["apt", "install", "-y"] + packages,
-            "dnf": ["dnf", "install", "-y"] + packages,
-            "yum": ["yum", "install", "-y"] + packages,
-            "pacman": ["pacman", "-S", "--noconfirm", "--needed"] + packages,
-            "zypper": ["zypper", "install", "-y"] + packages,
+            "apt": ["apt", "install", "-y", *packages],
+            "dnf": ["dnf", "install", "-y", *packages],
+            "yum": ["yum", "install", "-y", *packages],
+            "pacman": ["pacman", "-S", "--noconfirm", "--needed", *packages],
+            "zypper": ["zypper", "install", "-y", *packages],
         }
 
         cmd = install_cmds.get(self.pkg_manager)
@@ -273,36 +338,87 @@ class SystemDetector:
 class DNSChecker:
     """DNS verification utilities"""
 
+    # Successful answers are reused for this many seconds; failures and
+    # mismatches are not cached so a record that was just fixed is seen on
+    # the next check.
+    CACHE_TTL = 60.0
+
     def __init__(self):
         self.printer = ColorPrinter()
+        self._public_ip: tuple[float, str] | None = None
+        self._resolved: dict[str, tuple[float, str]] = {}
 
-    def check(self, domain: str) -> bool:
-        """Check if domain points to this server"""
+    def check(self, domain: str, lookup: Future[tuple[str | None, str | None]] | None = None) -> bool:
+        """Check if domain points to this server
+
+        *lookup* may be a pending :meth:`lookup_async` result so the network
+        round-trips overlap with whatever the caller did in the meantime.
+        """
         self.printer.step(f"Checking DNS for: {domain}")
 
-        # Get server's public IP
-        server_ip = self._get_public_ip()
+        server_ip, domain_ip = lookup.result() if lookup is not None else self.lookup(domain)
         if not server_ip:
             self.printer.error("Cannot determine server IP")
             return False
 
         self.printer.step(f"Server IP: {server_ip}")
 
-        # Resolve domain
-        try:
-            domain_ip = socket.gethostbyname(domain)
-            self.printer.step(f"Domain resolves to: {domain_ip}")
-
-            if domain_ip == server_ip:
-                self.printer.success("DNS is correctly configured")
-                return True
-            else:
-                self.printer.warning(f"DNS mismatch: {domain_ip} != {server_ip}")
-                return False
-        except socket.gaierror:
+        if domain_ip is None:
             self.printer.error(f"Cannot resolve domain: {domain}")
             return False
 
+        self.printer.step(f"Domain resolves to: {domain_ip}")
+        if domain_ip == server_ip:
+            self.printer.success("DNS is correctly configured")
+            return True
+        self.printer.warning(f"DNS mismatch: {domain_ip} != {server_ip}")
+        return False
+
+    def lookup(self, domain: str) -> tuple[str | None, str | None]:
+        """Return the server's public IP and the domain's address without printing."""
+        server_ip = self._cached_public_ip()
+        if not server_ip:
+            return None, None
+        cached = self._resolved.get(domain)
+        if cached is not None and cached[0] > time.monotonic() and cached[1] == server_ip:
+            return server_ip, server_ip
+        domain_ip = self._resolve(domain)
+        if domain_ip == server_ip:
+            self._resolved[domain] = (time.monotonic() + self.CACHE_TTL, domain_ip)
+        return server_ip, domain_ip
+
+    def _cached_public_ip(self) -> str | None:
+        cached = self._public_ip
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        server_ip = self._get_public_ip()
+        if server_ip:
+            self._public_ip = (time.monotonic() + self.CACHE_TTL, server_ip)
+        return server_ip
+
+    def _resolve(self, domain: str) -> str | None:
+        """Return the domain's first IPv4 address, or None if it does not resolve."""
+        try:
+            infos = socket.getaddrinfo(domain, None, socket.AF_INET, socket.SOCK_STREAM)
+        except (socket.gaierror, UnicodeError):
+            return None
+        if not infos:
+            return None
+        return str(infos[0][4][0])
+
+    def lookup_async(self, domain: str) -> Future[tuple[str | None, str | None]]:
+        """Start :meth:`lookup` on a daemon thread so an aborted prompt never waits on it."""
+        future: Future[tuple[str | None, str | None]] = Future()
+
+        def run() -> None:
+            try:
+                future.set_result(self.lookup(domain))
+            except BaseException as exc:  # pragma: no cover - lookup() handles its own errors
+                future.set_exception(exc)
+
+        threading.Thread(target=run, name=f"dns-lookup-{domain}", daemon=True).start()
+        return future
+
     def _get_public_ip(self) -> str | None:
         """Get server's public IP address"""
         services = ["https://ifconfig.me", "https://api.ipify.org", "https://icanhazip.com"]
@@ -603,8 +719,12 @@ class SSLManager:
 class SystemdManager:
     """Systemd service management"""
 
+    # Statuses primed in bulk stay valid for one menu render or health pass
+    STATUS_CACHE_TTL = 3.0
+
     def __init__(self):
         self.printer = ColorPrinter()
+        self._status_cache: dict[str, tuple[float, str]] = {}
 
     @staticmethod
     def _normalized_service_name(service_name: str) -> str:
@@ -754,14 +874,15 @@ WantedBy=multi-user.target
         os.chmod(service_file, 0o644)
 
         # Reload systemd and enable service
+        self.invalidate(f"plex-{service_name}")
         subprocess.run(["systemctl", "daemon-reload"], check=True, timeout=30)
-        subprocess.run(["systemctl", "enable", f"plex-{service_name}"], check=True, timeout=30)
-        subprocess.run(["systemctl", "start", f"plex-{service_name}"], check=True, timeout=60)
+        subprocess.run(["systemctl", "enable", "--now", f"plex-{service_name}"], check=True, timeout=90)
 
         self.printer.success(f"Service plex-{service_name} created and started")
 
     def start(self, service_name: str):
         """Start service"""
+        self.invalidate(service_name)
         try:
             subprocess.run(["systemctl", "start", service_name], check=True, timeout=60)
             self.printer.success(f"{service_name} started")
@@ -770,6 +891,7 @@ WantedBy=multi-user.target
 
     def stop(self, service_name: str):
         """Stop service"""
+        self.invalidate(service_name)
         try:
             subprocess.run(["systemctl", "stop", service_name], check=True, timeout=60)
             self.printer.success(f"{service_name} stopped")
@@ -778,14 +900,51 @@ WantedBy=multi-user.target
 
     def restart(self, service_name: str):
         """Restart service"""
+        self.invalidate(service_name)
         try:
             subprocess.run(["systemctl", "restart", service_name], check=True, timeout=60)
             self.printer.success(f"{service_name} restarted")
         except subprocess.CalledProcessError:
             self.printer.error(f"Failed to restart {service_name}")
 
+    def invalidate(self, service_name: str) -> None:
+        """Forget any cached status for *service_name*."""
+        self._status_cache.pop(service_name, None)
+
+    def prime_cache(self, service_names: list[str]) -> None:
+        """Fetch the state of several services with a single ``systemctl show``.
+
+        Cached states are served by :meth:`get_status` for ``STATUS_CACHE_TTL``
+        seconds.  Any failure leaves the cache untouched so callers fall back
+        to one ``systemctl is-active`` per service.
+        """
+        if not service_names:
+            return
+        try:
+            result = subprocess.run(
+                ["systemctl", "show", "--property=ActiveState", "--value", *service_names],
+                capture_output=True,
+                text=True,
+                timeout=10,
+            )
+        except Exception:
+            return
+        # One value per unit, separated by blank lines
+        states = [line.strip() for line in result.stdout.splitlines() if line.strip()]
+        if result.returncode != 0 or len(states) != len(service_names):
+            return
+        now = time.monotonic()
+        for name, state in zip(service_names, states, strict=True):
+            self._status_cache[name] = (now, state)
+
     def get_status(self, service_name: str) -> str:
         """Get service status"""
+        cached = self._status_cache.get(service_name)
+        if cached is not None:
+            primed_at, status = cached
+            if time.monotonic() - primed_at < self.STATUS_CACHE_TTL:
+                return status
+            del self._status_cache[service_name]
         try:
             result = subprocess.run(
                 ["systemctl", "is-active", service_name], capture_output=True, text=True, timeout=10
@@ -794,6 +953,20 @@ WantedBy=multi-user.target
         except Exception:
             return "unknown"
 
+    def is_active(self, service_name: str) -> bool:
+        """Return True if the service is running, going by the exit status only"""
+        cached = self._status_cache.get(service_name)
+        if cached is not None:
+            primed_at, status = cached
+            if time.monotonic() - primed_at < self.STATUS_CACHE_TTL:
+                return status.strip().lower() == "active"
+            del self._status_cache[service_name]
+        try:
+            result = subprocess.run(["systemctl", "is-active", "--quiet", service_name], check=False, timeout=10)
+        except Exception:
+            return False
+        return result.returncode == 0
+
     def view_logs(self, service_name: str):
         """View service logs"""
         try:
@@ -803,9 +976,9 @@ WantedBy=multi-user.target
 
     def remove_service(self, service_name: str):
         """Remove systemd service"""
+        self.invalidate(service_name)
         try:
-            subprocess.run(["systemctl", "stop", service_name], check=False, timeout=60)
-            subprocess.run(["systemctl", "disable", service_name], check=False, timeout=30)
+            subprocess.run(["systemctl", "disable", "--now", service_name], check=False, timeout=90)
 
             service_file = Path(f"/etc/systemd/system/{service_name}.service")
             # Use try/except instead of check-then-act to avoid race condition
@@ -823,9 +996,96 @@ WantedBy=multi-user.target
 DEFAULT_MAX_ARCHIVE_FILES = 100_000
 DEFAULT_MAX_ARCHIVE_BYTES = 10 * 1024 * 1024 * 1024
 _ARCHIVE_COPY_CHUNK_SIZE = 1024 * 1024
+_ARCHIVE_EXTRACT_WORKERS = min(8, os.cpu_count() or 1)
+_PARALLEL_ZIP_MIN_FILES = 64
+# gzip's own default: far cheaper than tarfile's level 9 for a few percent in size
+_BACKUP_GZIP_LEVEL = 6
+_GZIP_MAGIC = b"\x1f\x8b"
+# zstd's own default level; multi-threaded it outruns pigz -6 at a better ratio
+_BACKUP_ZSTD_LEVEL = 3
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
 _TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz", ".gz", ".bz2", ".xz")
 
 
+def _open_tar_writer(fileobj: IO[bytes] | gzip.GzipFile) -> tarfile.TarFile:
+    """Open an uncompressed tar stream that reads and writes members in 1 MiB chunks.
+
+    tarfile defaults to 10 KiB records and 16 KiB member copies, which turns a
+    multi-gigabyte install into hundreds of thousands of small writes.
+    """
+    # typeshed leaves copybufsize off tarfile.open(), although TarFile accepts it
+    tar: tarfile.TarFile = tarfile.open(  # type: ignore[call-overload]
+        fileobj=fileobj, mode="w|", bufsize=_ARCHIVE_COPY_CHUNK_SIZE, copybufsize=_ARCHIVE_COPY_CHUNK_SIZE
+    )
+    return tar
+
+
+def write_tar_gz(output: BinaryIO, source: Path, arcname: str, *, skip_dirs: frozenset[str] = frozenset()) -> None:
+    """Write *source* to *output* as a gzip-compressed tar stream.
+
+    Compression runs through ``pigz`` on every core when it is installed and
+    falls back to tarfile's single-threaded gzip otherwise.  *output* must be
+    a real file so its descriptor can be handed to the compressor.
+    Directories named in *skip_dirs* are left out, contents and all.
+    """
+    pigz = shutil.which("pigz")
+    if pigz is None:
+        with (
+            gzip.GzipFile(fileobj=output, mode="wb", compresslevel=_BACKUP_GZIP_LEVEL) as compressed,
+            _open_tar_writer(compressed) as tar,
+        ):
+            tar.add(source, arcname=arcname, filter=_skip_dirs_filter(skip_dirs))
+        return
+
+    _write_tar_through(
+        [pigz, f"-{_BACKUP_GZIP_LEVEL}", "-p", str(os.cpu_count() or 1), "-c"], output, source, arcname, skip_dirs
+    )
+
+
+def write_tar_zst(output: BinaryIO, source: Path, arcname: str, *, skip_dirs: frozenset[str] = frozenset()) -> None:
+    """Write *source* to *output* as a zstd-compressed tar stream.
+
+    Needs the ``zstd`` binary (``FileNotFoundError`` otherwise), which
+    compresses on every core and decompresses several times faster than gzip.
+    *skip_dirs* behaves as in :func:`write_tar_gz`.
+    """
+    zstd = shutil.which("zstd")
+    if zstd is None:
+        raise FileNotFoundError("zstd is not installed")
+    _write_tar_through([zstd, f"-{_BACKUP_ZSTD_LEVEL}", "-T0", "-q", "-c"], output, source, arcname, skip_dirs)
+
+
+def _skip_dirs_filter(skip_dirs: frozenset[str]) -> Callable[[tarfile.TarInfo], tarfile.TarInfo | None] | None:
+    """Return a ``tar.add`` filter that prunes directories named in *skip_dirs*."""
+    if not skip_dirs:
+        return None
+
+    def keep(info: tarfile.TarInfo) -> tarfile.TarInfo | None:
+        # Dropping a directory here also stops tar.add() from descending into it
+        return None if info.isdir() and PurePosixPath(info.name).name in skip_dirs else info
+
+    return keep
+
+
+def _write_tar_through(
+    compressor: list[str], output: BinaryIO, source: Path, arcname: str, skip_dirs: frozenset[str]
+) -> None:
+    """Stream a tar of *source* through the *compressor* command into *output*."""
+    output.flush()
+    process = subprocess.Popen(compressor, stdin=subprocess.PIPE, stdout=output, stderr=subprocess.DEVNULL)
+    try:
+        if process.stdin is None:  # pragma: no cover - stdin=PIPE always provides a stream
+            raise RuntimeError(f"{Path(compressor[0]).name} stdin is unavailable")
+        with process.stdin, _open_tar_writer(process.stdin) as tar:
+            tar.add(source, arcname=arcname, filter=_skip_dirs_filter(skip_dirs))
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+    if process.wait() != 0:
+        raise subprocess.CalledProcessError(process.returncode, process.args)
+
+
 class UnsafeArchiveError(ValueError):
     """Raised when an archive cannot be extracted without escaping safety rules."""
 
@@ -834,6 +1094,84 @@ class ArchiveLimitError(UnsafeArchiveError):
     """Raised when an archive exceeds configured expansion limits."""
 
 
+def is_gzip_file(path: Path) -> bool:
+    """Return True when *path* is a readable file starting with the gzip magic number."""
+    return _starts_with(path, _GZIP_MAGIC)
+
+
+def is_zstd_file(path: Path) -> bool:
+    """Return True when *path* is a readable file starting with the zstd frame magic number."""
+    return _starts_with(path, _ZSTD_MAGIC)
+
+
+def _starts_with(path: Path, magic: bytes) -> bool:
+    try:
+        with open(path, "rb") as stream:
+            return stream.read(len(magic)) == magic
+    except OSError:
+        return False
+
+
+def gunzip_to(source: Path, output: BinaryIO, *, max_bytes: int) -> int:
+    """Decompress the gzip file *source* into *output* and return the byte count.
+
+    Uses ``pigz`` (inflate, CRC and I/O on separate threads) when installed
+    and Python's gzip otherwise.  Raises :class:`ArchiveLimitError` once more
+    than *max_bytes* come out, and ``ValueError`` for corrupt input.
+    """
+    pigz = shutil.which("pigz")
+    if pigz is None:
+        try:
+            with gzip.open(source, "rb") as decompressed:
+                return _copy_bounded(decompressed, output, max_bytes)
+        except (gzip.BadGzipFile, EOFError, zlib.error) as exc:
+            raise ValueError(f"Corrupted gzip file: {Path(source).name} ({exc})") from exc
+
+    return _decompress_through(
+        [pigz, "-dc", str(source)], output, max_bytes, f"Corrupted gzip file: {Path(source).name}"
+    )
+
+
+def unzstd_to(source: Path, output: BinaryIO, *, max_bytes: int) -> int:
+    """Decompress the zstd file *source* into *output* and return the byte count.
+
+    Needs the ``zstd`` binary (``FileNotFoundError`` otherwise); limits and
+    corrupt input are reported as for :func:`gunzip_to`.
+    """
+    zstd = shutil.which("zstd")
+    if zstd is None:
+        raise FileNotFoundError(f"zstd is not installed; cannot decompress {Path(source).name}")
+    return _decompress_through(
+        [zstd, "-dcq", "--", str(source)], output, max_bytes, f"Corrupted zstd file: {Path(source).name}"
+    )
+
+
+def _decompress_through(decompressor: list[str], output: BinaryIO, max_bytes: int, corrupt_message: str) -> int:
+    process = subprocess.Popen(decompressor, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        if process.stdout is None:  # pragma: no cover - stdout=PIPE always provides a stream
+            raise RuntimeError(f"{Path(decompressor[0]).name} stdout is unavailable")
+        with process.stdout:
+            total = _copy_bounded(process.stdout, output, max_bytes)
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+    if process.wait() != 0:
+        raise ValueError(corrupt_message)
+    return total
+
+
+def _copy_bounded(source: IO[bytes] | gzip.GzipFile, output: BinaryIO, max_bytes: int) -> int:
+    total = 0
+    while chunk := source.read(_ARCHIVE_COPY_CHUNK_SIZE):
+        total += len(chunk)
+        if total > max_bytes:
+            raise ArchiveLimitError(f"Archive expands to more than {max_bytes} bytes")
+        output.write(chunk)
+    return total
+
+
 @dataclass(frozen=True)
 class _ArchiveEntry:
     member: zipfile.ZipInfo | tarfile.TarInfo
@@ -852,6 +1190,119 @@ def validate_path_component(value: str, *, label: str = "path component") -> str
     return value
 
 
+_REMOVE_TREE_WORKERS = 8
+_NON_PRODUCT_DIRS = frozenset({"backups", "lost+found"})
+
+
+def list_product_dirs(install_dir: Path) -> list[Path]:
+    """Return installed product directories, skipping ``backups``.
+
+    Hidden entries (such as leftover ``.name.staging-*`` extraction stages)
+    and ``lost+found`` are skipped by name before their type is checked.
+    Uses the directory entries' cached types, so listing costs one
+    ``scandir`` rather than a ``stat`` per product.  A missing install
+    directory simply has no products.
+    """
+    try:
+        with os.scandir(install_dir) as it:
+            return [
+                install_dir / entry.name
+                for entry in it
+                if not entry.name.startswith(".") and entry.name not in _NON_PRODUCT_DIRS and entry.is_dir()
+            ]
+    except FileNotFoundError:
+        return []
+
+
+_SENSITIVE_FILE_NAMES = frozenset({"config.yml", "config.yaml", "config.json", ".env"})
+
+
+def set_tree_permissions(root: Path, uid: int = 0, gid: int = 0) -> None:
+    """Apply the product permission policy to *root* in one in-process walk.
+
+    Every entry is owned by *uid*:*gid*; directories get 0750, config files,
+    ``.env`` and key material 0600, executables and scripts 0750 and any other
+    file 0640.  Symbolic links are re-owned but never followed.
+    """
+    pending = [os.fspath(root)]
+    while pending:
+        directory = pending.pop()
+        os.lchown(directory, uid, gid)
+        os.chmod(directory, 0o750)
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                    continue
+                os.lchown(entry.path, uid, gid)
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                name = entry.name.lower()
+                sensitive = name in _SENSITIVE_FILE_NAMES or name.endswith((".key", ".pem"))
+                suffix = os.path.splitext(name)[1]
+                executable = bool(entry.stat(follow_symlinks=False).st_mode & 0o111) or suffix in {".sh", ".py"}
+                os.chmod(entry.path, 0o600 if sensitive else 0o750 if executable else 0o640)
+
+
+def remove_tree(path: Path, *, max_workers: int = _REMOVE_TREE_WORKERS) -> None:
+    """Delete a directory tree, removing its top-level subtrees in parallel.
+
+    Large ``node_modules`` trees are dominated by per-file ``unlink`` calls,
+    which the kernel services concurrently.  Symbolic links are removed, never
+    followed, and like :func:`shutil.rmtree` a symlinked *path* is refused.
+    The first error is raised once every subtree has been attempted.
+    """
+    if os.path.islink(path):
+        raise OSError(f"Cannot remove a symbolic link as a tree: {path}")
+    with os.scandir(path) as it:
+        entries = list(it)
+    errors: list[BaseException] = []
+    subtrees = [entry.path for entry in entries if entry.is_dir(follow_symlinks=False)]
+    for entry in entries:
+        if not entry.is_dir(follow_symlinks=False):
+            try:
+                os.unlink(entry.path)
+            except OSError as exc:
+                errors.append(exc)
+    if subtrees:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(subtrees)))) as pool:
+            for future in [pool.submit(shutil.rmtree, subtree) for subtree in subtrees]:
+                failure = future.exception()
+                if failure is not None:
+                    errors.append(failure)
+    if errors:
+        raise errors[0]
+    os.rmdir(path)
+
+
+def remove_tree_in_background(path: Path) -> threading.Thread | None:
+    """Move *path* aside and delete the tree on a background thread.
+
+    The rename frees *path* at once; the tree is parked on a hidden sibling,
+    which :func:`list_product_dirs` skips, and removed by a non-daemonic
+    thread so the interpreter still waits for it at exit.  If the rename
+    fails the tree is removed in the foreground and ``None`` is returned.
+    """
+    if os.path.islink(path):
+        raise OSError(f"Cannot remove a symbolic link as a tree: {path}")
+    parked = path.with_name(f".{path.name}.removing-{os.getpid()}-{time.monotonic_ns()}")
+    try:
+        os.rename(path, parked)
+    except OSError:
+        remove_tree(path)
+        return None
+
+    def remove() -> None:
+        try:
+            remove_tree(parked)
+        except OSError as exc:
+            logger.warning("Could not finish removing %s: %s", parked, exc)
+
+    thread = threading.Thread(target=remove, name=f"remove-{path.name}")
+    thread.start()
+    return thread
+
+
 def _path_exists(path: Path) -> bool:
     """Return True for all existing paths, including broken symbolic links."""
     return os.path.lexists(path)
@@ -901,14 +1352,31 @@ def _archive_member_parts(name: str) -> tuple[str, ...]:
     return tuple(part for part in path.parts if part not in {"", "."})
 
 
-def _member_destination(root: Path, parts: tuple[str, ...]) -> Path:
-    """Build a destination and verify containment without string-prefix checks."""
-    root_resolved = root.resolve()
+def _member_destination(
+    root: Path,
+    parts: tuple[str, ...],
+    *,
+    root_resolved: Path | None = None,
+    verified_parents: set[Path] | None = None,
+) -> Path:
+    """Build a destination and verify containment without string-prefix checks.
+
+    Containment is checked on the member's parent directory.  Callers extracting
+    many members pass the resolved root and a shared cache so each directory is
+    resolved once instead of once per member.
+    """
+    if root_resolved is None:
+        root_resolved = root.resolve()
     destination = root.joinpath(*parts)
+    parent = destination.parent
+    if verified_parents is not None and parent in verified_parents:
+        return destination
     try:
-        destination.resolve(strict=False).relative_to(root_resolved)
+        parent.resolve(strict=False).relative_to(root_resolved)
     except ValueError as exc:
         raise UnsafeArchiveError(f"Archive member escapes extraction directory: {'/'.join(parts)}") from exc
+    if verified_parents is not None:
+        verified_parents.add(parent)
     return destination
 
 
@@ -1035,6 +1503,56 @@ def _write_archive_file(source, destination: Path, entry: _ArchiveEntry, total:
     return total
 
 
+def _open_archive_member(archive: zipfile.ZipFile | tarfile.TarFile, entry: _ArchiveEntry):
+    if isinstance(archive, zipfile.ZipFile):
+        if not isinstance(entry.member, zipfile.ZipInfo):
+            raise UnsafeArchiveError(f"Invalid ZIP member metadata: {'/'.join(entry.parts)}")
+        return archive.open(entry.member, "r")
+
+    if not isinstance(entry.member, tarfile.TarInfo):
+        raise UnsafeArchiveError(f"Invalid TAR member metadata: {'/'.join(entry.parts)}")
+    tar_source = archive.extractfile(entry.member)
+    if tar_source is None:
+        raise UnsafeArchiveError(f"Cannot read archive member: {'/'.join(entry.parts)}")
+    return tar_source
+
+
+def _extract_zip_files_parallel(archive_path: str, files: list[tuple[_ArchiveEntry, Path]], max_bytes: int) -> None:
+    """Inflate ZIP members concurrently, one ZipFile handle per worker thread.
+
+    Each member is bounded by its declared size and the declared sizes were
+    already checked against *max_bytes*, so the cumulative limit still holds
+    without a shared running total.
+    """
+    local = threading.local()
+    handles: list[zipfile.ZipFile] = []
+    handles_lock = threading.Lock()
+
+    def extract(job: tuple[_ArchiveEntry, Path]) -> None:
+        entry, destination = job
+        handle = getattr(local, "archive", None)
+        if handle is None:
+            handle = zipfile.ZipFile(archive_path, "r")
+            local.archive = handle
+            with handles_lock:
+                handles.append(handle)
+        _write_archive_file(_open_archive_member(handle, entry), destination, entry, 0, max_bytes)
+        os.chmod(destination, (entry.mode & 0o777) or 0o600)
+
+    try:
+        with ThreadPoolExecutor(max_workers=_ARCHIVE_EXTRACT_WORKERS) as pool:
+            futures = [pool.submit(extract, job) for job in files]
+            try:
+                for future in futures:
+                    future.result()
+            except BaseException:
+                pool.shutdown(wait=True, cancel_futures=True)
+                raise
+    finally:
+        for handle in handles:
+            handle.close()
+
+
 def _extract_validated_entries(
     archive: zipfile.ZipFile | tarfile.TarFile,
     entries: list[_ArchiveEntry],
@@ -1042,34 +1560,43 @@ def _extract_validated_entries(
     max_bytes: int,
 ) -> None:
     directories: list[tuple[Path, int]] = []
-    total = 0
+    files: list[tuple[_ArchiveEntry, Path]] = []
+    root_resolved = target_dir.resolve()
+    verified_parents: set[Path] = set()
+    created_dirs: set[Path] = set()
 
+    # Build the whole directory tree up front so file writers never race on mkdir
     for entry in entries:
         if not entry.parts:
             continue
-        destination = _member_destination(target_dir, entry.parts)
+        destination = _member_destination(
+            target_dir, entry.parts, root_resolved=root_resolved, verified_parents=verified_parents
+        )
         if entry.is_dir:
             destination.mkdir(mode=0o700, parents=True, exist_ok=True)
             if destination.is_symlink() or not destination.is_dir():
                 raise UnsafeArchiveError(f"Unsafe archive directory: {'/'.join(entry.parts)}")
+            created_dirs.add(destination)
             directories.append((destination, entry.mode))
             continue
 
-        destination.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
-        if isinstance(archive, zipfile.ZipFile):
-            if not isinstance(entry.member, zipfile.ZipInfo):
-                raise UnsafeArchiveError(f"Invalid ZIP member metadata: {'/'.join(entry.parts)}")
-            source = archive.open(entry.member, "r")
-        else:
-            if not isinstance(entry.member, tarfile.TarInfo):
-                raise UnsafeArchiveError(f"Invalid TAR member metadata: {'/'.join(entry.parts)}")
-            tar_source = archive.extractfile(entry.member)
-            if tar_source is None:
-                raise UnsafeArchiveError(f"Cannot read archive member: {'/'.join(entry.parts)}")
-            source = tar_source
-
-        total = _write_archive_file(source, destination, entry, total, max_bytes)
-        os.chmod(destination, (entry.mode & 0o777) or 0o600)
+        if destination.parent not in created_dirs:
+            destination.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            created_dirs.add(destination.parent)
+        files.append((entry, destination))
+
+    if (
+        isinstance(archive, zipfile.ZipFile)
+        and isinstance(archive.filename, str)
+        and _ARCHIVE_EXTRACT_WORKERS > 1
+        and len(files) >= _PARALLEL_ZIP_MIN_FILES
+    ):
+        _extract_zip_files_parallel(archive.filename, files, max_bytes)
+    else:
+        total = 0
+        for entry, destination in files:
+            total = _write_archive_file(_open_archive_member(archive, entry), destination, entry, total, max_bytes)
+            os.chmod(destination, (entry.mode & 0o777) or 0o600)
 
     for directory, mode in sorted(directories, key=lambda item: len(item[0].parts), reverse=True):
         os.chmod(directory, (mode & 0o777) or 0o700)
@@ -1232,20 +1759,8 @@ class ArchiveExtractor:
         return target_dir
 
     def _set_permissions(self, target_dir: Path) -> None:
-        """Set the installer product permission policy before publishing."""
-        subprocess.run(["chown", "-R", "root:root", str(target_dir)], check=True, timeout=60)
-        subprocess.run(
-            ["find", str(target_dir), "-type", "d", "-exec", "chmod", "750", "{}", ";"],
-            check=True,
-            timeout=60,
-        )
-        for path in target_dir.rglob("*"):
-            if not path.is_file() or path.is_symlink():
-                continue
-            name = path.name.lower()
-            sensitive = name in {"config.yml", "config.yaml", "config.json", ".env"} or name.endswith((".key", ".pem"))
-            executable = bool(path.stat().st_mode & 0o111) or path.suffix.lower() in {".sh", ".py"}
-            os.chmod(path, 0o600 if sensitive else 0o750 if executable else 0o640)
+        """Set the installer product permission policy, owned by root."""
+        set_tree_permissions(target_dir)
 
     def _extract_zip(self, archive_path: Path, target_path: Path) -> Path:
         """Compatibility wrapper around the shared ZIP extractor."""